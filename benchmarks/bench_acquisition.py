@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""Benchmark of sustained high-rate acquisition against the mock device.
+
+Runs the telemetry loop's acquisition path (fixed-rate scheduler, poll,
+sample history, batch conversion and statistics once a second) at several
+poll rates, and reports the achieved rate, overruns and CPU usage.
+
+Run with ``python benchmarks/bench_acquisition.py [--quick] [--json f.json]``.
+"""
+import asyncio
+import time
+
+import numpy as np
+
+from lsst.ts import adamSensors
+
+import common
+
+POLL_RATES = (50, 100, 200, 500)
+NUM_CHANNELS = 6
+
+
+async def measure(poll_rate, duration):
+    model = adamSensors.AdamModel("fakeIP", 502, simulation_mode=True)
+    poller = adamSensors.AdamPoller({"adam": model})
+    await poller.connect()
+    converter = adamSensors.ChannelConverter([[1.0, 0.0]] * NUM_CHANNELS)
+    scheduler = adamSensors.FixedRateScheduler(1 / poll_rate)
+    history = adamSensors.SampleHistory(poll_rate * 600, NUM_CHANNELS)
+    counts = np.full(NUM_CHANNELS, np.nan)
+
+    num_cycles = round(duration * poll_rate)
+    wall0 = time.perf_counter()
+    cpu0 = time.process_time()
+    for i in range(num_cycles):
+        await scheduler.wait()
+        results = await poller.poll()
+        counts[:] = results["adam"][:NUM_CHANNELS]
+        history.append(time.time(), counts)
+        if scheduler.num_cycles % poll_rate == 0:
+            timestamps, window = history.last(poll_rate)
+            adamSensors.channel_statistics(converter.convert(window))
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+    await poller.close()
+    metrics = scheduler.report()
+    prefix = f"acquire_{poll_rate}hz"
+    return {
+        f"{prefix}_achieved_hz": num_cycles / wall,
+        f"{prefix}_num_overruns": metrics["num_overruns"],
+        f"{prefix}_num_missed": metrics["num_missed"],
+        f"{prefix}_mean_jitter_ms": metrics["mean_jitter"] * 1000,
+        f"{prefix}_cpu_percent": 100 * cpu / wall,
+    }
+
+
+async def arun(duration):
+    results = dict()
+    for poll_rate in POLL_RATES:
+        results.update(await measure(poll_rate, duration))
+    return results
+
+
+def run(quick=False):
+    return asyncio.run(arun(duration=1 if quick else 5))
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
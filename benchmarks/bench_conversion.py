@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Microbenchmark of counts-to-engineering-units conversion.
+
+Compares the per-scalar path (``AdamModel.counts_to_volts`` per register
+followed by one `numpy.poly1d` per channel) with `ChannelConverter`,
+for batches of 1, 1k and 1M samples of six channels.
+
+Then times each kind of calibration (six channels of that kind, batches
+of 1, 1k and 1M samples), including the degree 9 polynomial that would
+otherwise be fit to the same curves.
+
+Run with ``python benchmarks/bench_conversion.py [--quick] [--json out.json]``.
+"""
+import numpy as np
+
+from lsst.ts import adamSensors
+
+import common
+
+BATCH_SIZES = (1, 1000, 1000000)
+COEFFICIENTS = [[1.0, 0.0]] * 3 + [[344738.0, 0.0]] + [[0.5, 1.0, -2.0]] * 2
+CALIBRATIONS = {
+    "poly9": dict(
+        coefficients=[1e-9, 1e-8, 1e-7, 1e-6, 1e-5, 1e-4, 1e-3, 0.01, 0.1, 1]
+    ),
+    "log10": dict(kind="log10", coefficients=[0.5, -3.0]),
+    "table": dict(
+        kind="table",
+        table=[[v, v ** 3] for v in np.linspace(-10, 10, 64)],
+    ),
+    "rtd": dict(kind="rtd", coefficients=[10.0, 100.0]),
+    "thermocouple": dict(kind="thermocouple", coefficients=[5.0, 0.0]),
+}
+
+
+def per_scalar(model, polys, batch):
+    outputs = [0] * len(polys)
+    for registers in batch:
+        voltages = [model.counts_to_volts(r) for r in registers]
+        for i, poly in enumerate(polys):
+            outputs[i] = poly(voltages[i])
+    return outputs
+
+
+def run(quick=False):
+    model = adamSensors.AdamModel("fakeIP", 502, simulation_mode=True)
+    polys = [np.poly1d(coeffs) for coeffs in COEFFICIENTS]
+    converter = adamSensors.ChannelConverter(COEFFICIENTS)
+    rng = np.random.default_rng(1)
+
+    results = dict()
+    for batch_size in BATCH_SIZES[:-1] if quick else BATCH_SIZES:
+        batch = rng.integers(0, 65536, size=(batch_size, 8)).astype(float)
+        scalar_time = common.time_call(per_scalar, model, polys, batch.tolist())
+        vector_time = common.time_call(converter.convert, batch)
+        results[f"convert_{batch_size}_per_scalar_ms"] = scalar_time * 1000
+        results[f"convert_{batch_size}_vectorized_ms"] = vector_time * 1000
+        results[f"convert_{batch_size}_speedup"] = scalar_time / vector_time
+
+        for name, calibration in CALIBRATIONS.items():
+            converter = adamSensors.ChannelConverter(
+                COEFFICIENTS, calibrations=[calibration] * len(COEFFICIENTS)
+            )
+            calibrate_time = common.time_call(converter.convert, batch)
+            results[f"calibrate_{name}_{batch_size}_ms"] = calibrate_time * 1000
+    return results
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
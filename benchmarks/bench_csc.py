@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""Benchmark of CSC startup and state transition times.
+
+Runs the CSC in simulation mode 1 (mock Modbus client) and reports:
+
+* startup: constructing the CSC until it has started (DDS participant,
+  topics and initial events)
+* enable: STANDBY to ENABLED, including configuration and connecting
+  to the devices
+* first telemetry: from the start of the enable to the first
+  ``tel_pressure`` sample received by a remote
+* standby: ENABLED to STANDBY, including stopping the telemetry loop
+* restart: STANDBY to ENABLED of a CSC that was enabled before, to the
+  first ``tel_pressure`` sample, in simulation mode 2 (connecting to
+  local Modbus/TCP simulators), sampling at 100 Hz and publishing once
+  a second; cold closes the connections in STANDBY
+  (``high_rate_config.yaml``), warm keeps them open and publishes the
+  most recent standby sample at once (``warm_standby_config.yaml``)
+
+Requires a working DDS installation, as for the CSC unit tests.
+
+Run with ``python benchmarks/bench_csc.py [--quick] [--json out.json]``.
+"""
+import asyncio
+import pathlib
+import time
+
+import numpy as np
+
+from lsst.ts import salobj
+from lsst.ts import adamSensors
+
+import common
+
+CONFIG_DIR = pathlib.Path(__file__).parents[1].joinpath("tests", "data", "config")
+TIMEOUT = 60
+
+
+async def measure_once():
+    t0 = time.perf_counter()
+    csc = adamSensors.AdamCSC(config_dir=CONFIG_DIR, simulation_mode=1)
+    await csc.start_task
+    startup = time.perf_counter() - t0
+    try:
+        async with salobj.Remote(domain=csc.domain, name="AdamSensors") as remote:
+            t0 = time.perf_counter()
+            await salobj.set_summary_state(
+                remote,
+                salobj.State.ENABLED,
+                settingsToApply="pytest_config.yaml",
+                timeout=TIMEOUT,
+            )
+            enable = time.perf_counter() - t0
+            await remote.tel_pressure.next(flush=False, timeout=TIMEOUT)
+            first_telemetry = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            await salobj.set_summary_state(
+                remote, salobj.State.STANDBY, timeout=TIMEOUT
+            )
+            standby = time.perf_counter() - t0
+    finally:
+        await csc.close()
+    return startup, enable, first_telemetry, standby
+
+
+async def measure_restarts(config_name, num_runs):
+    """Time STANDBY to ENABLED to the first telemetry, after a first
+    enable with the same configuration.
+    """
+    csc = adamSensors.AdamCSC(config_dir=CONFIG_DIR, simulation_mode=2)
+    await csc.start_task
+    durations = []
+    try:
+        async with salobj.Remote(domain=csc.domain, name="AdamSensors") as remote:
+            for i in range(num_runs + 1):
+                remote.tel_pressure.flush()
+                t0 = time.perf_counter()
+                await salobj.set_summary_state(
+                    remote,
+                    salobj.State.ENABLED,
+                    settingsToApply=config_name,
+                    timeout=TIMEOUT,
+                )
+                await remote.tel_pressure.next(flush=False, timeout=TIMEOUT)
+                durations.append(time.perf_counter() - t0)
+                await salobj.set_summary_state(
+                    remote, salobj.State.STANDBY, timeout=TIMEOUT
+                )
+                # let a warm standby poll the devices
+                await asyncio.sleep(1)
+    finally:
+        await csc.close()
+    # the first enable is never warm
+    return durations[1:]
+
+
+async def arun(num_runs):
+    salobj.set_random_lsst_dds_partition_prefix()
+    durations = [await measure_once() for i in range(num_runs)]
+    results = dict()
+    for name, values in zip(
+        ("csc_startup", "csc_enable", "csc_first_telemetry", "csc_standby"),
+        zip(*durations),
+    ):
+        results.update(common.summarize(name, values))
+    cold = await measure_restarts("high_rate_config.yaml", num_runs)
+    warm = await measure_restarts("warm_standby_config.yaml", num_runs)
+    results.update(common.summarize("csc_restart_cold_first_telemetry", cold))
+    results.update(common.summarize("csc_restart_warm_first_telemetry", warm))
+    results["csc_restart_warm_speedup"] = float(np.median(cold) / np.median(warm))
+    return results
+
+
+def run(quick=False):
+    return asyncio.run(arun(num_runs=2 if quick else 5))
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""Benchmark of streaming filters of every sample, 64 channels at 200 Hz.
+
+Every channel has a 5-sample running median, a 4-sample moving average
+and a first-order low-pass, the most expensive combination. Times:
+
+* `ChannelFilter.process` of one sample (as `AdamCSC.telemetry_loop`
+  does) and of a batch of 20 samples (as
+  `AdamCSC.worker_telemetry_loop` does with a 0.1 s publish interval),
+  against a per-channel Python loop computing the same filters
+* the peak memory allocated while filtering, measured with
+  tracemalloc, which should be no more than numpy's small temporaries
+* a sustained 200 Hz loop that converts and filters each sample, as the
+  CSC telemetry loop does, reporting the achieved rate, the per-sample
+  cost and CPU usage
+
+Run with ``python benchmarks/bench_filters.py [--quick] [--json f.json]``.
+"""
+import asyncio
+import collections
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+
+from lsst.ts import adamSensors
+
+import common
+
+NUM_CHANNELS = 64
+SAMPLE_RATE = 200
+BATCH_SIZE = 20
+SETTINGS = dict(median_length=5, average_length=4, time_constant=0.05)
+
+
+class PerChannelFilter:
+    """The same filters computed channel by channel, for comparison."""
+
+    def __init__(self, num_channels):
+        self.alpha = 1 - np.exp(-1 / SAMPLE_RATE / SETTINGS["time_constant"])
+        self.medians = [
+            collections.deque(maxlen=SETTINGS["median_length"])
+            for _ in range(num_channels)
+        ]
+        self.averages = [
+            collections.deque(maxlen=SETTINGS["average_length"])
+            for _ in range(num_channels)
+        ]
+        self.state = [None] * num_channels
+
+    def process(self, values):
+        output = []
+        for channel, value in enumerate(values):
+            median_window = self.medians[channel]
+            median_window.append(value)
+            average_window = self.averages[channel]
+            average_window.append(statistics.median(median_window))
+            average = sum(average_window) / len(average_window)
+            state = self.state[channel]
+            state = average if state is None else state + self.alpha * (average - state)
+            self.state[channel] = state
+            output.append(state)
+        return output
+
+
+def make_filter():
+    return adamSensors.ChannelFilter([SETTINGS] * NUM_CHANNELS, 1 / SAMPLE_RATE)
+
+
+def peak_allocated_bytes(channel_filter, samples):
+    """Return the peak memory allocated while filtering samples."""
+    channel_filter.process(samples[0])
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    for sample in samples:
+        channel_filter.process(sample)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - base
+
+
+async def sustained(duration):
+    converter = adamSensors.ChannelConverter([[1.0, 0.0]] * NUM_CHANNELS)
+    channel_filter = make_filter()
+    scheduler = adamSensors.FixedRateScheduler(1 / SAMPLE_RATE)
+    rng = np.random.default_rng(1)
+    counts = rng.integers(20000, 45000, size=(1000, NUM_CHANNELS)).astype(float)
+    num_cycles = round(duration * SAMPLE_RATE)
+    durations = []
+    wall0 = time.perf_counter()
+    cpu0 = time.process_time()
+    for i in range(num_cycles):
+        await scheduler.wait()
+        t0 = time.perf_counter()
+        channel_filter.process(converter.convert(counts[i % len(counts)]))
+        durations.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+    prefix = f"filters_{SAMPLE_RATE}hz_{NUM_CHANNELS}ch"
+    results = common.summarize(f"{prefix}_per_sample", durations)
+    results[f"{prefix}_achieved_hz"] = num_cycles / wall
+    results[f"{prefix}_num_overruns"] = scheduler.num_overruns
+    results[f"{prefix}_cpu_percent"] = 100 * cpu / wall
+    return results
+
+
+def run(quick=False):
+    rng = np.random.default_rng(2)
+    samples = rng.normal(size=(BATCH_SIZE, NUM_CHANNELS))
+    channel_filter = make_filter()
+    per_channel = PerChannelFilter(NUM_CHANNELS)
+    sample = samples[0].copy()
+
+    def process_batch():
+        channel_filter.process(samples.copy())
+
+    results = dict()
+    prefix = f"filters_{NUM_CHANNELS}ch"
+    vector_time = common.time_call(channel_filter.process, sample)
+    scalar_time = common.time_call(per_channel.process, sample.tolist())
+    batch_time = common.time_call(process_batch)
+    results[f"{prefix}_sample_ms"] = vector_time * 1000
+    results[f"{prefix}_sample_per_channel_ms"] = scalar_time * 1000
+    results[f"{prefix}_sample_speedup"] = scalar_time / vector_time
+    results[f"{prefix}_batch{BATCH_SIZE}_ms"] = batch_time * 1000
+    results[f"{prefix}_samples_per_sec"] = BATCH_SIZE / batch_time
+    results[f"{prefix}_peak_allocated_bytes"] = peak_allocated_bytes(
+        make_filter(), samples
+    )
+    results.update(asyncio.run(sustained(duration=2 if quick else 10)))
+    return results
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
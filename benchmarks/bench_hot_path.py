@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""Benchmark of each stage of the acquisition-to-publish hot path.
+
+Times, without the fixed-rate scheduler's sleeps:
+
+* read latency of `AdamModel.read_voltage`, against the mock client and
+  against a local `AdamSimulator` over TCP
+* conversion of one publish interval of samples to engineering units,
+  with the per-channel statistics
+* publishing one set of values with `PublishPlan`
+* one complete telemetry loop cycle (poll, history, conversion,
+  statistics and publish) against the mock client
+
+Topics are the stand-ins of ``bench_publisher``, so no DDS is involved;
+``bench_csc`` covers the CSC itself.
+
+Run with ``python benchmarks/bench_hot_path.py [--quick] [--json out.json]``.
+"""
+import asyncio
+import time
+import types
+
+import numpy as np
+
+from lsst.ts import adamSensors
+
+import common
+from bench_publisher import FakeTopic, SENSOR_TYPES
+
+NUM_CHANNELS = 6
+PUBLISH_CYCLES = 10
+COEFFICIENTS = [[1.0, 0.0]] * 3 + [[344738.0, 0.0]] + [[0.5, 1.0, -2.0]] * 2
+
+
+async def read_latency(model, num_reads):
+    await model.connect()
+    durations = []
+    for i in range(num_reads):
+        t0 = time.perf_counter()
+        await model.read_voltage()
+        durations.append(time.perf_counter() - t0)
+    await model.close()
+    return durations
+
+
+async def cycle_latency(num_cycles):
+    """Time the telemetry loop body, as in `AdamCSC.telemetry_loop`."""
+    poller = adamSensors.AdamPoller(
+        {"adam": adamSensors.AdamModel("fakeIP", 502, simulation_mode=True)}
+    )
+    await poller.connect()
+    converter = adamSensors.ChannelConverter(COEFFICIENTS)
+    owner = types.SimpleNamespace(tel_pressure=FakeTopic(), tel_temperature=FakeTopic())
+    plan = adamSensors.PublishPlan(SENSOR_TYPES, owner)
+    history = adamSensors.SampleHistory(PUBLISH_CYCLES * 100, NUM_CHANNELS)
+    counts = np.full(NUM_CHANNELS, np.nan)
+
+    sample_durations = []
+    publish_durations = []
+    for i in range(num_cycles * PUBLISH_CYCLES):
+        t0 = time.perf_counter()
+        results = await poller.poll()
+        counts.fill(np.nan)
+        counts[:] = results["adam"][:NUM_CHANNELS]
+        history.append(time.time(), counts)
+        if (i + 1) % PUBLISH_CYCLES != 0:
+            sample_durations.append(time.perf_counter() - t0)
+            continue
+        timestamps, window = history.last(PUBLISH_CYCLES)
+        statistics = adamSensors.channel_statistics(converter.convert(window))
+        plan.publish(statistics.mean)
+        publish_durations.append(time.perf_counter() - t0)
+    await poller.close()
+    return sample_durations, publish_durations
+
+
+async def arun(num_reads, num_cycles):
+    results = common.summarize(
+        "read_voltage_mock",
+        await read_latency(
+            adamSensors.AdamModel("fakeIP", 502, simulation_mode=True), num_reads
+        ),
+    )
+    async with adamSensors.AdamSimulator() as simulator:
+        results.update(
+            common.summarize(
+                "read_voltage_tcp",
+                await read_latency(
+                    adamSensors.AdamModel(simulator.host, simulator.port), num_reads
+                ),
+            )
+        )
+
+    sample_durations, publish_durations = await cycle_latency(num_cycles)
+    results.update(common.summarize("cycle_sample", sample_durations))
+    results.update(common.summarize("cycle_publish", publish_durations))
+    return results
+
+
+def run(quick=False):
+    if quick:
+        results = asyncio.run(arun(num_reads=100, num_cycles=20))
+    else:
+        results = asyncio.run(arun(num_reads=1000, num_cycles=200))
+
+    converter = adamSensors.ChannelConverter(COEFFICIENTS)
+    window = np.random.default_rng(1).integers(
+        0, 65536, size=(PUBLISH_CYCLES, NUM_CHANNELS)
+    )
+    window = window.astype(float)
+    results["convert_window_us"] = common.time_call(converter.convert, window) * 1e6
+    converted = converter.convert(window)
+    statistics_time = common.time_call(adamSensors.channel_statistics, converted)
+    results["statistics_window_us"] = statistics_time * 1e6
+
+    owner = types.SimpleNamespace(tel_pressure=FakeTopic(), tel_temperature=FakeTopic())
+    plan = adamSensors.PublishPlan(SENSOR_TYPES, owner)
+    results["publish_us"] = common.time_call(plan.publish, window[0]) * 1e6
+    return results
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""Benchmark of the instrumentation of the telemetry loop.
+
+Times the calls `AdamCSC.telemetry_loop` makes to record its stages:
+
+* `StageLatencies.record`, enabled and disabled
+  (``instrumentation_enabled: false``)
+* `RoundTripEstimator.update`, which `AdamModel` calls for every read
+* the recording done for one sample of one device: a record of each of
+  the stages timed every sample, and one round-trip update, as a time
+  and as a CPU fraction at 100 Hz
+
+Run with ``python benchmarks/bench_instrumentation.py [--quick]
+[--json out.json]``.
+"""
+from lsst.ts import adamSensors
+
+import common
+
+# the stages of `AdamCSC.latency_stages` that `AdamCSC.telemetry_loop`
+# records every sample; the others are recorded once per publication, or
+# only if filters or limits are configured
+SAMPLE_STAGES = ("wakeup", "read", "store", "cycle")
+STAGES = ("wakeup", "read", "store", "filter", "limits", "convert", "publish", "cycle")
+SAMPLE_RATE = 100
+
+
+def run(quick=False):
+    min_time = 0.05 if quick else 0.2
+    latencies = adamSensors.StageLatencies(STAGES)
+    disabled = adamSensors.StageLatencies(STAGES, enabled=False)
+    estimator = adamSensors.RoundTripEstimator()
+    # a few hundred microseconds, as a mock read takes
+    duration = 2e-4
+
+    def record_sample():
+        for stage in SAMPLE_STAGES:
+            latencies.record(stage, duration)
+        estimator.update(duration)
+
+    results = dict()
+    record_time = common.time_call(
+        latencies.record, "read", duration, min_time=min_time
+    )
+    results["record_us"] = record_time * 1e6
+    results["record_disabled_us"] = (
+        common.time_call(disabled.record, "read", duration, min_time=min_time) * 1e6
+    )
+    results["round_trip_update_us"] = (
+        common.time_call(estimator.update, duration, min_time=min_time) * 1e6
+    )
+    sample_time = common.time_call(record_sample, min_time=min_time)
+    results["per_sample_us"] = sample_time * 1e6
+    results[f"per_sample_{SAMPLE_RATE}hz_cpu_percent"] = 100 * sample_time * SAMPLE_RATE
+    return results
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""Benchmark of limit checking of every sample, 64 channels at 200 Hz.
+
+Every channel has warning and alarm limits on both sides, rate limits
+and hysteresis. Times:
+
+* `LimitChecker.check` of one sample, with values inside the limits
+  (the usual case) and with every channel changing severity every
+  sample (the worst case), against a per-channel Python loop doing the
+  same comparisons
+* a sustained 200 Hz loop that converts each sample of 64 channels and
+  checks it, as the CSC telemetry loop does, reporting the achieved
+  rate, the per-sample cost and CPU usage
+
+Run with ``python benchmarks/bench_limits.py [--quick] [--json f.json]``.
+"""
+import asyncio
+import time
+
+import numpy as np
+
+from lsst.ts import adamSensors
+
+import common
+
+NUM_CHANNELS = 64
+SAMPLE_RATE = 200
+LIMITS = dict(
+    warning_low=-5,
+    warning_high=5,
+    alarm_low=-8,
+    alarm_high=8,
+    warning_rate=100,
+    alarm_rate=1000,
+    hysteresis=0.1,
+)
+
+
+def per_channel(limits, severity, values):
+    """Check one sample channel by channel, for comparison."""
+    changed = []
+    for channel, value in enumerate(values):
+        if value != value:
+            continue
+        new_severity = 0
+        if value < limits["warning_low"] or value > limits["warning_high"]:
+            new_severity = 1
+        if value < limits["alarm_low"] or value > limits["alarm_high"]:
+            new_severity = 2
+        if new_severity < severity[channel]:
+            level = "alarm" if severity[channel] == 2 else "warning"
+            low = limits[f"{level}_low"] + limits["hysteresis"]
+            high = limits[f"{level}_high"] - limits["hysteresis"]
+            if value < low or value > high:
+                new_severity = severity[channel]
+        if new_severity != severity[channel]:
+            severity[channel] = new_severity
+            changed.append(channel)
+    return changed
+
+
+async def sustained(duration):
+    converter = adamSensors.ChannelConverter([[1.0, 0.0]] * NUM_CHANNELS)
+    checker = adamSensors.LimitChecker([LIMITS] * NUM_CHANNELS)
+    scheduler = adamSensors.FixedRateScheduler(1 / SAMPLE_RATE)
+    rng = np.random.default_rng(1)
+    counts = rng.integers(20000, 45000, size=(1000, NUM_CHANNELS)).astype(float)
+    num_cycles = round(duration * SAMPLE_RATE)
+    durations = []
+    wall0 = time.perf_counter()
+    cpu0 = time.process_time()
+    for i in range(num_cycles):
+        await scheduler.wait()
+        t0 = time.perf_counter()
+        checker.check(converter.convert(counts[i % len(counts)]), t0)
+        durations.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+    prefix = f"limits_{SAMPLE_RATE}hz_{NUM_CHANNELS}ch"
+    results = common.summarize(f"{prefix}_per_sample", durations)
+    results[f"{prefix}_achieved_hz"] = num_cycles / wall
+    results[f"{prefix}_num_overruns"] = scheduler.num_overruns
+    results[f"{prefix}_cpu_percent"] = 100 * cpu / wall
+    return results
+
+
+def run(quick=False):
+    checker = adamSensors.LimitChecker([LIMITS] * NUM_CHANNELS)
+    severity = [0] * NUM_CHANNELS
+    inside = np.linspace(-4, 4, NUM_CHANNELS)
+    # alternately all in alarm and all back to normal
+    crossing = [np.full(NUM_CHANNELS, 9.0), np.zeros(NUM_CHANNELS)]
+
+    def check_crossing():
+        checker.check(crossing[checker.num_changes // NUM_CHANNELS % 2], 0)
+
+    results = dict()
+    prefix = f"limits_check_{NUM_CHANNELS}ch"
+    vector_time = common.time_call(checker.check, inside, 0)
+    scalar_time = common.time_call(per_channel, LIMITS, severity, inside.tolist())
+    results[f"{prefix}_inside_ms"] = vector_time * 1000
+    results[f"{prefix}_inside_per_channel_ms"] = scalar_time * 1000
+    results[f"{prefix}_inside_speedup"] = scalar_time / vector_time
+    results[f"{prefix}_crossing_ms"] = common.time_call(check_crossing) * 1000
+    results.update(asyncio.run(sustained(duration=2 if quick else 10)))
+    return results
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""Scaling benchmark of AdamPoller cycle latency against N mock devices.
+
+Each mock device answers a read after a fixed simulated round trip time
+(5 ms). For each device count, and with max_concurrency 8 and 64, the
+benchmark reports the median and maximum time of a full poll cycle.
+
+Run with ``python benchmarks/bench_poller.py [--quick] [--json out.json]``.
+"""
+import asyncio
+import time
+
+from lsst.ts import adamSensors
+
+import common
+
+DEVICE_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+MAX_CONCURRENCIES = (8, 64)
+LATENCY = 0.005
+
+
+async def measure(num_devices, max_concurrency, num_cycles):
+    models = {
+        f"adam{i}": adamSensors.AdamModel("fakeIP", 502 + i, simulation_mode=True)
+        for i in range(num_devices)
+    }
+    poller = adamSensors.AdamPoller(models, max_concurrency=max_concurrency)
+    await poller.connect()
+    for model in models.values():
+        model.client.latency = LATENCY
+    durations = []
+    for i in range(num_cycles):
+        t0 = time.perf_counter()
+        await poller.poll()
+        durations.append(time.perf_counter() - t0)
+    await poller.close()
+    return durations
+
+
+async def arun(num_cycles):
+    results = dict()
+    for max_concurrency in MAX_CONCURRENCIES:
+        for num_devices in DEVICE_COUNTS:
+            durations = await measure(num_devices, max_concurrency, num_cycles)
+            results.update(
+                common.summarize(
+                    f"poll_devices_{num_devices}_concurrency_{max_concurrency}",
+                    durations,
+                )
+            )
+    return results
+
+
+def run(quick=False):
+    return asyncio.run(arun(num_cycles=5 if quick else 20))
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
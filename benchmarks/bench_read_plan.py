@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""Round trips and cycle time of reading all ADAM-6024 data per cycle.
+
+Reads the analog inputs, analog output readback, analog input status and
+digital I/O of a local `AdamSimulator` (1 ms latency) over TCP, either:
+
+* one request per register range, each awaited in turn (the way
+  `AdamModel.read_counts` read the analog inputs), or
+* with `AdamModel.read_snapshot`, which merges the ranges into as few
+  requests as possible and sends them all at once.
+
+Run with ``python benchmarks/bench_read_plan.py [--quick] [--json out.json]``.
+"""
+import asyncio
+import time
+
+from lsst.ts import adamSensors
+from lsst.ts.adamSensors.readplan import REGISTER_TABLES
+
+import common
+
+LATENCY = 0.001
+RANGES = (adamSensors.ADAM6024_ANALOG_INPUTS, *adamSensors.ADAM6024_DIAGNOSTIC_RANGES)
+
+
+async def read_one_at_a_time(model):
+    protocol = model.client.protocol
+    for register_range in RANGES:
+        method = getattr(protocol, REGISTER_TABLES[register_range.table][0])
+        await method(
+            register_range.address, register_range.count, unit=register_range.unit
+        )
+
+
+async def read_planned(model):
+    await model.read_snapshot()
+
+
+async def measure(simulator, read, num_cycles):
+    model = adamSensors.AdamModel(
+        simulator.host,
+        simulator.port,
+        extra_ranges=adamSensors.ADAM6024_DIAGNOSTIC_RANGES,
+    )
+    await model.connect()
+    num_requests0 = simulator.num_requests
+    durations = []
+    for i in range(num_cycles):
+        t0 = time.perf_counter()
+        await read(model)
+        durations.append(time.perf_counter() - t0)
+    await model.close()
+    return (simulator.num_requests - num_requests0) / num_cycles, durations
+
+
+async def arun(num_cycles):
+    results = dict()
+    async with adamSensors.AdamSimulator(latency=LATENCY) as simulator:
+        for name, read in (
+            ("one_at_a_time", read_one_at_a_time),
+            ("planned", read_planned),
+        ):
+            round_trips, durations = await measure(simulator, read, num_cycles)
+            results[f"read_{name}_requests_per_cycle"] = round_trips
+            results.update(common.summarize(f"read_{name}_cycle", durations))
+    return results
+
+
+def run(quick=False):
+    return asyncio.run(arun(num_cycles=50 if quick else 500))
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Throughput of recorded data replayed through the acquisition stack.
+
+Writes a synthetic recording to a temporary spool, then plays it back with
+a `ReplaySource`, one recorded sample per read, through the mock client,
+`AdamModel`, `AdamPoller`, sample history, conversion, statistics and
+`PublishPlan` (with a deadband), as fast as they go. This gives the most
+samples per second the stack can take, without the fixed-rate scheduler,
+and shows how far a recording can be time-compressed in simulation.
+
+Topics are the stand-ins of ``bench_publisher``, so no DDS is involved.
+
+Run with ``python benchmarks/bench_replay.py [--quick] [--json out.json]``.
+"""
+import asyncio
+import tempfile
+import time
+import types
+
+import numpy as np
+
+from lsst.ts import adamSensors
+
+import common
+from bench_publisher import FakeTopic, SENSOR_TYPES
+
+NUM_CHANNELS = 6
+RECORDED_RATE = 100  # Hz
+PUBLISH_CYCLES = 100
+COEFFICIENTS = [[1.0, 0.0]] * 3 + [[344738.0, 0.0]] + [[0.5, 1.0, -2.0]] * 2
+
+
+async def write_recording(directory, num_samples):
+    rng = np.random.default_rng(1)
+    timestamps = 1600000000.0 + np.arange(num_samples) / RECORDED_RATE
+    phase = np.arange(num_samples)[:, np.newaxis] / 500 + np.arange(NUM_CHANNELS)
+    counts = 32768 + 20000 * np.sin(phase) + rng.normal(0, 50, phase.shape)
+    writer = adamSensors.SpoolWriter(
+        directory, NUM_CHANNELS, max_pending=num_samples // 1000 + 1
+    )
+    for timestamp, sample in zip(timestamps, np.rint(counts)):
+        writer.append(timestamp, sample)
+    await writer.close()
+
+
+async def replay(directory, num_cycles):
+    source = adamSensors.ReplaySource.from_spool(directory, speed=None)
+    poller = adamSensors.AdamPoller(
+        {
+            "adam": adamSensors.AdamModel(
+                "fakeIP", 502, simulation_mode=True, replay_source=source
+            )
+        }
+    )
+    await poller.connect()
+    converter = adamSensors.ChannelConverter(COEFFICIENTS)
+    owner = types.SimpleNamespace(tel_pressure=FakeTopic(), tel_temperature=FakeTopic())
+    plan = adamSensors.PublishPlan(
+        SENSOR_TYPES,
+        owner,
+        change_filter=adamSensors.ChangeFilter(
+            deadband=[0.01] * NUM_CHANNELS, relative_deadband=[0] * NUM_CHANNELS
+        ),
+    )
+    history = adamSensors.SampleHistory(PUBLISH_CYCLES * 10, NUM_CHANNELS)
+    counts = np.full(NUM_CHANNELS, np.nan)
+
+    num_samples = num_cycles * PUBLISH_CYCLES
+    t0 = time.perf_counter()
+    for i in range(num_samples):
+        results = await poller.poll()
+        counts[:] = results["adam"][:NUM_CHANNELS]
+        history.append(i / RECORDED_RATE, counts)
+        if (i + 1) % PUBLISH_CYCLES == 0:
+            timestamps, window = history.last(PUBLISH_CYCLES)
+            statistics = adamSensors.channel_statistics(converter.convert(window))
+            plan.publish(statistics.mean, timestamps[-1])
+    duration = time.perf_counter() - t0
+    await poller.close()
+    assert source.num_reads == num_samples
+    samples_per_sec = num_samples / duration
+    return {
+        "replay_samples_per_sec": samples_per_sec,
+        "replay_max_speedup": samples_per_sec / RECORDED_RATE,
+        "replay_num_published": sum(plan.num_sent.values()),
+    }
+
+
+async def arun(num_cycles):
+    with tempfile.TemporaryDirectory() as directory:
+        await write_recording(directory, num_cycles * PUBLISH_CYCLES // 2)
+        return await replay(directory, num_cycles)
+
+
+def run(quick=False):
+    return asyncio.run(arun(num_cycles=50 if quick else 500))
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""End-to-end poll latency and throughput against local Modbus/TCP
+simulators.
+
+Reads go through `AdamModel` and the real pymodbus client over TCP, so
+framing and socket round trips are included. Reports:
+
+* single-device read latency (median, p99) for sequential reads
+* single-device throughput with several requests in flight on one
+  connection
+* poll cycle latency with `AdamPoller` across N simulators
+
+Run with ``python benchmarks/bench_simulator.py [--quick] [--json out.json]``.
+"""
+import asyncio
+import time
+
+from lsst.ts import adamSensors
+
+import common
+
+DEVICE_COUNTS = (1, 4, 16, 64)
+LATENCY = 0.001
+JITTER = 0.0005
+
+
+async def read_latency(simulator, num_reads):
+    model = adamSensors.AdamModel("127.0.0.1", simulator.port)
+    await model.connect()
+    durations = []
+    for i in range(num_reads):
+        t0 = time.perf_counter()
+        await model.read_counts()
+        durations.append(time.perf_counter() - t0)
+    await model.close()
+    return durations
+
+
+async def throughput(simulator, num_reads, num_in_flight):
+    model = adamSensors.AdamModel("127.0.0.1", simulator.port)
+    await model.connect()
+
+    async def reader(n):
+        for i in range(n):
+            await model.read_counts()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(
+        *[reader(num_reads // num_in_flight) for i in range(num_in_flight)]
+    )
+    duration = time.perf_counter() - t0
+    await model.close()
+    return (num_reads // num_in_flight) * num_in_flight / duration
+
+
+async def poll_latency(num_devices, latency, jitter, num_cycles):
+    simulators = await adamSensors.start_simulators(
+        num_devices, latency=latency, jitter=jitter
+    )
+    poller = adamSensors.AdamPoller(
+        {
+            f"adam{i}": adamSensors.AdamModel("127.0.0.1", simulator.port)
+            for i, simulator in enumerate(simulators)
+        },
+        max_concurrency=num_devices,
+    )
+    await poller.connect()
+    durations = []
+    for i in range(num_cycles):
+        t0 = time.perf_counter()
+        await poller.poll()
+        durations.append(time.perf_counter() - t0)
+    await poller.close()
+    for simulator in simulators:
+        await simulator.close()
+    return durations
+
+
+async def arun(num_reads, num_cycles):
+    async with adamSensors.AdamSimulator(latency=LATENCY, jitter=JITTER) as simulator:
+        durations = await read_latency(simulator, num_reads)
+        results = common.summarize("tcp_read", durations)
+        for num_in_flight in (1, 4, 16):
+            rate = await throughput(simulator, num_reads, num_in_flight)
+            results[f"tcp_reads_{num_in_flight}_in_flight_per_sec"] = rate
+
+    for num_devices in DEVICE_COUNTS:
+        durations = await poll_latency(num_devices, LATENCY, JITTER, num_cycles)
+        results.update(common.summarize(f"tcp_poll_devices_{num_devices}", durations))
+    return results
+
+
+def run(quick=False):
+    if quick:
+        return asyncio.run(arun(num_reads=100, num_cycles=10))
+    return asyncio.run(arun(num_reads=1000, num_cycles=50))
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
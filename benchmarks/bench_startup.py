@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""Benchmark of process startup: import times and time to first sample.
+
+Each measurement launches a fresh Python interpreter, so nothing is
+cached between runs, and times it from launch until it exits:
+
+* interpreter: an empty script, the floor of all the others
+* import_package: ``import lsst.ts.adamSensors``
+* import_config_schema: getting ``CONFIG_SCHEMA``, e.g. to check a
+  configuration file
+* import_model: getting `AdamModel`, which imports numpy and pymodbus
+* import_csc: getting `AdamCSC`, which also imports salobj
+* first_sample: importing, connecting a mock device, reading it and
+  publishing the converted sample to stand-in topics, which is the
+  CSC's path from process launch to first published sample without
+  DDS (``bench_csc`` times the CSC itself once it is running)
+
+Run with ``python benchmarks/bench_startup.py [--quick] [--json out.json]``.
+"""
+import subprocess
+import sys
+import time
+
+import common
+
+FIRST_SAMPLE_SCRIPT = """
+import asyncio
+import types
+
+from lsst.ts import adamSensors
+
+
+class Topic:
+    def set_put(self, **kwargs):
+        pass
+
+
+async def first_sample():
+    poller = adamSensors.AdamPoller(
+        {"adam": adamSensors.AdamModel("fakeIP", 502, simulation_mode=True)}
+    )
+    await poller.connect()
+    results = await poller.poll()
+    converter = adamSensors.ChannelConverter([[1.0, 0.0]] * 6)
+    owner = types.SimpleNamespace(tel_pressure=Topic(), tel_temperature=Topic())
+    plan = adamSensors.PublishPlan(["Pressure"] * 5 + ["Temperature"], owner)
+    plan.publish(converter.convert(results["adam"]))
+    await poller.close()
+
+
+asyncio.run(first_sample())
+"""
+
+SCRIPTS = {
+    "interpreter": "",
+    "import_package": "import lsst.ts.adamSensors",
+    "import_config_schema": "from lsst.ts.adamSensors import CONFIG_SCHEMA",
+    "import_model": "from lsst.ts.adamSensors import AdamModel",
+    "import_csc": "from lsst.ts.adamSensors import AdamCSC",
+    "first_sample": FIRST_SAMPLE_SCRIPT,
+}
+
+
+def launch(script):
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", script], check=True)
+    return time.perf_counter() - t0
+
+
+def run(quick=False):
+    num_runs = 5 if quick else 30
+    results = dict()
+    for name, script in SCRIPTS.items():
+        try:
+            durations = [launch(script) for i in range(num_runs)]
+        except subprocess.CalledProcessError:
+            # e.g. salobj is not installed
+            print(f"Skipping {name}: the script failed")
+            continue
+        results.update(common.summarize(f"startup_{name}", durations))
+    return results
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""Benchmark of sample timing with and without the acquisition worker.
+
+Samples the mock device at 200 Hz for a few seconds, either in the
+event loop (as `AdamCSC.telemetry_loop` does) or in an `AcquisitionWorker`
+process (``acquisition_worker``, as `AdamCSC.worker_telemetry_loop`
+does), and reports the jitter of the sample times: how far each
+interval between acquisition timestamps is from the sample interval.
+
+Each mode runs idle and under synthetic load on the event loop: every
+20 ms a handler blocks the loop for 0-8 ms, as a slow command handler or
+a burst of DDS traffic would, and every 200 ms a garbage collection of a
+large heap of small objects runs.
+
+Run with ``python benchmarks/bench_worker.py [--quick] [--json f.json]``.
+"""
+import asyncio
+import gc
+import random
+import time
+
+import numpy as np
+
+from lsst.ts import adamSensors
+
+import common
+
+SAMPLE_INTERVAL = 0.005
+
+
+async def load_event_loop():
+    """Block the event loop in bursts, forever."""
+    garbage = []
+    num_cycles = 0
+    while True:
+        await asyncio.sleep(0.02)
+        t0 = time.perf_counter()
+        while time.perf_counter() - t0 < random.uniform(0, 0.008):
+            pass
+        num_cycles += 1
+        if num_cycles % 10 == 0:
+            garbage = [[i] for i in range(200_000)]
+            gc.collect()
+    del garbage
+
+
+async def sample_in_process(duration):
+    model = adamSensors.AdamModel("fakeIP", 502, simulation_mode=True)
+    poller = adamSensors.AdamPoller({"adam": model})
+    await poller.connect()
+    scheduler = adamSensors.FixedRateScheduler(SAMPLE_INTERVAL)
+    timestamps = []
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < duration:
+        await scheduler.wait()
+        await poller.poll()
+        timestamps.append(model.last_read_time)
+    await poller.close()
+    return np.array(timestamps)
+
+
+async def sample_in_worker(duration):
+    worker = adamSensors.AcquisitionWorker(
+        [dict(name="adam", ip="fakeIP", port=502)],
+        sample_interval=SAMPLE_INTERVAL,
+        capacity=round(10 / SAMPLE_INTERVAL),
+        model_kwargs=dict(simulation_mode=True),
+    )
+    await worker.start()
+    # skip the samples taken while this loop was waiting for the start
+    worker.read()
+    timestamps = []
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < duration:
+        await asyncio.sleep(0.1)
+        timestamps.append(worker.read()[0])
+    await worker.stop()
+    return np.concatenate(timestamps)
+
+
+async def measure(mode, loaded, duration):
+    load_task = asyncio.create_task(load_event_loop()) if loaded else None
+    try:
+        if mode == "in_worker":
+            timestamps = await sample_in_worker(duration)
+        else:
+            timestamps = await sample_in_process(duration)
+    finally:
+        if load_task is not None:
+            load_task.cancel()
+    prefix = f"sample_{mode}_{'loaded' if loaded else 'idle'}"
+    deviations = np.abs(np.diff(timestamps) - SAMPLE_INTERVAL)
+    metrics = common.summarize(f"{prefix}_jitter", deviations)
+    metrics[f"{prefix}_achieved_hz"] = (len(timestamps) - 1) / (
+        timestamps[-1] - timestamps[0]
+    )
+    return metrics
+
+
+async def arun(duration):
+    results = dict()
+    for mode in ("in_process", "in_worker"):
+        for loaded in (False, True):
+            results.update(await measure(mode, loaded, duration))
+    for load in ("idle", "loaded"):
+        in_process = results[f"sample_in_process_{load}_jitter_p99_ms"]
+        in_worker = results[f"sample_in_worker_{load}_jitter_p99_ms"]
+        results[f"worker_{load}_jitter_p99_speedup"] = in_process / in_worker
+    return results
+
+
+def run(quick=False):
+    return asyncio.run(arun(duration=2 if quick else 10))
+
+
+if __name__ == "__main__":
+    common.main(run, __doc__)
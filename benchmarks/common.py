@@ -0,0 +1,108 @@
+"""Helpers shared by the benchmark scripts.
+
+Every benchmark module has a ``run(quick=False)`` function that returns a
+flat dict of metric name: value. Metric names end in a unit; by
+convention, metrics ending in ``_per_sec``, ``_hz`` or ``speedup`` are
+better when higher, and all others (times, CPU fractions, counts of
+overruns) are better when lower. Metrics ending in ``_max_ms`` are
+reported but too noisy to compare between runs.
+"""
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+HIGHER_IS_BETTER_SUFFIXES = ("_per_sec", "_hz", "speedup")
+UNCOMPARED_SUFFIXES = ("_max_ms",)
+
+
+def higher_is_better(name):
+    """Is a larger value of this metric an improvement?"""
+    return name.endswith(HIGHER_IS_BETTER_SUFFIXES)
+
+
+def is_compared(name):
+    """Should this metric be compared with a baseline?"""
+    return not name.endswith(UNCOMPARED_SUFFIXES)
+
+
+def time_call(func, *args, min_time=0.2):
+    """Return the mean time (sec) of one call, repeating calls for at
+    least ``min_time`` seconds.
+    """
+    num_calls = 0
+    t0 = time.perf_counter()
+    while True:
+        func(*args)
+        num_calls += 1
+        duration = time.perf_counter() - t0
+        if duration >= min_time:
+            return duration / num_calls
+
+
+def summarize(prefix, durations):
+    """Summarize durations (sec) as median, p99 and max in milliseconds.
+
+    Returns
+    -------
+    metrics : dict
+        ``{prefix}_median_ms``, ``{prefix}_p99_ms`` and ``{prefix}_max_ms``
+    """
+    durations = np.asarray(durations) * 1000
+    return {
+        f"{prefix}_median_ms": float(np.median(durations)),
+        f"{prefix}_p99_ms": float(np.percentile(durations, 99)),
+        f"{prefix}_max_ms": float(durations.max()),
+    }
+
+
+def metadata():
+    """Describe the code and machine the benchmarks ran on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    try:
+        from lsst.ts.adamSensors import __version__
+    except ImportError:
+        __version__ = "unknown"
+    return dict(
+        date=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        version=__version__,
+        commit=commit,
+        python=sys.version.split()[0],
+        numpy=np.__version__,
+        platform=platform.platform(),
+        processor=platform.processor(),
+    )
+
+
+def write_json(path, results):
+    """Write benchmark results, with metadata, to a JSON file."""
+    with open(path, "w") as f:
+        json.dump(dict(metadata=metadata(), results=results), f, indent=2)
+
+
+def print_results(results):
+    for name, value in results.items():
+        print(f"{name:50s} {value:14.4f}")
+
+
+def main(run, description):
+    """Command-line entry point for a single benchmark module."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--quick", action="store_true", help="shorter runs")
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args()
+    results = run(quick=args.quick)
+    print_results(results)
+    if args.json:
+        write_json(args.json, results)
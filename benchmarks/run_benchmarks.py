@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""Run the benchmark suite and compare the results with a baseline.
+
+Runs every ``bench_*.py`` module in this directory (or those selected
+with ``--only``) and writes all their metrics, with metadata about the
+code and machine, to one JSON file. Metric names are prefixed with the
+module name, e.g. ``hot_path.cycle_publish_median_ms``.
+
+Given ``--baseline``, a results file from an earlier run, each metric
+present in both is compared and the run fails (exit status 1) if any
+metric is worse than the baseline by more than ``--tolerance`` (a
+fraction). See ``common.py`` for which metrics are better when higher.
+
+Examples::
+
+    python benchmarks/run_benchmarks.py --output baseline.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json
+"""
+import argparse
+import importlib
+import json
+import pathlib
+import sys
+import traceback
+
+import common
+
+BENCHMARK_DIR = pathlib.Path(__file__).parent
+
+
+def find_benchmarks():
+    """Return the names of the benchmark modules, without ``bench_``."""
+    return sorted(
+        path.stem.replace("bench_", "", 1) for path in BENCHMARK_DIR.glob("bench_*.py")
+    )
+
+
+def run_benchmarks(names, quick):
+    """Run the named benchmarks.
+
+    Returns
+    -------
+    results : dict
+        metric name: value, for all benchmarks that ran
+    errors : dict
+        benchmark name: error message, for benchmarks that failed
+    """
+    results = dict()
+    errors = dict()
+    for name in names:
+        print(f"Running {name}...", flush=True)
+        try:
+            module = importlib.import_module(f"bench_{name}")
+            module_results = module.run(quick=quick)
+        except Exception as e:
+            traceback.print_exc()
+            errors[name] = repr(e)
+            continue
+        for metric, value in module_results.items():
+            results[f"{name}.{metric}"] = float(value)
+    return results, errors
+
+
+def compare(results, baseline, tolerance):
+    """Compare results with a baseline.
+
+    Returns
+    -------
+    regressions : list of tuple
+        (metric name, baseline value, new value, relative change) for
+        each metric that got worse by more than ``tolerance``
+    """
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline or not common.is_compared(name):
+            continue
+        old_value = baseline[name]
+        if old_value == 0:
+            change = 0 if value == 0 else float("inf")
+        else:
+            change = (value - old_value) / abs(old_value)
+        if common.higher_is_better(name):
+            change = -change
+        if change > tolerance:
+            regressions.append((name, old_value, value, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=find_benchmarks(),
+        help="benchmarks to run; default: all",
+    )
+    parser.add_argument("--quick", action="store_true", help="shorter runs")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results file to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative regression of each metric; default: %(default)s",
+    )
+    args = parser.parse_args()
+
+    results, errors = run_benchmarks(args.only or find_benchmarks(), args.quick)
+    common.print_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                dict(metadata=common.metadata(), results=results, errors=errors),
+                f,
+                indent=2,
+            )
+
+    status = 0
+    if errors:
+        print(f"Failed benchmarks: {', '.join(errors)}")
+        status = 1
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for name, old_value, value, change in regressions:
+            print(f"REGRESSION {name}: {old_value:.4f} -> {value:.4f} ({change:+.0%})")
+        if regressions:
+            status = 1
+        else:
+            print(f"No regressions beyond {args.tolerance:.0%}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+import argparse
+import sys
+import types
+
+import numpy as np
+import yaml
+
+from lsst.ts import salobj
+from lsst.ts import adamSensors
+
+
+def load_converter(config_path):
+    """Make the converter of a CSC configuration file, validated and
+    completed with the schema defaults as the CSC does.
+
+    Raises
+    ------
+    RuntimeError
+        If the configuration is invalid.
+    """
+    config = dict()
+    if config_path is not None:
+        with open(config_path) as f:
+            config = yaml.safe_load(f) or dict()
+    validator = salobj.DefaultingValidator(schema=adamSensors.CONFIG_SCHEMA)
+    try:
+        config = types.SimpleNamespace(**validator.validate(config))
+        devices = adamSensors.configured_devices(config)
+        table = adamSensors.ChannelTable.from_config(config, devices)
+        return table.make_converter()
+    except Exception as e:
+        raise RuntimeError(f"Invalid configuration {config_path}: {e}")
+
+
+parser = argparse.ArgumentParser(
+    description="Convert spooled raw ADAM samples to engineering units "
+    "and write them as CSV, e.g. to backfill lost telemetry or reprocess "
+    "it with new calibration coefficients."
+)
+parser.add_argument("directory", help="spool directory")
+parser.add_argument(
+    "--config",
+    help="CSC configuration file with the coefficients and calibrations "
+    "to apply; default: the schema defaults",
+)
+parser.add_argument("--start", type=float, help="start time (TAI unix seconds)")
+parser.add_argument("--end", type=float, help="end time (TAI unix seconds)")
+parser.add_argument(
+    "--interval", type=float, help="average the samples over intervals (sec)"
+)
+parser.add_argument("--output", help="output CSV file; default: standard output")
+args = parser.parse_args()
+
+try:
+    converter = load_converter(args.config)
+except RuntimeError as e:
+    sys.exit(str(e))
+timestamps, values = adamSensors.replay_spool(
+    args.directory,
+    converter,
+    start=args.start,
+    end=args.end,
+    interval=args.interval,
+)
+header = ",".join(["tai"] + [f"ch{i}" for i in range(converter.num_channels)])
+np.savetxt(
+    args.output or sys.stdout,
+    np.column_stack([timestamps, values]),
+    delimiter=",",
+    header=header,
+    comments="",
+    fmt=["%.6f"] + ["%.9g"] * converter.num_channels,
+)
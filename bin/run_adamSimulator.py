@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+import argparse
+import asyncio
+import logging
+from lsst.ts import adamSensors
+
+
+async def amain(args):
+    simulators = [
+        adamSensors.AdamSimulator(
+            host=args.host,
+            port=args.port + i if args.port else 0,
+            latency=args.latency,
+            jitter=args.jitter,
+            loss_probability=args.loss,
+        )
+        for i in range(args.num)
+    ]
+    for simulator in simulators:
+        await simulator.start()
+        print(f"ADAM simulator listening on {simulator.host}:{simulator.port}")
+    try:
+        await asyncio.Future()
+    finally:
+        for simulator in simulators:
+            await simulator.close()
+
+
+parser = argparse.ArgumentParser(
+    description="Run local ADAM-6024 Modbus/TCP simulators"
+)
+parser.add_argument("--num", type=int, default=1, help="number of simulators")
+parser.add_argument("--host", default="127.0.0.1", help="host to listen on")
+parser.add_argument(
+    "--port", type=int, default=0, help="port of the first simulator; 0 for free ports"
+)
+parser.add_argument("--latency", type=float, default=0, help="response delay (sec)")
+parser.add_argument("--jitter", type=float, default=0, help="max extra delay (sec)")
+parser.add_argument("--loss", type=float, default=0, help="request loss probability")
+logging.basicConfig()
+try:
+    asyncio.run(amain(parser.parse_args()))
+except KeyboardInterrupt:
+    pass
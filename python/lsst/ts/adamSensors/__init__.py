@@ -17,12 +17,95 @@
 # GNU General Public License for more details.
 #
 # You should have received a copy of the GNU General Public License
+import importlib
+
 try:
     from .version import *
 except ImportError:
     __version__ = "?"
 
-from .adamSensorsCSC import *
-from .mockModbus import *
-from .config_schema import *
-from .model import *
+# The public names of each submodule. Submodules are only imported when
+# one of their names (or the submodule itself) is first used, so that
+# e.g. a script that only needs CONFIG_SCHEMA does not pay for importing
+# salobj, pymodbus and numpy. Keep this in sync with each ``__all__``.
+_SUBMODULE_NAMES = {
+    "adamSensorsCSC": ["AdamCSC"],
+    "mockModbus": ["MockModbusClient"],
+    "config_schema": ["CONFIG_SCHEMA"],
+    "readplan": [
+        "RegisterRange",
+        "ReadRequest",
+        "REGISTER_TABLES",
+        "ADAM6024_ANALOG_INPUTS",
+        "ADAM6024_DIAGNOSTIC_RANGES",
+        "plan_reads",
+    ],
+    "model": ["AdamModel"],
+    "poller": ["AdamPoller"],
+    "conversion": [
+        "CALIBRATION_KINDS",
+        "THERMOCOUPLE_TYPES",
+        "thermocouple_emf",
+        "ChannelConverter",
+    ],
+    "publisher": [
+        "SENSOR_TOPICS",
+        "NUM_TELEMETRY_FIELDS",
+        "ChangeFilter",
+        "PublishPlan",
+    ],
+    "scheduler": ["FixedRateScheduler"],
+    "decimation": ["ChannelStatistics", "channel_statistics"],
+    "history": ["SampleHistory"],
+    "simulator": [
+        "AdamSimulator",
+        "constant_waveform",
+        "sine_waveform",
+        "ramp_waveform",
+        "step_waveform",
+        "noise_waveform",
+        "start_simulators",
+    ],
+    "instrumentation": ["LatencyHistogram", "StageLatencies", "RoundTripEstimator"],
+    "spool": [
+        "SPOOL_SUFFIX",
+        "spool_dtype",
+        "SpoolWriter",
+        "read_spool_file",
+        "list_spool_files",
+        "read_spool",
+        "replay_spool",
+    ],
+    "replay": ["ReplaySource"],
+    "channeltable": [
+        "NUM_ANALOG_INPUT_SETTINGS",
+        "ChannelSpec",
+        "ChannelTable",
+        "configured_devices",
+    ],
+    "worker": ["SharedSampleRing", "AcquisitionWorker"],
+    "limits": ["SEVERITY_NAMES", "LIMIT_NAMES", "LimitChecker"],
+    "filters": ["FILTER_NAMES", "ChannelFilter"],
+    "adaptive": ["ACTIVITY_NAMES", "AdaptiveRate"],
+    "standby": ["StandbyPoller"],
+}
+_SUBMODULE_BY_NAME = {
+    name: submodule for submodule, names in _SUBMODULE_NAMES.items() for name in names
+}
+
+__all__ = ["__version__", *_SUBMODULE_BY_NAME]
+
+
+def __getattr__(name):
+    if name in _SUBMODULE_NAMES:
+        return importlib.import_module(f".{name}", __name__)
+    submodule = _SUBMODULE_BY_NAME.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULE_NAMES) | set(_SUBMODULE_BY_NAME))
@@ -1,8 +1,25 @@
+__all__ = ["AdamCSC"]
+
 from lsst.ts import salobj
 from lsst.ts.adamSensors.model import AdamModel
-from numpy import poly1d
+from lsst.ts.adamSensors.readplan import ADAM6024_DIAGNOSTIC_RANGES
+from lsst.ts.adamSensors.poller import AdamPoller
+from lsst.ts.adamSensors.channeltable import ChannelTable, configured_devices
+from lsst.ts.adamSensors.scheduler import FixedRateScheduler
+from lsst.ts.adamSensors.decimation import channel_statistics
+from lsst.ts.adamSensors.history import SampleHistory
+from lsst.ts.adamSensors.simulator import start_simulators
+from lsst.ts.adamSensors.instrumentation import StageLatencies
+from lsst.ts.adamSensors.spool import SpoolWriter, read_spool
+from lsst.ts.adamSensors.replay import ReplaySource
+from lsst.ts.adamSensors.worker import AcquisitionWorker
+from lsst.ts.adamSensors.standby import StandbyPoller
+import numpy as np
 import asyncio
 import logging
+import time
+import traceback
+import types
 from pymodbus.exceptions import ConnectionException
 from .config_schema import CONFIG_SCHEMA
 from . import __version__
@@ -11,10 +28,35 @@ from . import __version__
 class AdamCSC(salobj.ConfigurableCsc):
     """
     CSC for simple sensors connected to an ADAM controller
+
+    Simulation modes: 0 talks to real ADAM devices; 1 replaces the Modbus
+    client with `MockModbusClient`; 2 starts a local Modbus/TCP
+    `AdamSimulator` for each configured device and talks to it through
+    the real client. In simulation mode 1 the analog inputs can instead
+    play back a recording (see the ``replay_directory`` setting).
     """
 
     version = __version__
-    valid_simulation_modes = (0, 1)
+    valid_simulation_modes = (0, 1, 2)
+    # error code reported when a dead acquisition worker cannot be
+    # restarted
+    worker_restart_error = 1
+    # stages of the telemetry loop timed by ``self.latencies``:
+    # wakeup is the scheduler's lateness, which grows when the event loop
+    # is starved; cycle is the whole cycle from the scheduled deadline
+    # filter is the conversion and filtering of each sample, if any
+    # channel has a filter; limits is the check of each sample against
+    # the channels' limits
+    latency_stages = (
+        "wakeup",
+        "read",
+        "store",
+        "filter",
+        "limits",
+        "convert",
+        "publish",
+        "cycle",
+    )
 
     def __init__(
         self, config_dir=None, initial_state=salobj.State.STANDBY, simulation_mode=0
@@ -33,158 +75,1061 @@ class AdamCSC(salobj.ConfigurableCsc):
 
         self.loop = asyncio.get_running_loop()
 
-        self.adam = None
+        self.poller = None
+        self.worker = None
+        # connections kept warm in standby, and the settings they were
+        # made with; see `start_warm_standby`
+        self.standby_poller = None
+        self.standby_worker = None
+        self.connected_settings = None
+        self.num_worker_restarts = 0
         self.config = None
+        self.devices = []
+        self.channel_table = None
+        self.num_reloads = 0
+        self.converter = None
+        self.publish_plan = None
+        self.limit_checker = None
+        self.channel_filter = None
+        self.adaptive_rate = None
+        self.statistics = None
+        self.history = None
+        self.spool = None
+        self.latencies = StageLatencies(self.latency_stages)
+        self.simulators = []
         self.start_timeout = 10
 
         self.telemetry_loop_task = salobj.make_done_future()
+        self.fault_task = salobj.make_done_future()
 
     async def handle_summary_state(self):
         if self.disabled_or_enabled:
-            if self.adam is None:
+            warm_sample = await self.resume_warm_standby()
+            if self.config.acquisition_worker:
+                if self.worker is None:
+                    try:
+                        self.worker = await self.start_worker()
+                    except Exception:
+                        await self.close_simulators()
+                        raise
+                    self.connected_settings = self.connection_settings()
+            elif self.poller is None:
+                poller = await self.make_poller()
                 try:
-                    self.adam = AdamModel(
-                        self.config.adam_ip,
-                        self.config.adam_port,
-                        log=self.log,
-                        simulation_mode=self.simulation_mode,
-                    )
-                    self.log.debug("model created")
+                    await poller.connect()
+                    self.log.debug("models connected")
                 except ConnectionException:
+                    await poller.close()
+                    await self.close_simulators()
+                    addresses = ", ".join(
+                        f"{device['ip']}:{device['port']}" for device in self.devices
+                    )
                     raise RuntimeError(
-                        "Unable to connect to modbus device at "
-                        f"{self.config.adam_ip}:{self.config.adam_port}."
+                        f"Unable to connect to any modbus device at {addresses}."
                     )
                 except Exception:
                     self.log.exception("Error connecting to modbus.")
+                    await poller.close()
+                    await self.close_simulators()
                     raise
-                self.log.debug(f"connected to modbus device at {self.adam.clientip}:{self.adam.clientport}")
-                if self.telemetry_loop_task.done():
-                    self.log.debug("starting telemetry loop")
-                    self.telemetry_loop_task = asyncio.create_task(
-                        self.telemetry_loop()
+                self.poller = poller
+                self.connected_settings = self.connection_settings()
+            if self.telemetry_loop_task.done():
+                if self.config.spool_directory:
+                    self.spool = SpoolWriter(
+                        self.config.spool_directory,
+                        self.channel_table.num_channels,
+                        max_file_size=int(self.config.spool_max_file_size * 1e6),
+                        log=self.log,
                     )
+                self.log.debug("starting telemetry loop")
+                if self.worker is not None:
+                    telemetry_loop = self.worker_telemetry_loop(warm_sample)
+                else:
+                    telemetry_loop = self.telemetry_loop(warm_sample)
+                self.telemetry_loop_task = asyncio.create_task(telemetry_loop)
             self.log.debug("done setting up CSC for disabled or enabled state")
         else:
-            if not self.telemetry_loop_task.done():
-                self.telemetry_loop_task.cancel()
-            try:
-                await self.telemetry_loop_task
-            except asyncio.CancelledError:
-                pass
-            except Exception:
-                self.log.exception(
-                    f"Exception awaiting telemetry loop while in state {self.summary_state}"
+            await self.stop_telemetry_loop()
+            kept = False
+            if self.summary_state == salobj.State.STANDBY:
+                kept = self.start_warm_standby()
+            if not kept:
+                await self.close_connections()
+
+    async def stop_telemetry_loop(self):
+        """Stop the telemetry loop and close the spool, if any."""
+        if not self.telemetry_loop_task.done():
+            self.telemetry_loop_task.cancel()
+        try:
+            await self.telemetry_loop_task
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            self.log.exception(
+                f"Exception awaiting telemetry loop while in state {self.summary_state}"
+            )
+        if self.spool is not None:
+            await self.spool.close()
+            self.spool = None
+
+    async def close_connections(self):
+        """Close the poller, worker and simulators, including those kept
+        warm in standby.
+        """
+        if self.standby_poller is not None:
+            await self.standby_poller.close()
+            self.standby_poller = None
+        if self.standby_worker is not None:
+            await self.standby_worker.stop()
+            self.standby_worker = None
+        if self.poller is not None:
+            await self.poller.close()
+            self.poller = None
+        if self.worker is not None:
+            await self.worker.stop()
+            self.worker = None
+        await self.close_simulators()
+        self.connected_settings = None
+
+    async def close_simulators(self):
+        """Close the local simulators started in simulation mode 2."""
+        for simulator in self.simulators:
+            await simulator.close()
+        self.simulators = []
+
+    async def close_tasks(self):
+        await super().close_tasks()
+        await self.stop_telemetry_loop()
+        await self.close_connections()
+
+    def connection_settings(self):
+        """Get the settings the connections to the devices depend on.
+
+        Connections kept warm in standby are only reused by the next
+        start if these are unchanged.
+        """
+        settings = dict(
+            devices=self.devices,
+            model_kwargs=self.model_kwargs(),
+            read_diagnostics=self.config.read_diagnostics,
+            max_concurrent_reads=self.config.max_concurrent_reads,
+            acquisition_worker=self.config.acquisition_worker,
+            replay_directory=self.config.replay_directory,
+        )
+        if self.config.replay_directory:
+            # the replay sources hold the recorded counts of each channel;
+            # as lists, as arrays do not compare to a single bool
+            settings.update(
+                replay_speed=self.config.replay_speed,
+                device_map={
+                    name: (channels.tolist(), registers.tolist())
+                    for name, (channels, registers) in (
+                        self.channel_table.device_map.items()
+                    )
+                },
+            )
+        if self.config.acquisition_worker:
+            # the capacity of the worker's ring
+            settings.update(
+                publish_interval=self.config.publish_interval,
+                min_sample_interval=self.min_sample_interval(),
+            )
+        return settings
+
+    def start_warm_standby(self):
+        """Keep the connections to the devices open in standby, if
+        ``warm_standby`` is configured, and keep checking them, so the
+        next start need not connect again.
+
+        In-process, a `StandbyPoller` polls the devices every
+        ``standby_poll_interval``; an acquisition worker keeps polling
+        at that interval in its own process.
+
+        Returns
+        -------
+        kept : bool
+            were the connections kept open?
+        """
+        if self.config is None or not self.config.warm_standby:
+            return False
+        if self.poller is not None:
+            self.standby_poller = StandbyPoller(
+                self.poller, self.config.standby_poll_interval, log=self.log
+            )
+            self.poller = None
+            self.standby_poller.start()
+        elif self.worker is not None:
+            self.worker.set_sample_interval(self.config.standby_poll_interval)
+            self.standby_worker = self.worker
+            self.worker = None
+        else:
+            return False
+        self.log.info(
+            "Keeping the device connections warm in standby; polling every "
+            f"{self.config.standby_poll_interval:g} sec"
+        )
+        return True
+
+    async def resume_warm_standby(self):
+        """Reuse the connections kept warm in standby, if they are healthy
+        and the new configuration uses the same ones; otherwise close
+        them.
+
+        Returns
+        -------
+        warm_sample : tuple or None
+            (timestamp, counts) of the most recent sample read in
+            standby, if it is recent enough to publish, where counts is a
+            dict of device name: register counts of the devices read;
+            else None
+        """
+        standby_poller = self.standby_poller
+        standby_worker = self.standby_worker
+        self.standby_poller = None
+        self.standby_worker = None
+        if standby_poller is not None:
+            poller = await standby_poller.stop()
+            healthy = standby_poller.healthy
+            warm_sample = standby_poller.latest
+        elif standby_worker is not None:
+            poller = None
+            healthy = standby_worker.alive
+            warm_sample = self.read_worker_sample(standby_worker)
+        else:
+            return None
+        if self.connection_settings() != self.connected_settings:
+            reason = "the connection settings changed"
+        elif not healthy:
+            reason = "the health check failed"
+        else:
+            self.poller = poller
+            self.worker = standby_worker
+            self.log.info("Reusing the device connections kept warm in standby")
+            # a sample more than one standby poll old may be stale
+            max_age = 2 * self.config.standby_poll_interval
+            if warm_sample is None or salobj.current_tai() - warm_sample[0] > max_age:
+                return None
+            return warm_sample
+        self.log.info(f"Reconnecting to the devices: {reason}")
+        if poller is not None:
+            await poller.close()
+        if standby_worker is not None:
+            await standby_worker.stop()
+        await self.close_simulators()
+        self.connected_settings = None
+        return None
+
+    @staticmethod
+    def read_worker_sample(worker):
+        """Read the samples an acquisition worker took in standby and
+        return the most recent as a warm sample (see
+        `resume_warm_standby`), or None if there is none.
+        """
+        timestamps, samples = worker.read()
+        if len(timestamps) == 0:
+            return None
+        counts = {
+            name: samples[-1, registers]
+            for name, registers in worker.device_slices().items()
+            if not np.all(np.isnan(samples[-1, registers]))
+        }
+        if not counts:
+            return None
+        return timestamps[-1], counts
+
+    def publish_warm_sample(self, timestamp, device_counts):
+        """Publish a sample read in standby, so telemetry is available as
+        soon as the CSC starts, without waiting for a publish interval.
+
+        The sample is stored in the history (and spool) and filtered as
+        any other, but not checked against the limits, as it may be up
+        to ``standby_poll_interval`` old.
+
+        Parameters
+        ----------
+        timestamp : float
+            acquisition time of the sample (TAI unix seconds)
+        device_counts : dict of str: numpy.ndarray
+            register counts of each device read
+        """
+        counts = np.full(self.channel_table.num_channels, np.nan)
+        device_map = self.channel_table.device_map
+        for name, result in device_counts.items():
+            if name in device_map:
+                channels, registers = device_map[name]
+                counts[channels] = result[registers]
+        self.history.append(timestamp, counts)
+        if self.spool is not None:
+            self.spool.append(timestamp, counts)
+        values = self.converter.convert(counts)
+        self.channel_filter.process(values)
+        self.statistics = channel_statistics(values[np.newaxis])
+        self.publish_plan.publish(self.statistics.mean, time.perf_counter())
+
+    async def make_poller(self):
+        """Make a poller for the configured devices, starting local
+        simulators for them in simulation mode 2.
+        """
+        extra_ranges = (
+            ADAM6024_DIAGNOSTIC_RANGES if self.config.read_diagnostics else ()
+        )
+        addresses, replay_sources = await self.prepare_devices()
+        return AdamPoller(
+            {
+                device["name"]: AdamModel(
+                    ip,
+                    port,
+                    log=self.log,
+                    extra_ranges=extra_ranges,
+                    replay_source=replay_source,
+                    clock=salobj.current_tai,
+                    **self.model_kwargs(),
+                )
+                for device, (ip, port), replay_source in zip(
+                    self.devices, addresses, replay_sources
                 )
-            if self.adam is not None:
-                await self.adam.disconnect()
-                self.adam = None
+            },
+            max_concurrency=self.config.max_concurrent_reads,
+            log=self.log,
+        )
+
+    async def start_worker(self):
+        """Start an `AcquisitionWorker` that polls the configured devices
+        in another process, starting local simulators for them in
+        simulation mode 2.
+
+        Raises
+        ------
+        RuntimeError
+            If the worker cannot connect to any device.
+        """
+        addresses, replay_sources = await self.prepare_devices()
+        # the worker must hold the samples of a few publish intervals, as
+        # the telemetry loop collects them once per interval
+        capacity = max(
+            16, 4 * round(self.config.publish_interval / self.min_sample_interval())
+        )
+        worker = AcquisitionWorker(
+            [
+                dict(name=device["name"], ip=ip, port=port)
+                for device, (ip, port) in zip(self.devices, addresses)
+            ],
+            sample_interval=self.adaptive_rate.interval,
+            capacity=capacity,
+            model_kwargs=self.model_kwargs(),
+            replay_sources=replay_sources,
+            max_concurrency=self.config.max_concurrent_reads,
+            clock_offset=salobj.current_tai() - time.time(),
+            log=self.log,
+        )
+        await worker.start(timeout=self.start_timeout)
+        return worker
+
+    async def prepare_devices(self):
+        """Get the address and replay source of each configured device,
+        starting local simulators for them in simulation mode 2.
+
+        Returns
+        -------
+        addresses : list of (str, int)
+            host and port of each device
+        replay_sources : list of ReplaySource or None
+            what the mock client of each device plays back in simulation
+            mode 1, if ``replay_directory`` is configured
+        """
+        addresses = [(device["ip"], device["port"]) for device in self.devices]
+        replay_sources = [None] * len(self.devices)
+        if self.simulation_mode == 1 and self.config.replay_directory:
+            replay_sources = self.make_replay_sources()
+        if self.simulation_mode == 2:
+            self.simulators = await start_simulators(len(self.devices), log=self.log)
+            addresses = [
+                (simulator.host, simulator.port) for simulator in self.simulators
+            ]
+        return addresses, replay_sources
+
+    def model_kwargs(self):
+        """Get the configured `AdamModel` arguments common to all
+        devices.
+        """
+        return dict(
+            simulation_mode=self.simulation_mode == 1,
+            request_timeout=self.config.read_timeout,
+            reconnect_max_interval=self.config.reconnect_max_interval,
+        )
 
-    async def telemetry_loop(self):
+    def make_replay_sources(self):
+        """Make a `ReplaySource` for each configured device, which plays
+        back the recorded counts of the channels it feeds.
+        """
+        try:
+            timestamps, counts = read_spool(self.config.replay_directory)
+        except ValueError as e:
+            raise RuntimeError(f"Cannot replay {self.config.replay_directory!r}: {e}")
+        if len(timestamps) == 0:
+            raise RuntimeError(
+                f"No samples to replay in {self.config.replay_directory!r}."
+            )
+        if counts.shape[1] != self.channel_table.num_channels:
+            raise RuntimeError(
+                f"Recording in {self.config.replay_directory!r} has "
+                f"{counts.shape[1]} channels; expected "
+                f"{self.channel_table.num_channels}."
+            )
+        self.log.info(
+            f"Replaying {len(timestamps)} samples from "
+            f"{self.config.replay_directory} at {self.config.replay_speed}x"
+        )
+        sources = []
+        for device in self.devices:
+            channels, registers = self.channel_table.device_map.get(
+                device["name"], ([], [])
+            )
+            # the analog input registers of the device; those that feed
+            # no channel read 0
+            device_counts = np.zeros((len(timestamps), max(registers, default=-1) + 1))
+            device_counts[:, registers] = counts[:, channels]
+            sources.append(
+                ReplaySource(timestamps, device_counts, speed=self.config.replay_speed)
+            )
+        return sources
+
+    async def telemetry_loop(self, warm_sample=None):
         """
         The main process of this CSC, periodically reads the voltages off
-        the ADAM device, converts them into the appropriate units
+        the ADAM devices, converts them into the appropriate units
         for various sensor types, and publishes them as telemetry
+
+        Samples are taken every ``sample_interval`` and their raw counts
+        appended to ``self.history`` (and ``self.spool``, if configured);
+        every ``publish_interval`` the recent
+        samples are converted as one batch and the mean of each channel is
+        published. The mean, min, max and standard deviation are kept in
+        ``self.statistics``.
+
+        Each sample is timestamped with its acquisition time: the mean
+        over the devices read of `AdamModel.last_read_time`, or the
+        current time if no device could be read. The telemetry topics
+        have no field for it, so it is only kept in the history and spool.
+
+        If any channel has a filter, every sample is instead converted
+        and filtered as it is taken, and the filtered samples are
+        published; see `ChannelFilter`. If any channel has limits, every
+        sample is also converted (and filtered) and checked against them
+        at once; see `check_limits`.
+
+        If ``fast_sample_interval`` is set, the sample interval switches
+        between it and ``sample_interval`` as channels become active and
+        quiet, checked each time a window is published; see
+        `AdaptiveRate`.
+
+        If ``warm_sample`` is given (a sample read in warm standby; see
+        `resume_warm_standby`), it is published at once, before the first
+        window; see `publish_warm_sample`.
         """
-        # set up dictionary
-        sensors = {
-            0: (
-                self.config.analog_input_0_type,
-                poly1d(self.config.analog_input_0_coefficients),
-            ),
-            1: (
-                self.config.analog_input_1_type,
-                poly1d(self.config.analog_input_1_coefficients),
-            ),
-            2: (
-                self.config.analog_input_2_type,
-                poly1d(self.config.analog_input_2_coefficients),
-            ),
-            3: (
-                self.config.analog_input_3_type,
-                poly1d(self.config.analog_input_3_coefficients),
-            ),
-            4: (
-                self.config.analog_input_4_type,
-                poly1d(self.config.analog_input_4_coefficients),
-            ),
-            5: (
-                self.config.analog_input_5_type,
-                poly1d(self.config.analog_input_5_coefficients),
-            ),
-        }
+        num_channels = self.channel_table.num_channels
+        failing = set()
+        scheduler = FixedRateScheduler(self.adaptive_rate.interval)
+        self.channel_filter.set_sample_interval(scheduler.interval)
 
-        # figure out which topics to publish
-        hasTemperature = False
-        hasPressure = False
-        for s in sensors:
-            if sensors[s][0] == "Pressure":
-                hasPressure = True
-            if sensors[s][0] == "Temperature":
-                hasTemperature = True
+        def num_cycles(duration):
+            return max(1, round(duration / scheduler.interval))
 
-        self.log.debug("hasPressure = " + str(hasPressure))
+        publish_cycles = num_cycles(self.config.publish_interval)
+        report_cycles = num_cycles(self.config.metrics_interval)
+        # samples taken since the last publication and report
+        num_samples = 0
+        num_unreported = 0
+        self.history = self.make_history()
+        counts = np.full(num_channels, np.nan)
+        # the filtered samples to publish, NaN for samples taken while
+        # no channel had a filter (which the statistics ignore)
+        max_publish_cycles = max(
+            1, round(self.config.publish_interval / self.min_sample_interval())
+        )
+        filtered = np.full((max_publish_cycles, num_channels), np.nan)
+
+        self.latencies = StageLatencies(
+            self.latency_stages, enabled=self.config.instrumentation_enabled
+        )
+        record = self.latencies.record
+        if warm_sample is not None:
+            self.publish_warm_sample(*warm_sample)
 
-        outputs = [0, 0, 0, 0, 0, 0]
         self.log.debug("about to start telemetry loop")
-        while self.adam is not None:
-            voltages = await self.adam.read_voltage()
-            # convert the voltage into appropriate units, according to the
-            # polynomial defined in configuration
-            for i in range(6):
-                outputs[i] = sensors[i][1](voltages[i])
-
-            # Assemble telemetry topics
-            # Channel 0
-            if sensors[0][0] == "Pressure":
-                self.tel_pressure.set(pressure_ch0=outputs[0])
-            elif sensors[0][0] == "Temperature":
-                self.tel_temperature.set(temp_ch0=outputs[0])
-
-            # Channel 1
-            if sensors[1][0] == "Pressure":
-                self.tel_pressure.set(pressure_ch1=outputs[1])
-            elif sensors[1][0] == "Temperature":
-                self.tel_temperature.set(temp_ch1=outputs[1])
-
-            # Channel 2
-            if sensors[2][0] == "Pressure":
-                self.tel_pressure.set(pressure_ch2=outputs[2])
-            elif sensors[2][0] == "Temperature":
-                self.tel_temperature.set(temp_ch2=outputs[2])
-
-            # Channel 3
-            if sensors[3][0] == "Pressure":
-                self.tel_pressure.set(pressure_ch3=outputs[3])
-            elif sensors[3][0] == "Temperature":
-                self.tel_temperature.set(temp_ch3=outputs[3])
-
-            # Channel 4
-            if sensors[4][0] == "Pressure":
-                self.tel_pressure.set(pressure_ch4=outputs[4])
-            elif sensors[4][0] == "Temperature":
-                self.tel_temperature.set(temp_ch4=outputs[4])
-
-            # Channel 5
-            if sensors[5][0] == "Pressure":
-                self.tel_pressure.set(pressure_ch5=outputs[5])
-            elif sensors[5][0] == "Temperature":
-                self.tel_temperature.set(temp_ch5=outputs[5])
-
-            # publish telemetry
-            if hasPressure:
-                self.log.debug("publishing pressure")
-                self.tel_pressure.put()
-            if hasTemperature:
-                self.log.debug("publishing temperature")
-                self.tel_temperature.put()
-
-            await asyncio.sleep(self.heartbeat_interval)
-        self.log.debug("aborted loop because the model was None")
+        while self.poller is not None:
+            await scheduler.wait()
+            t0 = time.perf_counter()
+            record("wakeup", scheduler.jitter)
+            num_unreported += 1
+            if num_unreported >= report_cycles:
+                self.log_sampling_metrics(scheduler)
+                num_unreported = 0
+
+            results = await self.poller.poll()
+            t1 = time.perf_counter()
+            record("read", t1 - t0)
+            # channels of devices that could not be read are left as NaN,
+            # which the statistics ignore, without holding up the other
+            # devices. From here to the end of the cycle nothing awaits, so
+            # the channel table, converter and publish plan cannot be
+            # swapped by reload_channels part way through.
+            device_map = self.channel_table.device_map
+            models = self.poller.models
+            read_time_sum = 0
+            num_read = 0
+            counts.fill(np.nan)
+            for name, result in results.items():
+                if isinstance(result, Exception):
+                    if name not in failing:
+                        self.log.warning(
+                            f"Device {name} is unavailable; its channels are "
+                            f"degraded until it reconnects: {result}"
+                        )
+                        failing.add(name)
+                    continue
+                if name in failing:
+                    self.log.info(f"Device {name} is available again")
+                    failing.discard(name)
+                read_time_sum += models[name].last_read_time
+                num_read += 1
+                if name in device_map:
+                    channels, registers = device_map[name]
+                    counts[channels] = result[registers]
+            if num_read > 0:
+                timestamp = read_time_sum / num_read
+            else:
+                timestamp = salobj.current_tai()
+            self.history.append(timestamp, counts)
+            if self.spool is not None:
+                self.spool.append(timestamp, counts)
+            t2 = time.perf_counter()
+            record("store", t2 - t1)
+            values = None
+            num_samples += 1
+            if self.channel_filter.enabled:
+                values = filtered[num_samples - 1]
+                values[:] = self.converter.convert(counts)
+                self.channel_filter.process(values)
+                t_filter = time.perf_counter()
+                record("filter", t_filter - t2)
+                t2 = t_filter
+            if self.limit_checker.enabled:
+                if values is None:
+                    values = self.converter.convert(counts)
+                self.check_limits(values, timestamp)
+                t_limits = time.perf_counter()
+                record("limits", t_limits - t2)
+                t2 = t_limits
+            if num_samples < publish_cycles:
+                record("cycle", t2 - t0 + scheduler.jitter)
+                continue
+
+            # convert the recent counts into appropriate units, according
+            # to the polynomials defined in configuration
+            timestamps, window = self.history.last(num_samples)
+            if self.channel_filter.enabled:
+                self.statistics = channel_statistics(filtered[:num_samples])
+            else:
+                self.statistics = channel_statistics(self.converter.convert(window))
+            filtered.fill(np.nan)
+            num_samples = 0
+            t3 = time.perf_counter()
+            record("convert", t3 - t2)
+            window_time = float(np.mean(timestamps))
+            self.publish_plan.publish(self.statistics.mean, t3)
+            t4 = time.perf_counter()
+            record("publish", t4 - t3)
+            record("cycle", t4 - t0 + scheduler.jitter)
+            # reloading the activity settings can also change the interval
+            self.adaptive_rate.update(self.statistics, window_time)
+            if self.adaptive_rate.interval != scheduler.interval:
+                self.report_sample_interval()
+                scheduler.set_interval(self.adaptive_rate.interval)
+                publish_cycles = num_cycles(self.config.publish_interval)
+                report_cycles = num_cycles(self.config.metrics_interval)
+        self.log.debug("aborted loop because the poller was None")
+
+    async def worker_telemetry_loop(self, warm_sample=None):
+        """The telemetry loop when ``acquisition_worker`` is configured.
+
+        The devices are polled every ``sample_interval`` (or
+        ``fast_sample_interval``) by ``self.worker``, in another process,
+        so this loop only wakes every ``publish_interval`` to collect the
+        samples taken since the last cycle. These are stored, filtered and
+        published as in `telemetry_loop`, as is ``warm_sample``. If the
+        worker dies, it is restarted; if that fails, the CSC goes to
+        FAULT.
+        """
+        num_channels = self.channel_table.num_channels
+        failing = set()
+        scheduler = FixedRateScheduler(self.config.publish_interval)
+        self.channel_filter.set_sample_interval(self.adaptive_rate.interval)
+        self.worker.set_sample_interval(self.adaptive_rate.interval)
+        self.history = self.make_history()
+        report_cycles = max(
+            1, round(self.config.metrics_interval / self.config.publish_interval)
+        )
+
+        self.latencies = StageLatencies(
+            self.latency_stages, enabled=self.config.instrumentation_enabled
+        )
+        record = self.latencies.record
+        if warm_sample is not None:
+            self.publish_warm_sample(*warm_sample)
+
+        self.log.debug("about to start worker telemetry loop")
+        while self.worker is not None:
+            await scheduler.wait()
+            t0 = time.perf_counter()
+            record("wakeup", scheduler.jitter)
+            if scheduler.num_cycles % report_cycles == 0:
+                self.log_sampling_metrics(scheduler)
+            if not self.worker.alive:
+                self.log.warning("Acquisition worker died; restarting it")
+                try:
+                    await self.worker.stop()
+                    await self.worker.start(timeout=self.start_timeout)
+                except Exception as e:
+                    self.log.exception("Could not restart the acquisition worker")
+                    # going to FAULT stops this task, so do it from another
+                    self.fault_task = asyncio.create_task(
+                        self.fault(
+                            code=self.worker_restart_error,
+                            report=f"Could not restart the acquisition worker: {e}",
+                            traceback=traceback.format_exc(),
+                        )
+                    )
+                    return
+                self.num_worker_restarts += 1
+
+            timestamps, samples = self.worker.read()
+            t1 = time.perf_counter()
+            record("read", t1 - t0)
+            if len(timestamps) == 0:
+                record("cycle", t1 - t0 + scheduler.jitter)
+                continue
+            # a device that could not be read has NaN registers
+            device_map = self.channel_table.device_map
+            counts = np.full((len(timestamps), num_channels), np.nan)
+            for name, registers in self.worker.device_slices().items():
+                if np.all(np.isnan(samples[-1, registers])):
+                    if name not in failing:
+                        self.log.warning(
+                            f"Device {name} is unavailable; its channels are "
+                            "degraded until it reconnects"
+                        )
+                        failing.add(name)
+                elif name in failing:
+                    self.log.info(f"Device {name} is available again")
+                    failing.discard(name)
+                if name in device_map:
+                    channels, offsets = device_map[name]
+                    counts[:, channels] = samples[:, registers][:, offsets]
+            for timestamp, sample in zip(timestamps, counts):
+                self.history.append(timestamp, sample)
+                if self.spool is not None:
+                    self.spool.append(timestamp, sample)
+            t2 = time.perf_counter()
+            record("store", t2 - t1)
+
+            values = self.converter.convert(counts)
+            if self.channel_filter.enabled:
+                t_convert = time.perf_counter()
+                self.channel_filter.process(values)
+                t_filter = time.perf_counter()
+                record("filter", t_filter - t_convert)
+                t2 += t_filter - t_convert
+            if self.limit_checker.enabled:
+                t_convert = time.perf_counter()
+                for timestamp, sample_values in zip(timestamps, values):
+                    self.check_limits(sample_values, timestamp)
+                t_limits = time.perf_counter()
+                record("limits", t_limits - t_convert)
+                t2 += t_limits - t_convert
+            self.statistics = channel_statistics(values)
+            t3 = time.perf_counter()
+            record("convert", t3 - t2)
+            window_time = float(np.mean(timestamps))
+            self.publish_plan.publish(self.statistics.mean, t3)
+            t4 = time.perf_counter()
+            record("publish", t4 - t3)
+            record("cycle", t4 - t0 + scheduler.jitter)
+            self.adaptive_rate.update(self.statistics, window_time)
+            if self.adaptive_rate.interval != self.worker.sample_interval:
+                self.report_sample_interval()
+                self.worker.set_sample_interval(self.adaptive_rate.interval)
+        self.log.debug("aborted loop because the worker was None")
+
+    def min_sample_interval(self):
+        """Return the shortest sample interval (sec) that may be used:
+        ``fast_sample_interval`` if set, else ``sample_interval``.
+        """
+        return self.config.fast_sample_interval or self.config.sample_interval
+
+    def make_history(self):
+        """Make an empty `SampleHistory` of ``history_duration``, and
+        at least ``publish_interval``, for the configured channels.
+        """
+        sample_interval = self.min_sample_interval()
+        return SampleHistory(
+            max(
+                round(self.config.publish_interval / sample_interval),
+                round(self.config.history_duration / sample_interval),
+                1,
+            ),
+            self.channel_table.num_channels,
+        )
+
+    def get_recent_samples(self, num_samples=None, since=None):
+        """Get recent samples from the in-memory history.
+
+        Parameters
+        ----------
+        num_samples : int, optional
+            return at most this many of the most recent samples
+        since : float, optional
+            return samples taken at or after this time (TAI unix seconds);
+            if neither this nor ``num_samples`` is given, return the
+            whole history
+
+        Returns
+        -------
+        timestamps : numpy.ndarray
+            time of each sample (TAI unix seconds), oldest first
+        values : numpy.ndarray
+            the samples in engineering units, shape (n, num_channels)
+        """
+        if self.history is None:
+            raise RuntimeError("No sample history; the CSC has not sampled yet.")
+        if since is not None:
+            if num_samples is not None:
+                raise ValueError("Specify at most one of num_samples and since.")
+            timestamps, counts = self.history.since(since)
+        elif num_samples is not None:
+            timestamps, counts = self.history.last(num_samples)
+        else:
+            timestamps, counts = self.history.last(len(self.history))
+        # copy, because the history views change with the next sample
+        return timestamps.copy(), self.converter.convert(counts)
+
+    def get_device_snapshots(self):
+        """Get the most recent data read from each device.
+
+        Returns
+        -------
+        snapshots : dict
+            device name: `AdamModel.last_snapshot`, which includes the
+            diagnostic registers if ``read_diagnostics`` is configured
+        """
+        if self.poller is None:
+            return dict()
+        return {name: model.last_snapshot for name, model in self.poller.models.items()}
+
+    def get_latency_summary(self):
+        """Get the latency of each telemetry loop stage since the last
+        sampling metrics report.
+
+        Returns
+        -------
+        summary : dict
+            stage name: dict of ``count`` and ``p50``, ``p99`` and
+            ``max`` latency (sec); see `latency_stages`
+        """
+        return self.latencies.summary()
+
+    def get_link_latency(self):
+        """Get the round-trip time of the connection to each device.
+
+        Returns
+        -------
+        summary : dict
+            device name: `RoundTripEstimator.summary` dict of the
+            device's reads
+        """
+        if self.poller is None:
+            return dict()
+        return {
+            name: model.round_trip.summary()
+            for name, model in self.poller.models.items()
+        }
+
+    def log_sampling_metrics(self, scheduler):
+        """Log the overrun counts and jitter of the sampling scheduler,
+        the latency of each stage of the telemetry loop and the
+        round-trip time to each device.
+
+        Parameters
+        ----------
+        scheduler : FixedRateScheduler
+            the scheduler pacing the telemetry loop
+        """
+        metrics = scheduler.report()
+        sample_rate = 1 / self.adaptive_rate.interval
+        self.log.info(
+            f"Sampling metrics: rate={sample_rate:g} Hz, "
+            f"cycles={metrics['num_cycles']}, "
+            f"overruns={metrics['num_overruns']}, missed={metrics['num_missed']}, "
+            f"mean jitter={metrics['mean_jitter'] * 1000:.2f} ms, "
+            f"max jitter={metrics['max_jitter'] * 1000:.2f} ms"
+        )
+        if self.latencies.enabled:
+            self.latencies.report()
+            self.log.info(f"Stage latencies: {self.latencies.format()}")
+        publish_metrics = ", ".join(
+            f"{topic_name} sent={num_sent}, "
+            f"suppressed={self.publish_plan.num_suppressed[topic_name]}"
+            for topic_name, num_sent in self.publish_plan.num_sent.items()
+        )
+        self.log.info(f"Publishing metrics: {publish_metrics}")
+        link_metrics = ", ".join(
+            f"{name} srtt={values['srtt'] * 1000:.3f} "
+            f"rttvar={values['rttvar'] * 1000:.3f} "
+            f"min={values['min'] * 1000:.3f} ms (n={values['count']})"
+            for name, values in self.get_link_latency().items()
+        )
+        if link_metrics:
+            self.log.info(f"Link latency: {link_metrics}")
+        if self.spool is not None:
+            self.log.info(
+                f"Spool metrics: written={self.spool.num_written}, "
+                f"dropped={self.spool.num_dropped}, file={self.spool.path}"
+            )
 
     @staticmethod
     def get_config_pkg():
         return "ts_config_eas"
 
     async def configure(self, config):
+        if config.sample_interval > config.publish_interval:
+            raise RuntimeError(
+                f"sample_interval={config.sample_interval} must not be longer "
+                f"than publish_interval={config.publish_interval}."
+            )
+        try:
+            devices = configured_devices(config)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid device configuration: {e}")
+        (
+            channel_table,
+            converter,
+            publish_plan,
+            limit_checker,
+            channel_filter,
+            adaptive_rate,
+        ) = self.compile_channels(config, devices)
+        self.devices = devices
+        self.channel_table = channel_table
+        self.converter = converter
+        self.publish_plan = publish_plan
+        self.limit_checker = limit_checker
+        self.channel_filter = channel_filter
+        self.adaptive_rate = adaptive_rate
         self.config = config
+
+    def compile_channels(self, config, devices):
+        """Compile the channel table, converter, publish plan, limit
+        checker, filter and adaptive rate of a configuration.
+
+        Returns
+        -------
+        channel_table : ChannelTable
+            the channels
+        converter : ChannelConverter
+            their conversion
+        publish_plan : PublishPlan
+            their publication
+        limit_checker : LimitChecker
+            their limits
+        channel_filter : ChannelFilter
+            their filters
+        adaptive_rate : AdaptiveRate
+            their activity thresholds
+
+        Raises
+        ------
+        RuntimeError
+            If the configuration is invalid.
+        """
+        try:
+            channel_table = ChannelTable.from_config(config, devices)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid channel configuration: {e}")
+        try:
+            converter = channel_table.make_converter()
+        except ValueError as e:
+            raise RuntimeError(f"Invalid calibration: {e}")
+        try:
+            publish_plan = channel_table.make_publish_plan(
+                self, max_silence=config.publish_max_silence
+            )
+        except ValueError as e:
+            raise RuntimeError(f"Invalid publishing configuration: {e}")
+        try:
+            limit_checker = channel_table.make_limit_checker(
+                rate_interval=config.limit_rate_interval
+            )
+        except ValueError as e:
+            raise RuntimeError(f"Invalid limits: {e}")
+        try:
+            channel_filter = channel_table.make_filter(config.sample_interval)
+        except ValueError as e:
+            raise RuntimeError(f"Invalid filters: {e}")
+        try:
+            adaptive_rate = channel_table.make_adaptive_rate(
+                slow_interval=config.sample_interval,
+                fast_interval=config.fast_sample_interval,
+                hold_time=config.activity_hold_time,
+            )
+        except ValueError as e:
+            raise RuntimeError(f"Invalid adaptive sampling: {e}")
+        return (
+            channel_table,
+            converter,
+            publish_plan,
+            limit_checker,
+            channel_filter,
+            adaptive_rate,
+        )
+
+    def reload_channels(self, settings):
+        """Swap in new channel settings while the telemetry loop runs.
+
+        Unlike reconfiguring the CSC, which requires going to STANDBY
+        (closing the connections to the devices and stopping the
+        telemetry loop), this keeps the connections open and the loop
+        running. The new channel table, converter and publish plan are
+        compiled first and then swapped in together, between two cycles
+        of the loop, so no sample is missed and each published value is
+        converted entirely with the old or the new settings. Samples taken
+        before the swap are converted with the new settings if they are
+        published after it. The filters restart from the next sample.
+
+        No SAL command calls this yet: the CSC's interface in ts_xml has
+        no command to carry new settings, and the standard ``start``
+        command, which applies a configuration, is only accepted in
+        STANDBY. Until such a command is added (its handler would pass
+        the settings of its configuration file here), this is called
+        from code running in the CSC process, such as a script using
+        the CSC object or the unit tests.
+
+        Parameters
+        ----------
+        settings : dict
+            new values of configuration settings, as in a configuration
+            file; only those in `is_hot_setting` may be given, and the
+            number of channels may not change while the loop runs
+
+        Raises
+        ------
+        RuntimeError
+            If the CSC is not configured, a setting cannot be changed
+            this way, or the new settings are invalid. The old settings
+            are then kept.
+        """
+        if self.config is None:
+            raise RuntimeError("The CSC has not been configured.")
+        fixed = sorted(name for name in settings if not self.is_hot_setting(name))
+        if fixed:
+            raise RuntimeError(
+                f"Settings {fixed} cannot be reloaded; reconfigure the CSC instead."
+            )
+        config_dict = dict(vars(self.config))
+        config_dict.update(settings)
+        try:
+            config_dict = self.config_validator.validate(config_dict)
+        except Exception as e:
+            raise RuntimeError(f"Invalid settings {settings}: {e}")
+        config = types.SimpleNamespace(**config_dict)
+        (
+            channel_table,
+            converter,
+            publish_plan,
+            limit_checker,
+            channel_filter,
+            adaptive_rate,
+        ) = self.compile_channels(config, self.devices)
+        sampling = not self.telemetry_loop_task.done()
+        if sampling and channel_table.num_channels != self.channel_table.num_channels:
+            raise RuntimeError(
+                f"Cannot change the number of channels from "
+                f"{self.channel_table.num_channels} to "
+                f"{channel_table.num_channels} while sampling; "
+                "reconfigure the CSC instead."
+            )
+        if limit_checker.num_channels == self.limit_checker.num_channels:
+            # carry the severities over, so only changes are reported
+            limit_checker.severity = self.limit_checker.severity.copy()
+        if adaptive_rate.num_channels == self.adaptive_rate.num_channels:
+            # keep sampling at the same rate until the activity changes
+            adaptive_rate.resume_from(self.adaptive_rate)
+        channel_filter.set_sample_interval(adaptive_rate.interval)
+        self.channel_table = channel_table
+        self.converter = converter
+        self.publish_plan = publish_plan
+        self.limit_checker = limit_checker
+        self.channel_filter = channel_filter
+        self.adaptive_rate = adaptive_rate
+        self.config = config
+        self.num_reloads += 1
+        self.log.info(f"Reloaded settings {sorted(settings)}")
+
+    @staticmethod
+    def is_hot_setting(name):
+        """Can `reload_channels` change this configuration setting?
+
+        These are the settings of the channels (the ``channels`` list
+        and the analog_input_N_* settings), publish_max_silence,
+        limit_rate_interval and activity_hold_time.
+        """
+        if name.startswith("analog_input_"):
+            return True
+        return name in (
+            "channels",
+            "publish_max_silence",
+            "limit_rate_interval",
+            "activity_hold_time",
+        )
+
+    def report_sample_interval(self):
+        """Log a change of the sample interval chosen by
+        ``self.adaptive_rate``, with the channels that caused it, and
+        apply it to the filters.
+        """
+        interval = self.adaptive_rate.interval
+        if self.adaptive_rate.active:
+            names = [
+                self.channel_table.names[channel]
+                for channel in self.adaptive_rate.active_channels.tolist()
+            ]
+            reason = f"active channels: {', '.join(names)}"
+        else:
+            reason = "all channels quiet"
+        self.log.info(
+            f"Sampling every {interval:g} sec ({1 / interval:g} Hz); {reason}"
+        )
+        self.channel_filter.set_sample_interval(interval)
+
+    def check_limits(self, values, timestamp):
+        """Check one sample against the channels' limits, and log each
+        change of a channel's severity: alarms as errors, warnings as
+        warnings and returns to normal as info. salobj publishes these
+        log messages as logMessage events.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            value of each channel, in engineering units
+        timestamp : float
+            acquisition time of the sample (TAI unix seconds)
+        """
+        changed = self.limit_checker.check(values, timestamp)
+        for channel in changed.tolist():
+            severity = self.limit_checker.severity[channel]
+            log_level = (logging.INFO, logging.WARNING, logging.ERROR)[severity]
+            self.log.log(
+                log_level,
+                f"Limits: {self.channel_table.names[channel]} "
+                f"{self.limit_checker.describe(channel, values[channel])}",
+            )
@@ -0,0 +1,159 @@
+__all__ = ["ACTIVITY_NAMES", "AdaptiveRate"]
+
+import math
+
+import numpy as np
+
+# Activity thresholds of one channel; each is optional
+ACTIVITY_NAMES = ("rate", "std")
+
+
+class AdaptiveRate:
+    """
+    Chooses the sample interval from the activity of the channels.
+
+    Each time a window of samples is published, its per-channel
+    statistics are passed to `update`. A channel is active if its mean
+    changed faster than its ``rate`` threshold (units/sec) since the
+    previous window, or its standard deviation within the window is
+    above its ``std`` threshold (units). While any channel is active,
+    and for ``hold_time`` after, samples are taken every
+    ``fast_interval``, to capture transients such as pump-downs;
+    otherwise every ``slow_interval``, to save Modbus round trips and
+    CPU while the sensors are quiet. A channel with a NaN mean (one
+    that could not be read) is never active.
+
+        Parameters
+        ----------
+        activity : list of dict
+            activity thresholds of each channel, with the optional keys
+            in `ACTIVITY_NAMES`; an empty dict for none
+        slow_interval : float
+            sample interval (sec) while all channels are quiet
+        fast_interval : float
+            sample interval (sec) while any channel is active; 0 to
+            always sample every ``slow_interval``
+        hold_time : float
+            time (sec) to keep sampling fast after the last activity
+
+        Attributes
+        ----------
+        interval : float
+            the current sample interval (sec)
+        active_channels : numpy.ndarray
+            indices of the channels that were active in the most recent
+            window
+        rate : numpy.ndarray
+            most recently measured rate of change of each channel
+            (units/sec); NaN if not yet measured
+        num_changes : int
+            number of changes of `interval`
+
+        Raises
+        ------
+        ValueError
+            If a threshold is unknown, or ``fast_interval`` is not
+            shorter than ``slow_interval``.
+    """
+
+    def __init__(self, activity, slow_interval, fast_interval=0, hold_time=10):
+        if slow_interval <= 0:
+            raise ValueError(f"slow_interval={slow_interval} must be > 0")
+        if fast_interval < 0 or (fast_interval > 0 and fast_interval >= slow_interval):
+            raise ValueError(
+                f"fast_interval={fast_interval} must be 0 or shorter than "
+                f"slow_interval={slow_interval}"
+            )
+        if hold_time < 0:
+            raise ValueError(f"hold_time={hold_time} must be >= 0")
+        num_channels = len(activity)
+        columns = {name: np.full(num_channels, np.inf) for name in ACTIVITY_NAMES}
+        for channel, thresholds in enumerate(activity):
+            for name, value in thresholds.items():
+                if name not in columns:
+                    raise ValueError(
+                        f"Unknown activity threshold {name!r} for channel "
+                        f"{channel}; must be one of {ACTIVITY_NAMES}"
+                    )
+                columns[name][channel] = value
+        self.max_rate = columns["rate"]
+        self.max_std = columns["std"]
+        self.slow_interval = slow_interval
+        self.fast_interval = fast_interval
+        self.hold_time = hold_time
+        self.enabled = fast_interval > 0 and bool(
+            np.any(np.isfinite(self.max_rate) | np.isfinite(self.max_std))
+        )
+
+        self.interval = slow_interval
+        self.active_channels = np.array([], dtype=int)
+        self.rate = np.full(num_channels, np.nan)
+        self.num_changes = 0
+        self._active_until = -math.inf
+        self._last_mean = None
+        self._last_time = None
+
+    @property
+    def num_channels(self):
+        """Number of channels."""
+        return len(self.rate)
+
+    @property
+    def active(self):
+        """Is the fast interval in use?"""
+        return self.interval != self.slow_interval
+
+    def update(self, statistics, timestamp):
+        """Update the sample interval from a window of samples.
+
+        Parameters
+        ----------
+        statistics : ChannelStatistics
+            statistics of the window
+        timestamp : float
+            mean time of its samples (sec)
+
+        Returns
+        -------
+        changed : bool
+            did `interval` change?
+        """
+        if not self.enabled:
+            return False
+        mean = statistics.mean
+        if self._last_time is not None and timestamp > self._last_time:
+            self.rate = (mean - self._last_mean) / (timestamp - self._last_time)
+        self._last_mean = np.array(mean, dtype=float)
+        self._last_time = timestamp
+        with np.errstate(invalid="ignore"):
+            exceeded = (np.abs(self.rate) > self.max_rate) | (
+                statistics.std > self.max_std
+            )
+        self.active_channels = np.flatnonzero(exceeded)
+        if len(self.active_channels) > 0:
+            self._active_until = timestamp + self.hold_time
+        if len(self.active_channels) > 0 or timestamp < self._active_until:
+            interval = self.fast_interval
+        else:
+            interval = self.slow_interval
+        if interval == self.interval:
+            return False
+        self.interval = interval
+        self.num_changes += 1
+        return True
+
+    def resume_from(self, other):
+        """Continue from the state of another instance for the same
+        channels, e.g. after reloading the thresholds.
+        """
+        if other.num_channels != self.num_channels:
+            raise ValueError(
+                f"Cannot resume from {other.num_channels} channels; "
+                f"need {self.num_channels}"
+            )
+        self.rate = other.rate
+        self._last_mean = other._last_mean
+        self._last_time = other._last_time
+        if self.enabled and other.active:
+            self._active_until = other._active_until
+            self.interval = self.fast_interval
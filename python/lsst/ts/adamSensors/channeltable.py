@@ -0,0 +1,331 @@
+__all__ = [
+    "NUM_ANALOG_INPUT_SETTINGS",
+    "ChannelSpec",
+    "ChannelTable",
+    "configured_devices",
+]
+
+from collections import namedtuple
+
+import numpy as np
+
+from .adaptive import AdaptiveRate
+from .conversion import ChannelConverter
+from .filters import ChannelFilter
+from .limits import LimitChecker
+from .publisher import SENSOR_TOPICS, ChangeFilter, PublishPlan
+from .readplan import ADAM6024_ANALOG_INPUTS
+
+# Number of channels configured by the analog_input_N_* settings, which
+# are used if the ``channels`` setting is empty.
+NUM_ANALOG_INPUT_SETTINGS = 6
+
+ChannelSpec = namedtuple(
+    "ChannelSpec",
+    [
+        "device",
+        "register",
+        "sensor_type",
+        "field",
+        "coefficients",
+        "calibration",
+        "deadband",
+        "relative_deadband",
+        "thresholds",
+        "max_silence",
+        "limits",
+        "filter",
+        "activity",
+    ],
+    defaults=("None", None, (1.0, 0.0), None, 0, 0, (), None, None, None, None),
+)
+ChannelSpec.__doc__ = """Configuration of one telemetry channel.
+
+``device`` is the name of the ADAM controller that is read, or None
+for a channel that is never read (and so is always NaN), and
+``register`` is the offset of the analog input in its analog input
+registers. ``sensor_type`` and ``field`` select the telemetry topic and
+the index of the field in it (None for the channel's index), and
+``max_silence`` the maximum time (sec) between its publications (None
+for the ``max_silence`` of `ChannelTable.make_publish_plan`); the other
+fields are the arguments of `ChannelConverter`, `ChangeFilter`,
+`LimitChecker`, `ChannelFilter` and `AdaptiveRate` for the channel.
+"""
+
+
+def configured_devices(config):
+    """Return the ADAM controllers of a CSC configuration.
+
+    Parameters
+    ----------
+    config : types.SimpleNamespace
+        CSC configuration
+
+    Returns
+    -------
+    devices : list of dict
+        name, ip, port and (for the analog_input_N_* settings) channels
+        of each controller; a single controller named "adam" at
+        ``adam_ip:adam_port`` if ``devices`` is empty
+
+    Raises
+    ------
+    ValueError
+        If two controllers have the same name.
+    """
+    devices = config.devices
+    if not devices:
+        devices = [dict(name="adam", ip=config.adam_ip, port=config.adam_port)]
+    names = set()
+    result = []
+    for device in devices:
+        device = dict(device)
+        device.setdefault("port", 502)
+        device.setdefault("channels", list(range(NUM_ANALOG_INPUT_SETTINGS)))
+        if device["name"] in names:
+            raise ValueError(f"Duplicate device name {device['name']!r}.")
+        names.add(device["name"])
+        result.append(device)
+    return result
+
+
+class ChannelTable:
+    """
+    Compiled table of the telemetry channels: where each is read from,
+    how it is converted and where it is published.
+
+    The table is built once, when the CSC is configured, and the rest of
+    the pipeline works from it: the telemetry loop scatters each
+    controller's registers into the channels with `device_map`, and
+    `make_converter` and `make_publish_plan` precompile the conversion
+    and publication of all channels. Any number of channels and
+    controllers can be configured; only channels that are published
+    need a field in a telemetry topic.
+
+        Parameters
+        ----------
+        specs : list of ChannelSpec
+            configuration of each channel, in channel order
+
+        Attributes
+        ----------
+        device_map : dict
+            device name: (channel indices, register offsets), as integer
+            arrays, of the channels read from that controller
+        fields : list of int
+            telemetry field index of each channel
+        names : list of str
+            name of each channel for log messages: its telemetry field
+            (e.g. "pressure_ch2"), or "channel_N" if it is not published
+
+        Raises
+        ------
+        ValueError
+            If there are no channels, a register offset is out of range,
+            or two channels read the same register.
+    """
+
+    def __init__(self, specs):
+        if len(specs) == 0:
+            raise ValueError("Need at least one channel")
+        self.specs = list(specs)
+        self.fields = [
+            i if spec.field is None else spec.field for i, spec in enumerate(specs)
+        ]
+        self.names = [
+            SENSOR_TOPICS[spec.sensor_type][1].format(field)
+            if spec.sensor_type in SENSOR_TOPICS
+            else f"channel_{i}"
+            for i, (spec, field) in enumerate(zip(self.specs, self.fields))
+        ]
+        registers_by_device = dict()
+        for i, spec in enumerate(self.specs):
+            if spec.device is None:
+                continue
+            if not 0 <= spec.register < ADAM6024_ANALOG_INPUTS.count:
+                raise ValueError(
+                    f"Channel {i} register={spec.register} must be in the "
+                    f"range [0, {ADAM6024_ANALOG_INPUTS.count})"
+                )
+            registers = registers_by_device.setdefault(spec.device, dict())
+            if spec.register in registers:
+                raise ValueError(
+                    f"Channels {registers[spec.register]} and {i} both read "
+                    f"register {spec.register} of device {spec.device!r}"
+                )
+            registers[spec.register] = i
+        self.device_map = {
+            device: (
+                np.array(list(registers.values())),
+                np.array(list(registers.keys())),
+            )
+            for device, registers in registers_by_device.items()
+        }
+
+    @classmethod
+    def from_config(cls, config, devices):
+        """Compile the channels of a CSC configuration.
+
+        Uses the ``channels`` setting, or, if it is empty, the
+        analog_input_N_* settings and the ``channels`` of each device.
+
+        Parameters
+        ----------
+        config : types.SimpleNamespace
+            CSC configuration
+        devices : list of dict
+            the controllers; see `configured_devices`
+
+        Raises
+        ------
+        ValueError
+            If the configuration is invalid.
+        """
+        device_names = [device["name"] for device in devices]
+        if config.channels:
+            specs = []
+            for i, channel in enumerate(config.channels):
+                device = channel.get("device")
+                if device is None:
+                    if len(devices) != 1:
+                        raise ValueError(
+                            f"Channel {i} must name one of the devices "
+                            f"{device_names}"
+                        )
+                    device = device_names[0]
+                elif device not in device_names:
+                    raise ValueError(
+                        f"Channel {i} device {device!r} is not one of the "
+                        f"devices {device_names}"
+                    )
+                specs.append(
+                    ChannelSpec(
+                        device=device,
+                        register=channel.get("register", i),
+                        sensor_type=channel.get("type", "None"),
+                        field=channel.get("field"),
+                        coefficients=channel.get("coefficients", (1.0, 0.0)),
+                        calibration=channel.get("calibration"),
+                        deadband=channel.get("deadband", 0),
+                        relative_deadband=channel.get("relative_deadband", 0),
+                        thresholds=channel.get("thresholds", ()),
+                        max_silence=channel.get("max_silence"),
+                        limits=channel.get("limits"),
+                        filter=channel.get("filter"),
+                        activity=channel.get("activity"),
+                    )
+                )
+            return cls(specs)
+
+        sources = [(None, 0)] * NUM_ANALOG_INPUT_SETTINGS
+        for device in devices:
+            for register, channel in enumerate(device["channels"]):
+                if sources[channel][0] is not None:
+                    raise ValueError(
+                        f"Device {device['name']!r} uses channels "
+                        f"{device['channels']}, which overlap channels of "
+                        "this or another device."
+                    )
+                sources[channel] = (device["name"], register)
+        return cls(
+            [
+                ChannelSpec(
+                    device=device,
+                    register=register,
+                    sensor_type=getattr(config, f"analog_input_{i}_type"),
+                    coefficients=getattr(config, f"analog_input_{i}_coefficients"),
+                    calibration=getattr(config, f"analog_input_{i}_calibration"),
+                    deadband=getattr(config, f"analog_input_{i}_deadband"),
+                    relative_deadband=getattr(
+                        config, f"analog_input_{i}_relative_deadband"
+                    ),
+                    thresholds=getattr(config, f"analog_input_{i}_thresholds"),
+                )
+                for i, (device, register) in enumerate(sources)
+            ]
+        )
+
+    @property
+    def num_channels(self):
+        """Number of channels."""
+        return len(self.specs)
+
+    def make_converter(self):
+        """Make the `ChannelConverter` of the channels."""
+        return ChannelConverter(
+            [spec.coefficients for spec in self.specs],
+            calibrations=[spec.calibration or dict() for spec in self.specs],
+        )
+
+    def make_publish_plan(self, topic_owner, max_silence=60):
+        """Make the `PublishPlan` of the channels, with a `ChangeFilter`
+        for their deadbands and thresholds.
+
+        Parameters
+        ----------
+        topic_owner : object
+            object with the telemetry topics as attributes, usually the CSC
+        max_silence : float
+            maximum time (sec) between publications of each channel that
+            does not set its own
+        """
+        return PublishPlan(
+            [spec.sensor_type for spec in self.specs],
+            topic_owner,
+            change_filter=ChangeFilter(
+                deadband=[spec.deadband for spec in self.specs],
+                relative_deadband=[spec.relative_deadband for spec in self.specs],
+                thresholds=[spec.thresholds for spec in self.specs],
+                max_silence=[
+                    max_silence if spec.max_silence is None else spec.max_silence
+                    for spec in self.specs
+                ],
+            ),
+            fields=self.fields,
+        )
+
+    def make_limit_checker(self, rate_interval=1):
+        """Make the `LimitChecker` of the channels' limits.
+
+        Parameters
+        ----------
+        rate_interval : float
+            time (sec) over which rates of change are measured
+        """
+        return LimitChecker(
+            [spec.limits or dict() for spec in self.specs],
+            rate_interval=rate_interval,
+        )
+
+    def make_filter(self, sample_interval):
+        """Make the `ChannelFilter` of the channels' filters.
+
+        Parameters
+        ----------
+        sample_interval : float
+            time (sec) between samples
+        """
+        return ChannelFilter(
+            [spec.filter or dict() for spec in self.specs],
+            sample_interval=sample_interval,
+        )
+
+    def make_adaptive_rate(self, slow_interval, fast_interval=0, hold_time=10):
+        """Make the `AdaptiveRate` of the channels' activity thresholds.
+
+        Parameters
+        ----------
+        slow_interval : float
+            sample interval (sec) while all channels are quiet
+        fast_interval : float
+            sample interval (sec) while any channel is active; 0 to
+            always sample every ``slow_interval``
+        hold_time : float
+            time (sec) to keep sampling fast after the last activity
+        """
+        return AdaptiveRate(
+            [spec.activity or dict() for spec in self.specs],
+            slow_interval=slow_interval,
+            fast_interval=fast_interval,
+            hold_time=hold_time,
+        )
@@ -20,6 +20,187 @@ properties:
     description: port of the ADAM controller.
     type: number
     default: 502
+  devices:
+    description: >-
+      ADAM controllers to poll concurrently. If empty, a single controller
+      named "adam" at adam_ip:adam_port is polled and its analog inputs feed
+      channels 0-5.
+    type: array
+    default: []
+    items:
+      type: object
+      properties:
+        name:
+          description: Name of the ADAM controller, used in log messages.
+          type: string
+        ip:
+          description: IP of the ADAM controller.
+          type: string
+        port:
+          description: port of the ADAM controller.
+          type: number
+          default: 502
+        channels:
+          description: >-
+            Telemetry channel (0-5) fed by each of this controller's analog
+            inputs, in input order. Channels may not be shared between controllers.
+            Ignored if the top-level channels setting is used.
+          type: array
+          items:
+            type: integer
+            minimum: 0
+            maximum: 5
+          default: [0, 1, 2, 3, 4, 5]
+      required: [name, ip]
+      additionalProperties: false
+  max_concurrent_reads:
+    description: Maximum number of controllers read at the same time.
+    type: integer
+    minimum: 1
+    default: 8
+  read_timeout:
+    description: >-
+      Maximum time (sec) to wait for a controller to connect or answer a read.
+      A controller that times out is disconnected and reconnected, so that it
+      does not stall the others.
+    type: number
+    exclusiveMinimum: 0
+    default: 2
+  reconnect_max_interval:
+    description: >-
+      Maximum delay (sec) between attempts to reconnect to a controller. The
+      delay starts short and doubles after each failed attempt.
+    type: number
+    exclusiveMinimum: 0
+    default: 30
+  read_diagnostics:
+    description: >-
+      Also read the analog output readback, analog input status and digital
+      I/O of each controller every sample. These are merged with the analog
+      inputs into as few Modbus requests as possible, sent together, so they
+      add little to the read time.
+    type: boolean
+    default: false
+  sample_interval:
+    description: >-
+      Period (sec) between samples. Samples are taken on a fixed grid of the
+      monotonic clock, so slow reads do not make the rate drift. Use a value
+      well below publish_interval (e.g. 0.005-0.02 sec for 50-200 Hz) to
+      average down sensor noise without publishing more telemetry.
+    type: number
+    exclusiveMinimum: 0
+    default: 1
+  fast_sample_interval:
+    description: >-
+      If > 0, sample this often while any channel is active (see activity
+      in the channels list), and every sample_interval otherwise, so
+      transients such as pump-downs are captured without polling fast while
+      the sensors are quiet. Must be shorter than sample_interval. Each
+      change of rate is logged.
+    type: number
+    minimum: 0
+    default: 0
+  activity_hold_time:
+    description: >-
+      Time (sec) to keep sampling every fast_sample_interval after the last
+      activity of any channel.
+    type: number
+    minimum: 0
+    default: 10
+  publish_interval:
+    description: >-
+      Period (sec) between published telemetry samples. Each published value
+      is the mean of the samples taken since the previous publication.
+    type: number
+    exclusiveMinimum: 0
+    default: 1
+  acquisition_worker:
+    description: >-
+      Poll the controllers in a separate worker process, which passes the
+      samples to the CSC through shared memory, so that garbage collection,
+      DDS traffic and command handling in the CSC cannot delay the reads.
+      The diagnostic registers (read_diagnostics) are not read in this mode.
+    type: boolean
+    default: false
+  warm_standby:
+    description: >-
+      Keep the connections to the devices open in STANDBY, polling them every
+      standby_poll_interval to check them, so that the next start reuses them
+      and publishes the most recent sample at once, instead of connecting
+      again and waiting for a publish_interval. The connections are closed
+      in OFFLINE and FAULT, and are not reused if the new configuration
+      changes them or the devices stopped responding.
+    type: boolean
+    default: false
+  standby_poll_interval:
+    description: >-
+      Period (sec) between polls of the devices in STANDBY, if warm_standby.
+    type: number
+    exclusiveMinimum: 0
+    default: 1
+  history_duration:
+    description: >-
+      Duration (sec) of the recent sample history kept in memory for
+      in-process consumers. Must be at least publish_interval.
+    type: number
+    exclusiveMinimum: 0
+    default: 600
+  metrics_interval:
+    description: >-
+      Period (sec) between log messages reporting sampling metrics and the
+      latency of each stage of the telemetry loop.
+    type: number
+    exclusiveMinimum: 0
+    default: 60
+  publish_max_silence:
+    description: >-
+      Maximum time (sec) between publications of each channel, when its
+      value stays within its deadband, unless the channel sets its own
+      max_silence.
+    type: number
+    exclusiveMinimum: 0
+    default: 60
+  limit_rate_interval:
+    description: >-
+      Time (sec) over which the rate of change of each channel is measured,
+      to check it against the warning_rate and alarm_rate limits.
+    type: number
+    exclusiveMinimum: 0
+    default: 1
+  spool_directory:
+    description: >-
+      If not blank, append the time and raw counts of every sample to binary
+      spool files in this directory, so data can be recovered if telemetry
+      is lost or reprocessed with new coefficients (see replay_adamSpool.py).
+    type: string
+    default: ""
+  spool_max_file_size:
+    description: Size (MB) at which a new spool file is started.
+    type: number
+    exclusiveMinimum: 0
+    default: 64
+  replay_directory:
+    description: >-
+      In simulation mode 1, if not blank, play back the raw counts recorded
+      in the spool files in this directory (see spool_directory) as the
+      analog inputs of the simulated controllers, instead of fixed waveforms.
+      Playback starts over at the end of the recording.
+    type: string
+    default: ""
+  replay_speed:
+    description: >-
+      Speed of playback of replay_directory relative to real time, e.g. 100
+      to play 100 seconds of recording per second.
+    type: number
+    exclusiveMinimum: 0
+    default: 1
+  instrumentation_enabled:
+    description: >-
+      Time each stage of the telemetry loop (wakeup, read, store, convert,
+      publish) and report their latency percentiles with the sampling
+      metrics.
+    type: boolean
+    default: true
   analog_input_0_type:
     description: Type of sensor connected to ADAM AO-0. Can be "None", "Temperature", or "Pressure".
     type: string
@@ -33,6 +214,78 @@ properties:
     items:
       type: number
     default: [1., 0.]
+  analog_input_0_calibration:
+    description: >-
+      Calibration of AO-0 applied to the output of
+      analog_input_0_coefficients, for sensors a polynomial does not fit.
+      kind is one of "polynomial" (no further conversion), "log10" (10 to
+      the power of the polynomial), "table" (piecewise-linear interpolation
+      of table, a list of [input, value] points with increasing inputs),
+      "rtd" (temperature in C of a platinum RTD from its resistance in ohms)
+      or "thermocouple" (temperature in C from emf in mV).
+    type: object
+    properties: &calibration_properties
+      kind:
+        type: string
+        enum: ["polynomial", "log10", "table", "rtd", "thermocouple"]
+        default: polynomial
+      table:
+        type: array
+        items:
+          type: array
+          items:
+            type: number
+          minItems: 2
+          maxItems: 2
+        minItems: 2
+      r0:
+        description: RTD resistance (ohms) at 0 C.
+        type: number
+        exclusiveMinimum: 0
+        default: 100
+      cvd_coefficients:
+        description: Callendar-Van Dusen coefficients [A, B, C] of the RTD.
+        type: array
+        items:
+          type: number
+        minItems: 3
+        maxItems: 3
+        default: [3.9083e-3, -5.775e-7, -4.183e-12]
+      thermocouple_type:
+        type: string
+        enum: ["K", "T"]
+        default: K
+      reference_temperature:
+        description: Temperature (C) of the thermocouple reference junction.
+        type: number
+        minimum: 0
+        default: 0
+    additionalProperties: false
+    default: {}
+  analog_input_0_deadband:
+    description: >-
+      Do not publish a new value of AO-0 unless it differs from the last
+      published value by at least this much (in engineering units), it
+      crosses one of analog_input_0_thresholds, or publish_max_silence has
+      passed. 0 publishes every value.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_0_relative_deadband:
+    description: >-
+      As analog_input_0_deadband, but as a fraction of the magnitude of the
+      last published value. The larger of the two deadbands applies.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_0_thresholds:
+    description: >-
+      Values of AO-0 (in engineering units) whose crossing is published
+      at once, regardless of the deadbands.
+    type: array
+    items:
+      type: number
+    default: []
   analog_input_1_type:
     description: Type of sensor connected to ADAM AO-1. Can be "None", "Temperature", or "Pressure".
     type: string
@@ -46,6 +299,28 @@ properties:
     items:
       type: number
     default: [1., 0.]
+  analog_input_1_calibration:
+    description: As analog_input_0_calibration, for AO-1.
+    type: object
+    properties: *calibration_properties
+    additionalProperties: false
+    default: {}
+  analog_input_1_deadband:
+    description: As analog_input_0_deadband, for AO-1.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_1_relative_deadband:
+    description: As analog_input_0_relative_deadband, for AO-1.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_1_thresholds:
+    description: As analog_input_0_thresholds, for AO-1.
+    type: array
+    items:
+      type: number
+    default: []
   analog_input_2_type:
     description: Type of sensor connected to ADAM AO-2. Can be "None", "Temperature", or "Pressure".
     type: string
@@ -59,6 +334,28 @@ properties:
     items:
       type: number
     default: [1., 0.]
+  analog_input_2_calibration:
+    description: As analog_input_0_calibration, for AO-2.
+    type: object
+    properties: *calibration_properties
+    additionalProperties: false
+    default: {}
+  analog_input_2_deadband:
+    description: As analog_input_0_deadband, for AO-2.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_2_relative_deadband:
+    description: As analog_input_0_relative_deadband, for AO-2.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_2_thresholds:
+    description: As analog_input_0_thresholds, for AO-2.
+    type: array
+    items:
+      type: number
+    default: []
   analog_input_3_type:
     description: Type of sensor connected to ADAM AO-3. Can be "None", "Temperature", or "Pressure".
     type: string
@@ -72,6 +369,28 @@ properties:
     items:
       type: number
     default: [344738., 0.]
+  analog_input_3_calibration:
+    description: As analog_input_0_calibration, for AO-3.
+    type: object
+    properties: *calibration_properties
+    additionalProperties: false
+    default: {}
+  analog_input_3_deadband:
+    description: As analog_input_0_deadband, for AO-3.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_3_relative_deadband:
+    description: As analog_input_0_relative_deadband, for AO-3.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_3_thresholds:
+    description: As analog_input_0_thresholds, for AO-3.
+    type: array
+    items:
+      type: number
+    default: []
   analog_input_4_type:
     description: Type of sensor connected to ADAM AO-4. Can be "None", "Temperature", or "Pressure".
     type: string
@@ -85,6 +404,28 @@ properties:
     items:
       type: number
     default: [1., 0.]
+  analog_input_4_calibration:
+    description: As analog_input_0_calibration, for AO-4.
+    type: object
+    properties: *calibration_properties
+    additionalProperties: false
+    default: {}
+  analog_input_4_deadband:
+    description: As analog_input_0_deadband, for AO-4.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_4_relative_deadband:
+    description: As analog_input_0_relative_deadband, for AO-4.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_4_thresholds:
+    description: As analog_input_0_thresholds, for AO-4.
+    type: array
+    items:
+      type: number
+    default: []
   analog_input_5_type:
     description: Type of sensor connected to ADAM AO-5. Can be "None", "Temperature", or "Pressure".
     type: string
@@ -97,5 +438,168 @@ properties:
     type: array
     items:
       type: number
-    default: [344738., 0.]"""
+    default: [344738., 0.]
+  analog_input_5_calibration:
+    description: As analog_input_0_calibration, for AO-5.
+    type: object
+    properties: *calibration_properties
+    additionalProperties: false
+    default: {}
+  analog_input_5_deadband:
+    description: As analog_input_0_deadband, for AO-5.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_5_relative_deadband:
+    description: As analog_input_0_relative_deadband, for AO-5.
+    type: number
+    minimum: 0
+    default: 0
+  analog_input_5_thresholds:
+    description: As analog_input_0_thresholds, for AO-5.
+    type: array
+    items:
+      type: number
+    default: []
+  channels:
+    description: >-
+      Telemetry channels, in channel order, each read from one analog input of
+      one controller. If empty, six channels are configured by the
+      analog_input_N_* settings and the channels of each controller. Any
+      number of channels may be configured, e.g. for 8-input controllers such
+      as the ADAM-6017 and ADAM-6018; channels of type None are sampled (and
+      spooled) but not published.
+    type: array
+    default: []
+    items:
+      type: object
+      properties:
+        device:
+          description: >-
+            Name of the controller to read; may be omitted if there is only
+            one.
+          type: string
+        register:
+          description: >-
+            Analog input (0-7) of the controller; defaults to the index of
+            the channel.
+          type: integer
+          minimum: 0
+          maximum: 7
+        type:
+          description: Type of sensor, which selects the telemetry topic.
+          type: string
+          enum: ["Temperature", "Pressure", "None"]
+          default: "None"
+        field:
+          description: >-
+            Index (0-5) of the telemetry field to publish the channel as, e.g.
+            2 for pressure_ch2; defaults to the index of the channel.
+          type: integer
+          minimum: 0
+          maximum: 5
+        coefficients:
+          description: As analog_input_N_coefficients.
+          type: array
+          items:
+            type: number
+          default: [1., 0.]
+        calibration:
+          description: As analog_input_N_calibration.
+          type: object
+          properties: *calibration_properties
+          additionalProperties: false
+          default: {}
+        deadband:
+          description: As analog_input_N_deadband.
+          type: number
+          minimum: 0
+          default: 0
+        relative_deadband:
+          description: As analog_input_N_relative_deadband.
+          type: number
+          minimum: 0
+          default: 0
+        thresholds:
+          description: As analog_input_N_thresholds.
+          type: array
+          items:
+            type: number
+          default: []
+        max_silence:
+          description: >-
+            Maximum time (sec) between publications of the channel, when its
+            value stays within its deadband; defaults to publish_max_silence.
+          type: number
+          exclusiveMinimum: 0
+        limits:
+          description: >-
+            Warning and alarm limits of the channel (in engineering units),
+            checked on every sample. Crossing a limit is reported at once as
+            a log message (published as a logMessage event): warnings at
+            WARNING level, alarms at ERROR level. Rates are in units per
+            second, in either direction, measured over limit_rate_interval. A
+            channel returns to a lower severity once its value is inside the
+            limits by hysteresis.
+          type: object
+          properties:
+            warning_low:
+              type: number
+            warning_high:
+              type: number
+            alarm_low:
+              type: number
+            alarm_high:
+              type: number
+            warning_rate:
+              type: number
+              exclusiveMinimum: 0
+            alarm_rate:
+              type: number
+              exclusiveMinimum: 0
+            hysteresis:
+              type: number
+              minimum: 0
+          additionalProperties: false
+          default: {}
+        filter:
+          description: >-
+            Streaming filters of the channel, applied to every sample after
+            conversion and before the limits are checked and values
+            published; the raw counts are stored and spooled unfiltered. The
+            stages run in this order, each only if set: a running median of
+            the last median_length samples (which rejects spikes shorter than
+            half of it), a moving average of the last average_length samples,
+            and a first-order low-pass with time constant time_constant (sec).
+          type: object
+          properties:
+            median_length:
+              type: integer
+              minimum: 1
+            average_length:
+              type: integer
+              minimum: 1
+            time_constant:
+              type: number
+              exclusiveMinimum: 0
+          additionalProperties: false
+          default: {}
+        activity:
+          description: >-
+            Thresholds above which the channel (in engineering units) is
+            active, which makes the CSC sample every fast_sample_interval:
+            rate is the rate of change (units/sec) of the mean between
+            published windows, std the standard deviation of the samples
+            within a window.
+          type: object
+          properties:
+            rate:
+              type: number
+              exclusiveMinimum: 0
+            std:
+              type: number
+              exclusiveMinimum: 0
+          additionalProperties: false
+          default: {}
+      additionalProperties: false"""
 )
@@ -0,0 +1,422 @@
+__all__ = [
+    "CALIBRATION_KINDS",
+    "THERMOCOUPLE_TYPES",
+    "thermocouple_emf",
+    "ChannelConverter",
+]
+
+import numpy as np
+from numpy.polynomial import polynomial
+
+# IEC 60751 Callendar-Van Dusen coefficients A, B, C of platinum RTDs.
+IEC60751_COEFFICIENTS = (3.9083e-3, -5.775e-7, -4.183e-12)
+
+# NIST ITS-90 thermocouple polynomials (temperature in C, emf in mV).
+# Inverse: the emf at the boundaries between ranges, and for each range
+# the coefficients (in ascending order) of temperature as a function of
+# emf. Forward: the coefficients of emf as a function of temperature,
+# for temperatures from 0 C, with the exponential term of type K.
+THERMOCOUPLE_TYPES = {
+    "K": dict(
+        inverse_edges=(0.0, 20.644),
+        inverse=(
+            (
+                0.0,
+                2.5173462e1,
+                -1.1662878,
+                -1.0833638,
+                -8.977354e-1,
+                -3.7342377e-1,
+                -8.6632643e-2,
+                -1.0450598e-2,
+                -5.1920577e-4,
+            ),
+            (
+                0.0,
+                2.508355e1,
+                7.860106e-2,
+                -2.503131e-1,
+                8.31527e-2,
+                -1.228034e-2,
+                9.804036e-4,
+                -4.41303e-5,
+                1.057734e-6,
+                -1.052755e-8,
+            ),
+            (
+                -1.318058e2,
+                4.830222e1,
+                -1.646031,
+                5.464731e-2,
+                -9.650715e-4,
+                8.802193e-6,
+                -3.11081e-8,
+            ),
+        ),
+        forward=(
+            -1.7600413686e-2,
+            3.8921204975e-2,
+            1.8558770032e-5,
+            -9.9457592874e-8,
+            3.1840945719e-10,
+            -5.6072844889e-13,
+            5.6075059059e-16,
+            -3.2020720003e-19,
+            9.7151147152e-23,
+            -1.2104721275e-26,
+        ),
+        forward_exponential=(1.185976e-1, -1.183432e-4, 1.269686e2),
+    ),
+    "T": dict(
+        inverse_edges=(0.0,),
+        inverse=(
+            (
+                0.0,
+                2.5949192e1,
+                -2.1316967e-1,
+                7.9018692e-1,
+                4.2527777e-1,
+                1.3304473e-1,
+                2.0241446e-2,
+                1.2668171e-3,
+            ),
+            (
+                0.0,
+                2.5928e1,
+                -7.602961e-1,
+                4.637791e-2,
+                -2.165394e-3,
+                6.048144e-5,
+                -7.293422e-7,
+            ),
+        ),
+        forward=(
+            0.0,
+            3.8748106364e-2,
+            3.329222788e-5,
+            2.0618243404e-7,
+            -2.1882256846e-9,
+            1.0996880928e-11,
+            -3.0815758772e-14,
+            4.547913529e-17,
+            -2.7512901673e-20,
+        ),
+        forward_exponential=None,
+    ),
+}
+
+
+def thermocouple_emf(temperature, thermocouple_type):
+    """Return the emf (mV) of a thermocouple at a temperature (C) at or
+    above 0 C, with its reference junction at 0 C.
+    """
+    if temperature < 0:
+        raise ValueError(f"temperature={temperature} must be >= 0 C")
+    params = THERMOCOUPLE_TYPES[thermocouple_type]
+    emf = polynomial.polyval(temperature, params["forward"])
+    if params["forward_exponential"] is not None:
+        a0, a1, a2 = params["forward_exponential"]
+        emf += a0 * np.exp(a1 * (temperature - a2) ** 2)
+    return emf
+
+
+def _compile_polynomial(channels, calibrations):
+    """The polynomial of every channel is already evaluated."""
+    return None
+
+
+def _compile_log10(channels, calibrations):
+    def stage(values):
+        values[..., channels] = 10 ** values[..., channels]
+
+    return stage
+
+
+def _compile_table(channels, calibrations):
+    tables = []
+    for calibration in calibrations:
+        table = np.asarray(calibration.get("table", ()), dtype=float)
+        if table.ndim != 2 or table.shape[1] != 2 or len(table) < 2:
+            raise ValueError(
+                f"table={calibration.get('table')} must have at least two "
+                "[input, value] points"
+            )
+        if np.any(np.diff(table[:, 0]) <= 0):
+            raise ValueError(f"table={table.tolist()} inputs must increase")
+        x = table[:, 0]
+        slopes = np.diff(table[:, 1]) / np.diff(x)
+        tables.append((x[1:-1], x[:-1], table[:-1, 1], slopes))
+
+    def stage(values):
+        for channel, (edges, x0, y0, slopes) in zip(channels, tables):
+            inputs = values[..., channel]
+            # binary search for the segment; the end segments extrapolate
+            segment = np.searchsorted(edges, inputs)
+            values[..., channel] = y0[segment] + slopes[segment] * (
+                inputs - x0[segment]
+            )
+
+    return stage
+
+
+def _compile_rtd(channels, calibrations):
+    r0 = np.array([calibration.get("r0", 100) for calibration in calibrations])
+    a, b, c = np.array(
+        [
+            calibration.get("cvd_coefficients", IEC60751_COEFFICIENTS)
+            for calibration in calibrations
+        ]
+    ).T
+    if np.any(r0 <= 0):
+        raise ValueError(f"r0={r0.tolist()} must be positive")
+
+    def stage(values):
+        ratio = values[..., channels] / r0
+        with np.errstate(invalid="ignore"):
+            # exact above 0 C, where the C term vanishes
+            temperature = (-a + np.sqrt(a * a - 4 * b * (1 - ratio))) / (2 * b)
+            # refine below 0 C with Newton's method
+            below = ratio < 1
+            if np.any(below):
+                ratio_below = ratio[below]
+                a_below, b_below, c_below = (
+                    np.broadcast_to(term, ratio.shape)[below] for term in (a, b, c)
+                )
+                t = temperature[below]
+                for i in range(4):
+                    higher_terms = b_below + c_below * (t - 100) * t
+                    f = 1 - ratio_below + t * (a_below + t * higher_terms)
+                    df = a_below + t * (2 * b_below + c_below * (4 * t - 300) * t)
+                    t -= f / df
+                temperature[below] = t
+        values[..., channels] = temperature
+
+    return stage
+
+
+def _compile_thermocouple(channels, calibrations):
+    stages = []
+    for thermocouple_type in THERMOCOUPLE_TYPES:
+        selected = [
+            (channel, calibration)
+            for channel, calibration in zip(channels, calibrations)
+            if calibration.get("thermocouple_type", "K") == thermocouple_type
+        ]
+        if selected:
+            stages.append(_compile_thermocouple_type(thermocouple_type, selected))
+    unknown = {
+        calibration.get("thermocouple_type", "K") for calibration in calibrations
+    }.difference(THERMOCOUPLE_TYPES)
+    if unknown:
+        raise ValueError(
+            f"Unknown thermocouple types {sorted(unknown)}; "
+            f"must be one of {list(THERMOCOUPLE_TYPES)}"
+        )
+
+    def stage(values):
+        for type_stage in stages:
+            type_stage(values)
+
+    return stage
+
+
+def _compile_thermocouple_type(thermocouple_type, selected):
+    params = THERMOCOUPLE_TYPES[thermocouple_type]
+    channels = np.array([channel for channel, calibration in selected])
+    # the emf of the reference junction, which adds to the measured emf
+    reference_emf = np.array(
+        [
+            thermocouple_emf(
+                calibration.get("reference_temperature", 0), thermocouple_type
+            )
+            for channel, calibration in selected
+        ]
+    )
+    edges = np.asarray(params["inverse_edges"])
+    inverse = params["inverse"]
+
+    def stage(values):
+        emf = values[..., channels] + reference_emf
+        # outside the standard range, the nearest range is extrapolated
+        segment = np.searchsorted(edges, emf)
+        values[..., channels] = np.choose(
+            segment, [polynomial.polyval(emf, coeffs) for coeffs in inverse]
+        )
+
+    return stage
+
+
+# Compilers of each kind of calibration; each takes the channel indices
+# and calibration dicts of the channels of its kind and returns a
+# function that converts the values of those channels in place (or None).
+CALIBRATION_KINDS = {
+    "polynomial": _compile_polynomial,
+    "log10": _compile_log10,
+    "table": _compile_table,
+    "rtd": _compile_rtd,
+    "thermocouple": _compile_thermocouple,
+}
+
+
+class ChannelConverter:
+    """
+    Precompiled conversion of raw ADAM register counts to engineering units.
+
+    Counts are mapped to volts and then through one polynomial per channel,
+    evaluated with Horner's scheme over a coefficient matrix, so a whole
+    register block, or a batch of buffered blocks, is converted with a few
+    NumPy operations.
+
+    Channels may also have a calibration of another kind, applied to the
+    output of their polynomial (which then maps volts to the input of the
+    calibration, e.g. ohms or millivolts). Channels of the same kind are
+    converted together. The kinds (see `CALIBRATION_KINDS`) and their
+    parameters are:
+
+    * ``polynomial``: only the polynomial.
+    * ``log10``: 10 to the power of the polynomial, for gauges with a
+      logarithmic output.
+    * ``table``: piecewise-linear interpolation of a ``table`` of
+      ``[input, value]`` points with increasing inputs, found by binary
+      search. The end segments are extrapolated.
+    * ``rtd``: temperature (C) of a platinum RTD from its resistance
+      (ohms), inverting the Callendar-Van Dusen equation with resistance
+      ``r0`` at 0 C (default 100) and ``cvd_coefficients`` [A, B, C]
+      (default IEC 60751).
+    * ``thermocouple``: temperature (C) from emf (mV), with the NIST
+      ITS-90 inverse polynomials of ``thermocouple_type`` (one of
+      `THERMOCOUPLE_TYPES`, default "K") and the reference junction at
+      ``reference_temperature`` (C, default 0).
+
+        Parameters
+        ----------
+        coefficients : list of sequences of float
+            for each channel, the terms of a polynomial that maps volts
+            to engineering units, in descending order (as for
+            `numpy.poly1d`)
+        range_size : float
+            span of the input range (volts), from 0 to 65535 counts
+        range_start : float
+            voltage that corresponds to 0 counts
+        calibrations : list of dict, optional
+            for each channel, a dict with the ``kind`` of calibration
+            (default "polynomial") and its parameters; ``coefficients``,
+            if present, replaces the channel's polynomial
+
+        Attributes
+        ----------
+        coefficient_matrix : numpy.ndarray
+            polynomial terms, shape (degree + 1, num_channels), in
+            descending order; lower order polynomials are zero padded
+        kinds : list of str
+            kind of calibration of each channel
+
+        Raises
+        ------
+        ValueError
+            If a calibration is of an unknown kind or has invalid
+            parameters.
+    """
+
+    def __init__(self, coefficients, range_size=20, range_start=-10, calibrations=None):
+        if len(coefficients) == 0:
+            raise ValueError("coefficients must have at least one channel")
+        if calibrations is None:
+            calibrations = [dict()] * len(coefficients)
+        if len(calibrations) != len(coefficients):
+            raise ValueError(
+                f"{len(calibrations)} calibrations for " f"{len(coefficients)} channels"
+            )
+        coefficients = [
+            calibration.get("coefficients", channel_coeffs)
+            for calibration, channel_coeffs in zip(calibrations, coefficients)
+        ]
+        num_terms = max(len(channel_coeffs) for channel_coeffs in coefficients)
+        if num_terms == 0:
+            raise ValueError("each channel needs at least one coefficient")
+        self.coefficient_matrix = np.zeros((num_terms, len(coefficients)))
+        for i, channel_coeffs in enumerate(coefficients):
+            first_term = num_terms - len(channel_coeffs)
+            self.coefficient_matrix[first_term:, i] = channel_coeffs
+        self.volts_per_count = range_size / 65535
+        self.range_start = range_start
+
+        self.kinds = [
+            calibration.get("kind", "polynomial") for calibration in calibrations
+        ]
+        unknown = set(self.kinds).difference(CALIBRATION_KINDS)
+        if unknown:
+            raise ValueError(
+                f"Unknown calibration kinds {sorted(unknown)}; "
+                f"must be one of {list(CALIBRATION_KINDS)}"
+            )
+        self._stages = []
+        for kind, compile_kind in CALIBRATION_KINDS.items():
+            channels = [i for i, name in enumerate(self.kinds) if name == kind]
+            if not channels:
+                continue
+            stage = compile_kind(
+                np.array(channels), [calibrations[i] for i in channels]
+            )
+            if stage is not None:
+                self._stages.append(stage)
+
+    @property
+    def num_channels(self):
+        """Number of channels converted."""
+        return self.coefficient_matrix.shape[1]
+
+    def counts_to_volts(self, counts):
+        """Convert register counts into volts.
+
+        Parameters
+        ----------
+        counts : array_like
+            register counts, shape (..., num_registers); only the first
+            ``num_channels`` registers are used
+
+        Returns
+        -------
+        volts : numpy.ndarray
+            voltages, shape (..., num_channels)
+        """
+        counts = np.asarray(counts, dtype=float)[..., : self.num_channels]
+        return counts * self.volts_per_count + self.range_start
+
+    def volts_to_units(self, volts):
+        """Evaluate each channel's polynomial and calibration on voltages.
+
+        Parameters
+        ----------
+        volts : array_like
+            voltages, shape (..., num_channels)
+
+        Returns
+        -------
+        values : numpy.ndarray
+            values in engineering units, shape (..., num_channels)
+        """
+        volts = np.asarray(volts, dtype=float)
+        values = np.broadcast_to(self.coefficient_matrix[0], volts.shape).copy()
+        for terms in self.coefficient_matrix[1:]:
+            values *= volts
+            values += terms
+        for stage in self._stages:
+            stage(values)
+        return values
+
+    def convert(self, counts):
+        """Convert register counts into engineering units.
+
+        Parameters
+        ----------
+        counts : array_like
+            register counts, shape (..., num_registers), e.g. one
+            register block or a batch of buffered blocks
+
+        Returns
+        -------
+        values : numpy.ndarray
+            values in engineering units, shape (..., num_channels)
+        """
+        return self.volts_to_units(self.counts_to_volts(counts))
@@ -0,0 +1,42 @@
+__all__ = ["ChannelStatistics", "channel_statistics"]
+
+from collections import namedtuple
+
+import numpy as np
+
+ChannelStatistics = namedtuple(
+    "ChannelStatistics", ["mean", "min", "max", "std", "count"]
+)
+ChannelStatistics.__doc__ = """Per-channel statistics of a window of samples.
+
+Each field is an array with one value per channel; ``count`` is the
+number of valid (non-NaN) samples of each channel.
+"""
+
+
+def channel_statistics(values):
+    """Compute per-channel statistics, ignoring NaN samples.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        samples, shape (num_samples, num_channels)
+
+    Returns
+    -------
+    statistics : ChannelStatistics
+        the statistics; channels with no valid samples are NaN
+    """
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, values, 0).sum(axis=0) / count
+        deviation = np.where(valid, values - mean, 0)
+        std = np.sqrt((deviation * deviation).sum(axis=0) / count)
+    return ChannelStatistics(
+        mean=mean,
+        min=np.fmin.reduce(values, axis=0),
+        max=np.fmax.reduce(values, axis=0),
+        std=std,
+        count=count,
+    )
@@ -0,0 +1,219 @@
+__all__ = ["FILTER_NAMES", "ChannelFilter"]
+
+import math
+
+import numpy as np
+
+# Settings of the filter of one channel, in the order the stages run;
+# each is optional
+FILTER_NAMES = ("median_length", "average_length", "time_constant")
+
+
+class _FilterStage:
+    """One filter stage of a group of channels with the same settings.
+
+    Subclasses set ``self.output`` in `_seed` and `_update`.
+    """
+
+    def __init__(self, channels):
+        self.channels = np.asarray(channels)
+        num_channels = len(channels)
+        self.input = np.zeros(num_channels)
+        self.output = np.zeros(num_channels)
+        self.initialized = np.zeros(num_channels, dtype=bool)
+        self._invalid = np.zeros(num_channels, dtype=bool)
+        self._seed_mask = np.zeros(num_channels, dtype=bool)
+
+    def process(self, values):
+        """Filter one sample of all channels in place."""
+        np.take(values, self.channels, out=self.input)
+        # a channel is (re)seeded with its first valid value after
+        # starting or being NaN, so NaN never lingers in the state
+        np.isnan(self.input, out=self._invalid)
+        np.logical_or(self._invalid, self.initialized, out=self._seed_mask)
+        np.logical_not(self._seed_mask, out=self._seed_mask)
+        if self._seed_mask.any():
+            self._seed(self._seed_mask)
+        np.logical_not(self._invalid, out=self.initialized)
+        self._update()
+        np.copyto(self.output, self.input, where=self._invalid)
+        values[self.channels] = self.output
+
+    def reset(self):
+        self.initialized[:] = False
+
+
+class _MedianStage(_FilterStage):
+    def __init__(self, channels, length):
+        super().__init__(channels)
+        self.ring = np.zeros((length, len(channels)))
+        self._scratch = np.zeros_like(self.ring)
+        self._position = 0
+        # the middle element(s) of a sorted window
+        self._middle = (length // 2,) if length % 2 else (length // 2 - 1, length // 2)
+
+    def _seed(self, mask):
+        self.ring[:, mask] = self.input[mask]
+
+    def _update(self):
+        self.ring[self._position] = self.input
+        self._position = (self._position + 1) % len(self.ring)
+        # partially sort a copy of the ring, which is several times
+        # faster than numpy.median for short windows
+        scratch = self._scratch
+        np.copyto(scratch, self.ring)
+        scratch.partition(self._middle, axis=0)
+        if len(self._middle) == 1:
+            np.copyto(self.output, scratch[self._middle[0]])
+        else:
+            np.add(scratch[self._middle[0]], scratch[self._middle[1]], out=self.output)
+            self.output *= 0.5
+
+
+class _AverageStage(_FilterStage):
+    def __init__(self, channels, length):
+        super().__init__(channels)
+        self.ring = np.zeros((length, len(channels)))
+        self.sum = np.zeros(len(channels))
+        self._position = 0
+
+    def _seed(self, mask):
+        self.ring[:, mask] = self.input[mask]
+        self.sum[mask] = self.input[mask] * len(self.ring)
+
+    def _update(self):
+        ring = self.ring
+        self.sum -= ring[self._position]
+        self.sum += self.input
+        ring[self._position] = self.input
+        self._position = (self._position + 1) % len(ring)
+        if self._position == 0:
+            # stop rounding errors of the running sum from accumulating
+            np.sum(ring, axis=0, out=self.sum)
+        np.divide(self.sum, len(ring), out=self.output)
+
+
+class _IirStage(_FilterStage):
+    def __init__(self, channels, time_constant):
+        super().__init__(channels)
+        self.time_constant = time_constant
+        self.alpha = 0
+        self._step = np.zeros(len(channels))
+
+    def _seed(self, mask):
+        self.output[mask] = self.input[mask]
+
+    def _update(self):
+        # y += alpha * (x - y); after a NaN input y is NaN until reseeded
+        np.subtract(self.input, self.output, out=self._step)
+        self._step *= self.alpha
+        self.output += self._step
+
+
+class ChannelFilter:
+    """
+    Streaming digital filters of all channels, applied sample by sample.
+
+    Each channel can have any of these stages, which run in this order:
+
+    * ``median_length``: running median of the last ``median_length``
+      samples, which rejects spikes shorter than half the window
+    * ``average_length``: moving average of the last ``average_length``
+      samples
+    * ``time_constant``: first-order IIR low-pass with this time
+      constant (sec), ``y += alpha * (x - y)`` with
+      ``alpha = 1 - exp(-sample_interval / time_constant)``
+
+    Channels with the same settings of a stage are filtered together, so
+    a sample costs a few array operations per stage, whatever the number
+    of channels, and all state is preallocated. A channel starts out, and
+    restarts after a NaN value (a failed read), with its filters filled
+    with its next value, so they have no warm-up transient and never
+    hold NaN.
+
+        Parameters
+        ----------
+        filters : list of dict
+            filter settings of each channel, with the optional keys in
+            `FILTER_NAMES`; an empty dict for no filtering
+        sample_interval : float
+            time (sec) between samples
+
+        Attributes
+        ----------
+        enabled : bool
+            does any channel have a filter?
+
+        Raises
+        ------
+        ValueError
+            If a setting is unknown or out of range.
+    """
+
+    def __init__(self, filters, sample_interval):
+        self.num_channels = len(filters)
+        channels_by_setting = {name: dict() for name in FILTER_NAMES}
+        for channel, settings in enumerate(filters):
+            for name, value in settings.items():
+                if name not in channels_by_setting:
+                    raise ValueError(
+                        f"Unknown filter setting {name!r} for channel {channel}; "
+                        f"must be one of {FILTER_NAMES}"
+                    )
+                kind = "number" if name == "time_constant" else "integer"
+                if value <= 0 or (kind == "integer" and value != int(value)):
+                    raise ValueError(
+                        f"Channel {channel} {name}={value} must be a positive {kind}"
+                    )
+                channels_by_setting[name].setdefault(value, []).append(channel)
+
+        self.stages = []
+        for length, channels in channels_by_setting["median_length"].items():
+            if length > 1:
+                self.stages.append(_MedianStage(channels, int(length)))
+        for length, channels in channels_by_setting["average_length"].items():
+            if length > 1:
+                self.stages.append(_AverageStage(channels, int(length)))
+        for time_constant, channels in channels_by_setting["time_constant"].items():
+            self.stages.append(_IirStage(channels, time_constant))
+        self.enabled = len(self.stages) > 0
+        self.set_sample_interval(sample_interval)
+
+    def set_sample_interval(self, sample_interval):
+        """Change the time (sec) between samples, which sets the response
+        of the low-pass filters; the window lengths are in samples.
+        """
+        if sample_interval <= 0:
+            raise ValueError(f"sample_interval={sample_interval} must be > 0")
+        for stage in self.stages:
+            if isinstance(stage, _IirStage):
+                stage.alpha = 1 - math.exp(-sample_interval / stage.time_constant)
+
+    def process(self, values):
+        """Filter samples in place, in order.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            one sample of each channel, shape (num_channels,), or
+            consecutive samples, shape (n, num_channels), in
+            engineering units
+
+        Returns
+        -------
+        values : numpy.ndarray
+            the same array, filtered
+        """
+        if values.ndim == 1:
+            for stage in self.stages:
+                stage.process(values)
+        else:
+            for sample in values:
+                for stage in self.stages:
+                    stage.process(sample)
+        return values
+
+    def reset(self):
+        """Restart every channel's filters from its next value."""
+        for stage in self.stages:
+            stage.reset()
@@ -0,0 +1,116 @@
+__all__ = ["SampleHistory"]
+
+import numpy as np
+
+
+class SampleHistory:
+    """
+    Preallocated ring buffer of timestamped samples of all channels.
+
+    Every sample is written twice, at ``i`` and ``i + capacity`` of arrays
+    twice the capacity long, so the most recent samples always form one
+    contiguous slice. Queries therefore return read-only views into the
+    buffer, never copies, and appending never allocates. A view is only
+    valid until the next append, which may overwrite the samples it
+    shows; copy it to keep it.
+
+        Parameters
+        ----------
+        capacity : int
+            maximum number of samples held
+        num_channels : int
+            number of values in each sample
+    """
+
+    def __init__(self, capacity, num_channels):
+        if capacity < 1:
+            raise ValueError(f"capacity={capacity} must be >= 1")
+        self.capacity = capacity
+        self.num_channels = num_channels
+        self._timestamps = np.full(2 * capacity, np.nan)
+        self._samples = np.full((2 * capacity, num_channels), np.nan)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp, sample):
+        """Append one sample, overwriting the oldest if the buffer is full.
+
+        Parameters
+        ----------
+        timestamp : float
+            time of the sample; timestamps must not decrease
+        sample : array_like
+            value of each channel
+        """
+        mirror = self._head + self.capacity
+        self._timestamps[self._head] = timestamp
+        self._timestamps[mirror] = timestamp
+        self._samples[self._head] = sample
+        self._samples[mirror] = sample
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def last(self, num_samples):
+        """Get the most recent samples.
+
+        Parameters
+        ----------
+        num_samples : int
+            maximum number of samples to return
+
+        Returns
+        -------
+        timestamps : numpy.ndarray
+            read-only view of the timestamps, oldest first
+        samples : numpy.ndarray
+            read-only view of the samples, shape (n, num_channels)
+
+        Notes
+        -----
+        The views are valid until the next `append`; copy them to keep
+        them.
+        """
+        num_samples = max(0, min(num_samples, self._count))
+        end = self._head + self.capacity
+        return self._view(end - num_samples, end)
+
+    def since(self, timestamp):
+        """Get the samples taken at or after a given time.
+
+        Parameters
+        ----------
+        timestamp : float
+            earliest time of the samples to return
+
+        Returns
+        -------
+        timestamps : numpy.ndarray
+            read-only view of the timestamps, oldest first
+        samples : numpy.ndarray
+            read-only view of the samples, shape (n, num_channels)
+
+        Notes
+        -----
+        The views are valid until the next `append`; copy them to keep
+        them.
+        """
+        end = self._head + self.capacity
+        start = end - self._count
+        start += int(np.searchsorted(self._timestamps[start:end], timestamp))
+        return self._view(start, end)
+
+    def clear(self):
+        """Discard all samples."""
+        self._head = 0
+        self._count = 0
+
+    def _view(self, start, end):
+        timestamps = self._timestamps[start:end]
+        samples = self._samples[start:end]
+        timestamps.flags.writeable = False
+        samples.flags.writeable = False
+        return timestamps, samples
@@ -0,0 +1,256 @@
+__all__ = ["LatencyHistogram", "StageLatencies", "RoundTripEstimator"]
+
+import math
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations with logarithmically spaced bins.
+
+    Recording a duration is a single bin increment, so it is cheap enough
+    to do several times per sample at hundreds of Hz. Percentiles are
+    estimated to within one bin (a relative error of about
+    ``10 ** (1 / bins_per_decade) - 1``); the maximum is exact.
+
+        Parameters
+        ----------
+        min_duration : float
+            upper edge (sec) of the first bin; shorter durations are
+            counted in it
+        max_duration : float
+            lower edge (sec) of the last bin; longer durations are
+            counted in it
+        bins_per_decade : int
+            number of bins per factor of 10 of duration
+
+        Attributes
+        ----------
+        count : int
+            number of durations recorded
+        max : float
+            longest duration recorded (sec); 0 if none
+    """
+
+    def __init__(self, min_duration=1e-6, max_duration=100, bins_per_decade=50):
+        if not 0 < min_duration < max_duration:
+            raise ValueError(
+                f"Need 0 < min_duration={min_duration} < max_duration={max_duration}"
+            )
+        self.min_duration = min_duration
+        self.bins_per_decade = bins_per_decade
+        self._scale = bins_per_decade / math.log(10)
+        self._offset = math.log(min_duration)
+        self.num_bins = (
+            math.ceil(math.log10(max_duration / min_duration) * bins_per_decade) + 2
+        )
+        self.reset()
+
+    def reset(self):
+        """Forget all recorded durations."""
+        self.counts = [0] * self.num_bins
+        self.count = 0
+        self.max = 0
+
+    def record(self, duration):
+        """Record one duration (sec)."""
+        if duration > self.min_duration:
+            index = int((math.log(duration) - self._offset) * self._scale) + 1
+            if index >= self.num_bins:
+                index = self.num_bins - 1
+        else:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+        if duration > self.max:
+            self.max = duration
+
+    def percentile(self, percent):
+        """Estimate a percentile of the recorded durations.
+
+        Parameters
+        ----------
+        percent : float
+            percentile, 0-100
+
+        Returns
+        -------
+        duration : float
+            upper edge (sec) of the bin containing the percentile, but no
+            more than `max`; NaN if nothing has been recorded
+        """
+        if self.count == 0:
+            return math.nan
+        target = self.count * percent / 100
+        total = 0
+        for index, count in enumerate(self.counts):
+            total += count
+            if total >= target and total > 0:
+                break
+        if index == self.num_bins - 1:
+            # the last bin has no upper edge
+            return self.max
+        upper_edge = self.min_duration * 10 ** (index / self.bins_per_decade)
+        return min(upper_edge, self.max)
+
+    def summary(self):
+        """Return a dict of ``count``, ``p50``, ``p99`` and ``max`` (sec)."""
+        return dict(
+            count=self.count,
+            p50=self.percentile(50),
+            p99=self.percentile(99),
+            max=self.max if self.count > 0 else math.nan,
+        )
+
+
+class StageLatencies:
+    """
+    Rolling latency histograms for the named stages of a loop.
+
+    Time each stage with `time.perf_counter` (or any monotonic clock) and
+    `record` the elapsed time; `report` summarizes each stage since the
+    previous report.
+
+        Parameters
+        ----------
+        stages : list of str
+            names of the stages, in the order to report them
+        enabled : bool
+            if false, `record` does nothing
+
+        Attributes
+        ----------
+        histograms : dict
+            stage name: `LatencyHistogram`
+        last_report : dict
+            the most recent value returned by `report`
+    """
+
+    def __init__(self, stages, enabled=True):
+        self.enabled = enabled
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+        self.last_report = dict()
+
+    def record(self, stage, duration):
+        """Record the duration (sec) of one pass through a stage."""
+        if self.enabled:
+            self.histograms[stage].record(duration)
+
+    def summary(self):
+        """Summarize each stage since the last report, without resetting.
+
+        Returns
+        -------
+        summary : dict
+            stage name: `LatencyHistogram.summary` dict
+        """
+        return {stage: hist.summary() for stage, hist in self.histograms.items()}
+
+    def report(self):
+        """Summarize each stage and restart the histograms.
+
+        Returns
+        -------
+        summary : dict
+            stage name: `LatencyHistogram.summary` dict
+        """
+        self.last_report = self.summary()
+        for histogram in self.histograms.values():
+            histogram.reset()
+        return self.last_report
+
+    def format(self, summary=None):
+        """Format a summary as one line of text, in milliseconds.
+
+        Parameters
+        ----------
+        summary : dict, optional
+            value from `summary` or `report`; defaults to `last_report`
+        """
+        if summary is None:
+            summary = self.last_report
+        return "; ".join(
+            f"{stage} p50={values['p50'] * 1000:.3f} "
+            f"p99={values['p99'] * 1000:.3f} "
+            f"max={values['max'] * 1000:.3f} ms (n={values['count']})"
+            for stage, values in summary.items()
+        )
+
+
+class RoundTripEstimator:
+    """
+    Smoothed estimate of the round-trip time of a link, as TCP keeps
+    for its retransmission timer (RFC 6298).
+
+    Each `update` moves the smoothed round trip ``srtt`` 1/8 of the way
+    toward the new round trip, and the variation ``rttvar`` 1/4 of the
+    way toward the new deviation from ``srtt``, so a single slow reply
+    barely moves the estimate while a lasting change is tracked within
+    a few dozen samples.
+
+        Attributes
+        ----------
+        count : int
+            number of round trips recorded
+        srtt : float
+            smoothed round-trip time (sec); NaN if none recorded
+        rttvar : float
+            smoothed mean deviation of the round-trip time (sec)
+        min : float
+            shortest round trip recorded (sec), the best estimate of the
+            time spent on the wire and in the device; NaN if none
+        last : float
+            the most recent round trip (sec); NaN if none
+    """
+
+    alpha = 1 / 8
+    beta = 1 / 4
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget all recorded round trips."""
+        self.count = 0
+        self.srtt = math.nan
+        self.rttvar = math.nan
+        self.min = math.nan
+        self.last = math.nan
+
+    def update(self, round_trip):
+        """Record one round trip (sec)."""
+        if self.count == 0:
+            self.srtt = round_trip
+            self.rttvar = round_trip / 2
+            self.min = round_trip
+        else:
+            self.rttvar += self.beta * (abs(self.srtt - round_trip) - self.rttvar)
+            self.srtt += self.alpha * (round_trip - self.srtt)
+            if round_trip < self.min:
+                self.min = round_trip
+        self.last = round_trip
+        self.count += 1
+
+    @property
+    def latency(self):
+        """Estimated one-way latency (sec) of the link: half of `srtt`."""
+        return self.srtt / 2
+
+    @property
+    def timeout(self):
+        """A reply later than this (sec) is unusually late:
+        ``srtt + 4 * rttvar``.
+        """
+        return self.srtt + 4 * self.rttvar
+
+    def summary(self):
+        """Return a dict of ``count``, ``srtt``, ``rttvar``, ``min``,
+        ``latency`` and ``timeout`` (sec).
+        """
+        return dict(
+            count=self.count,
+            srtt=self.srtt,
+            rttvar=self.rttvar,
+            min=self.min,
+            latency=self.latency,
+            timeout=self.timeout,
+        )
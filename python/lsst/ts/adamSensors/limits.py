@@ -0,0 +1,230 @@
+__all__ = ["SEVERITY_NAMES", "LIMIT_NAMES", "LimitChecker"]
+
+import numpy as np
+
+# Name of each severity level of a channel, by value
+SEVERITY_NAMES = ("normal", "warning", "alarm")
+
+# Returned by LimitChecker.check if no severity changed
+_NO_CHANNELS = np.array([], dtype=int)
+_NO_CHANNELS.flags.writeable = False
+
+# Settings of the limits of one channel; each is optional
+LIMIT_NAMES = (
+    "warning_low",
+    "warning_high",
+    "alarm_low",
+    "alarm_high",
+    "warning_rate",
+    "alarm_rate",
+    "hysteresis",
+)
+
+
+class LimitChecker:
+    """
+    Checks every sample of all channels against warning and alarm limits.
+
+    Each channel has a severity: 0 (normal), 1 (warning) or 2 (alarm).
+    A channel goes to warning if its value is below ``warning_low`` or
+    above ``warning_high``, or it changes faster than ``warning_rate``
+    (in either direction), and likewise to alarm. It only comes back
+    down once its value is inside the limits by ``hysteresis``, so a
+    noisy value near a limit does not flap. A NaN value (a channel that
+    could not be read) leaves the severity unchanged.
+
+    The rate of change is measured over ``rate_interval``, rather than
+    between consecutive samples, to not be dominated by sample noise;
+    a rate limit is therefore checked once per interval and its
+    severity held until the next check.
+
+    A sample is checked with a few whole-array comparisons, whatever
+    the number of channels, and only channels whose severity changed
+    are returned, so checking is cheap enough for every sample at
+    hundreds of Hz. In the usual case, every channel normal and inside
+    its limits, a single range check suffices.
+
+        Parameters
+        ----------
+        limits : list of dict
+            limits of each channel, with the optional keys in
+            `LIMIT_NAMES`; an empty dict for no limits
+        rate_interval : float
+            time (sec) over which rates of change are measured
+
+        Attributes
+        ----------
+        severity : numpy.ndarray
+            severity of each channel, as int
+        rate : numpy.ndarray
+            most recently measured rate of change of each channel
+            (units/sec); NaN if not yet measured
+        num_changes : int
+            number of severity changes of any channel
+
+        Raises
+        ------
+        ValueError
+            If a limit is unknown, or a low limit is above a high limit.
+    """
+
+    def __init__(self, limits, rate_interval=1):
+        if rate_interval <= 0:
+            raise ValueError(f"rate_interval={rate_interval} must be > 0")
+        num_channels = len(limits)
+        columns = {name: np.full(num_channels, np.nan) for name in LIMIT_NAMES}
+        for channel, channel_limits in enumerate(limits):
+            for name, value in channel_limits.items():
+                if name not in columns:
+                    raise ValueError(
+                        f"Unknown limit {name!r} for channel {channel}; "
+                        f"must be one of {LIMIT_NAMES}"
+                    )
+                columns[name][channel] = value
+        hysteresis = np.nan_to_num(columns["hysteresis"])
+        if np.any(hysteresis < 0):
+            raise ValueError("hysteresis must be >= 0")
+        # limits as (2, num_channels) arrays of (warning, alarm), with
+        # missing limits at infinity so they never trip
+        self.low = np.nan_to_num(
+            np.array([columns["warning_low"], columns["alarm_low"]]), nan=-np.inf
+        )
+        self.high = np.nan_to_num(
+            np.array([columns["warning_high"], columns["alarm_high"]]), nan=np.inf
+        )
+        self.max_rate = np.nan_to_num(
+            np.array([columns["warning_rate"], columns["alarm_rate"]]), nan=np.inf
+        )
+        bad_channels = np.flatnonzero(np.any(self.low > self.high, axis=0))
+        if len(bad_channels) > 0:
+            raise ValueError(
+                f"Channels {bad_channels.tolist()} have a low limit above a "
+                "high limit"
+            )
+        self.low_reset = self.low + hysteresis
+        self.high_reset = self.high - hysteresis
+        # the range of each channel within all of its limits
+        self.normal_low = np.max(self.low, axis=0)
+        self.normal_high = np.min(self.high, axis=0)
+        self.checks_rate = bool(np.any(np.isfinite(self.max_rate)))
+        self.rate_interval = rate_interval
+
+        self.severity = np.zeros(num_channels, dtype=int)
+        self.rate = np.full(num_channels, np.nan)
+        self.num_changes = 0
+        self._rate_severity = np.zeros(num_channels, dtype=int)
+        self._rate_start_values = np.full(num_channels, np.nan)
+        self._rate_start_time = None
+
+    @property
+    def num_channels(self):
+        """Number of channels."""
+        return len(self.severity)
+
+    @property
+    def enabled(self):
+        """Does any channel have a limit?"""
+        has_value_limits = np.isfinite(self.low) | np.isfinite(self.high)
+        return bool(np.any(has_value_limits)) or self.checks_rate
+
+    def check(self, values, timestamp):
+        """Check one sample.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            value of each channel, in engineering units
+        timestamp : float
+            time of the sample (sec)
+
+        Returns
+        -------
+        changed : numpy.ndarray
+            indices of the channels whose `severity` changed
+        """
+        rate_measured = self.checks_rate and self._check_rate(values, timestamp)
+        if not rate_measured and not self.severity.any():
+            with np.errstate(invalid="ignore"):
+                inside = (values >= self.normal_low) & (values <= self.normal_high)
+            if inside.all():
+                return _NO_CHANNELS
+
+        # the severity of a value is the highest severity of the limits
+        # it is outside of; a channel already at a severity stays there
+        # until the value is inside the limits by the hysteresis
+        with np.errstate(invalid="ignore"):
+            outside = (values < self.low) | (values > self.high)
+            outside_reset = (values < self.low_reset) | (values > self.high_reset)
+        severity = np.maximum(
+            self._severity_of(outside),
+            np.minimum(self.severity, self._severity_of(outside_reset)),
+        )
+        if self.checks_rate:
+            severity = np.maximum(severity, self._rate_severity)
+        severity = np.where(np.isnan(values), self.severity, severity)
+        changed = np.flatnonzero(severity != self.severity)
+        if len(changed) > 0:
+            self.severity = severity
+            self.num_changes += len(changed)
+        return changed
+
+    def _check_rate(self, values, timestamp):
+        """Measure the rates of change if due, and return whether they
+        were.
+        """
+        if self._rate_start_time is None:
+            self._rate_start_time = timestamp
+            self._rate_start_values = np.array(values, dtype=float)
+            return False
+        duration = timestamp - self._rate_start_time
+        if duration < self.rate_interval:
+            return False
+        self.rate = (values - self._rate_start_values) / duration
+        with np.errstate(invalid="ignore"):
+            exceeded = np.abs(self.rate) > self.max_rate
+        # a rate that could not be measured keeps its last severity
+        self._rate_severity = np.where(
+            np.isnan(self.rate), self._rate_severity, self._severity_of(exceeded)
+        )
+        self._rate_start_time = timestamp
+        self._rate_start_values = np.array(values, dtype=float)
+        return True
+
+    @staticmethod
+    def _severity_of(exceeded):
+        """Return the severity of each channel given which of its
+        (warning, alarm) limits are exceeded, as a (2, num_channels)
+        bool array.
+        """
+        return np.maximum(exceeded[0], 2 * exceeded[1])
+
+    def describe(self, channel, value):
+        """Describe the severity of a channel and why, for a log message.
+
+        Parameters
+        ----------
+        channel : int
+            index of the channel
+        value : float
+            its value
+        """
+        severity = self.severity[channel]
+        if severity == 0:
+            return f"normal: value={value:g}"
+        level = severity - 1
+        name = SEVERITY_NAMES[severity]
+        reasons = []
+        if value < self.low_reset[level, channel]:
+            reasons.append(
+                f"value={value:g} below {name}_low={self.low[level, channel]:g}"
+            )
+        if value > self.high_reset[level, channel]:
+            reasons.append(
+                f"value={value:g} above {name}_high={self.high[level, channel]:g}"
+            )
+        if self._rate_severity[channel] >= severity:
+            reasons.append(
+                f"rate={self.rate[channel]:g}/s beyond "
+                f"{name}_rate={self.max_rate[level, channel]:g}"
+            )
+        return f"{name}: {'; '.join(reasons)}"
@@ -1,13 +1,88 @@
+__all__ = ["MockModbusClient"]
+
 from time import time
 from math import sin
 from collections import namedtuple
+import asyncio
+import random
+
+import numpy as np
+
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+from pymodbus.pdu import ExceptionResponse
+
+Fake_readout = namedtuple("Fake_readout", ["registers"])
+Fake_bits = namedtuple("Fake_bits", ["bits"])
 
 
 class MockModbusClient:
-    def __init__(self, client, port):
+    """Stand-in for the pymodbus client and protocol of an ADAM 6024.
+
+    The attributes below include fault injection knobs, for testing how
+    the model copes with a bad link, and register tables that may be
+    written to simulate other data; input registers 0-5 are overwritten
+    by the simulated analog inputs on each read.
+
+    Attributes
+    ----------
+    latency : float
+        simulated round trip time (sec) of each read
+    drop_probability : float
+        probability that a read loses the connection
+    garbage_probability : float
+        probability that a read returns a garbled response
+    refuse_connections : bool
+        if True, connection attempts fail
+    num_connect_attempts : int
+        number of connection attempts
+    num_connects : int
+        number of successful connection attempts
+    num_requests : int
+        number of read requests received
+    input_registers : list of int
+        input registers, also returned for holding register reads
+    coils : list of bool
+        coils (digital outputs)
+    discrete_inputs : list of bool
+        discrete inputs (digital inputs)
+    replay_source : ReplaySource or None
+        if set, the analog inputs play back this recording rather than
+        the built-in waveforms
+    """
+
+    num_table_entries = 256
+
+    def __init__(self, client, port, replay_source=None):
         self.host = client
         self.port = port
         self.protocol = self
+        self.connected = False
+        self.latency = 0
+        self.drop_probability = 0
+        self.garbage_probability = 0
+        self.refuse_connections = False
+        self.num_connect_attempts = 0
+        self.num_connects = 0
+        self.num_requests = 0
+        self.input_registers = [0] * self.num_table_entries
+        self.coils = [False] * self.num_table_entries
+        self.discrete_inputs = [False] * self.num_table_entries
+        self.replay_source = replay_source
+
+    async def connect(self):
+        """Pretend to open the connection to the ADAM device.
+
+        Like the real client, failure to connect is not raised; it
+        leaves ``connected`` false.
+        """
+        self.num_connect_attempts += 1
+        if not self.refuse_connections:
+            self.connected = True
+            self.num_connects += 1
+
+    def drop_connection(self):
+        """Simulate loss of the network connection."""
+        self.connected = False
 
     async def read_input_registers(self, address, count=1, unit=1):
         """
@@ -21,20 +96,61 @@ class MockModbusClient:
         Parameters:
         -----------
         address: starting point of the range we want to read.
-                 for the ADAM 6024, always zero.
         count:   number of sequential values to read from
                  the adam device.
         """
+        return await self._read(4, self.input_registers, address, count)
+
+    async def read_holding_registers(self, address, count=1, unit=1):
+        """Mock version of the pymodbus method; the ADAM 6024 returns
+        the same values as for input registers.
+        """
+        return await self._read(3, self.input_registers, address, count)
+
+    async def read_coils(self, address, count=1, unit=1):
+        """Mock version of the pymodbus method."""
+        return await self._read(1, self.coils, address, count)
+
+    async def read_discrete_inputs(self, address, count=1, unit=1):
+        """Mock version of the pymodbus method."""
+        return await self._read(2, self.discrete_inputs, address, count)
+
+    async def _read(self, function_code, table, address, count):
+        self.num_requests += 1
+        if not self.connected:
+            raise ConnectionException("Client is not connected")
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        if random.random() < self.drop_probability:
+            self.drop_connection()
+            raise ConnectionException("Connection lost during request")
+        if random.random() < self.garbage_probability:
+            # what pymodbus returns when it cannot decode a response
+            return ModbusIOException("Garbled response")
+        if count < 1 or address + count > len(table):
+            # illegal data address
+            return ExceptionResponse(function_code, 2)
 
-        Fake_readout = namedtuple("Fake_readout", ["registers"])
-        return Fake_readout(
-            registers=[self._sin(7), 0, 65535, 32767, 32768, self._sin(11)]
-        )
+        end = address + count
+        if table is self.input_registers:
+            if self.replay_source is None:
+                table[:6] = [self._sin(7), 0, 65535, 32767, 32768, self._sin(11)]
+            elif address < self.replay_source.num_channels:
+                # one recorded sample per read of the analog inputs
+                counts = self.replay_source.read()
+                if np.isnan(counts).any():
+                    # the device could not be read when this was recorded
+                    return ModbusIOException("Replayed failed read")
+                table[: len(counts)] = counts.astype(int).tolist()
+            return Fake_readout(registers=table[address:end])
+        # like pymodbus, pad bits to a multiple of 8
+        bits = table[address:end]
+        return Fake_bits(bits=bits + [False] * (-count % 8))
 
     def stop(self):
         """The real client has a stop method that gets called when
         we disconnect. This pretends to do that."""
-        pass
+        self.connected = False
 
     def _sin(self, period):
         """
@@ -1,116 +1,380 @@
-from pymodbus.client.asynchronous.tcp import AsyncModbusTCPClient as ModbusClient
-from pymodbus.exceptions import ConnectionException
+__all__ = ["AdamModel"]
+
+from pymodbus.exceptions import ConnectionException, ModbusException
+from pymodbus.pdu import ExceptionResponse
+from .instrumentation import RoundTripEstimator
 from .mockModbus import MockModbusClient
-from pymodbus.client.asynchronous import schedulers
-from threading import Thread
+from .readplan import ADAM6024_ANALOG_INPUTS, REGISTER_TABLES, plan_reads
+import numpy as np
 import logging
 import asyncio
+import random
+import time
 
 
 class AdamModel:
     """
     Class that reads sensor voltage(s) through an ADAM 6024 device
 
+    All Modbus I/O runs on the event loop of the caller; call `connect`
+    before reading and `close` when done. If the connection is lost (or
+    a request times out or returns garbage), the model closes the socket
+    and reconnects in the background with jittered exponential backoff;
+    reads fail fast with `ConnectionException` until it succeeds.
+
+    Each read fetches the analog inputs and any ``extra_ranges``; the
+    ranges are merged into as few Modbus requests as possible (see
+    `plan_reads`), which are all sent at once over the one connection,
+    so a read costs about one round trip however many ranges there are.
+
+    Each read is timestamped with the midpoint of the request and the
+    response, which is when the device most likely sampled its inputs,
+    to within half the round-trip time; the round trips feed
+    ``round_trip``, an estimate of the latency of the link.
+
         Parameters
         ----------
         ip : string
             the IP address of the ADAM 6024 controller
         port : int
             the port number for the ADAM 6024 controller
+        request_timeout : float
+            maximum time (sec) to wait for a connection or a response
+        reconnect_max_interval : float
+            maximum delay (sec) between reconnection attempts
+        extra_ranges : list of RegisterRange
+            register ranges to read in addition to the analog inputs,
+            e.g. `ADAM6024_DIAGNOSTIC_RANGES`
+        replay_source : ReplaySource, optional
+            in simulation mode, recorded data for the mock client to
+            play back as the analog inputs
+        clock : callable
+            returns the current time (sec) to timestamp reads with, e.g.
+            `lsst.ts.salobj.current_tai`; `time.time` by default
 
         Attributes
         ----------
         client : ModbusClient
-            the pymodbus object representing the ADAM 6024
+            the pymodbus object representing the ADAM 6024, or None
+            if closed
+        num_reconnects : int
+            number of times the connection was reestablished
+        read_plan : list of ReadRequest
+            the requests sent for each read
+        last_snapshot : dict
+            the most recent value returned by `read_snapshot`
+        last_read_time : float
+            acquisition time of ``last_snapshot``, from ``clock``; NaN if
+            nothing has been read
+        last_round_trip : float
+            round-trip time (sec) of the read of ``last_snapshot``
+        round_trip : RoundTripEstimator
+            smoothed round-trip time of the successful reads
     """
 
-    def __init__(self, ip, port, log=None, simulation_mode=False):
-        self.loop = asyncio.new_event_loop()
+    num_registers = 8
+    reconnect_min_interval = 0.5
+
+    def __init__(
+        self,
+        ip,
+        port,
+        log=None,
+        simulation_mode=False,
+        request_timeout=2,
+        reconnect_max_interval=30,
+        extra_ranges=(),
+        replay_source=None,
+        clock=time.time,
+    ):
         self.clientip = ip
         self.clientport = port
+        self.simulation_mode = simulation_mode
+        self.replay_source = replay_source
+        self.request_timeout = request_timeout
+        self.reconnect_max_interval = reconnect_max_interval
         self.client = None
+        self.num_reconnects = 0
+        self.reconnect_task = None
+        # set by `close`, so reads of a closed model do not reconnect it
+        self._closed = False
+        analog_inputs = ADAM6024_ANALOG_INPUTS._replace(count=self.num_registers)
+        self.read_plan = plan_reads([analog_inputs, *extra_ranges])
+        self.last_snapshot = dict()
+        self.clock = clock
+        self.last_read_time = np.nan
+        self.last_round_trip = np.nan
+        self.round_trip = RoundTripEstimator()
 
-        self.t = Thread(target=self._start_loop, args=[self.loop])
-        self.t.daemon = True
-        # Start the loop
-        self.t.start()
         if log is None:
             self.log = logging.getLogger(type(self).__name__)
         else:
             self.log = log.getChild(type(self).__name__)
-        if simulation_mode:
-            self.client = MockModbusClient(ip, port)
-        else:
-            try:
-                loop, self.client = ModbusClient(
-                    schedulers.ASYNC_IO, ip, port, loop=self.loop
-                )
-            except AttributeError:
-                raise ConnectionException(
-                    "Unable to connect to modbus device at "
-                    f"{self.clientip}:{self.clientport}."
-                )
 
         self.range_size = 20
         self.range_start = -10  # zero point offset for the ADAM device
+        self.volts_per_count = self.range_size / 65535
 
-    async def disconnect(self):
-        self.client.stop()
+    @property
+    def connected(self):
+        """Is the client connected to the ADAM device?"""
+        return self.client is not None and self.client.connected
 
-    async def read_voltage(self):
-        """reads the voltage off of ADAM-6024's inputs for channels 0-5.
+    @property
+    def reconnecting(self):
+        """Is a background reconnection in progress?"""
+        return self.reconnect_task is not None and not self.reconnect_task.done()
+
+    async def connect(self):
+        """Connect to the ADAM device using the running event loop.
+
+        Raises
+        ------
+        ConnectionException
+            If the connection cannot be established.
+        """
+        self._closed = False
+        if self.connected:
+            return
+        if self.client is None:
+            if self.simulation_mode:
+                self.client = MockModbusClient(
+                    self.clientip, self.clientport, replay_source=self.replay_source
+                )
+            else:
+                # imported here, as it is slow to import and only needed
+                # to talk to real devices
+                from pymodbus.client.asynchronous.async_io import (
+                    AsyncioModbusTcpClient,
+                )
+
+                self.client = AsyncioModbusTcpClient(
+                    self.clientip, self.clientport, loop=asyncio.get_running_loop()
+                )
+        # AsyncioModbusTcpClient.connect logs and swallows connection
+        # errors, so check the connected flag afterwards.
+        try:
+            await asyncio.wait_for(self.client.connect(), timeout=self.request_timeout)
+        except asyncio.TimeoutError:
+            pass
+        if not self.client.connected:
+            raise ConnectionException(
+                "Unable to connect to modbus device at "
+                f"{self.clientip}:{self.clientport}."
+            )
+
+    def start_reconnect(self):
+        """Start reconnecting in the background, if not already doing so
+        and not closed.
+
+        This also retries a first `connect` that failed, whether or not
+        the client could be made.
+        """
+        if not self._closed and not self.reconnecting:
+            self.reconnect_task = asyncio.create_task(self._reconnect_loop())
+
+    async def close(self):
+        """Stop reconnecting and close the connection, if open."""
+        self._closed = True
+        if self.reconnect_task is not None:
+            self.reconnect_task.cancel()
+            try:
+                await self.reconnect_task
+            except asyncio.CancelledError:
+                pass
+        if self.client is not None:
+            self.client.stop()
+            self.client = None
+
+    async def read_counts(self, timestamped=False):
+        """reads the raw register counts off of ADAM-6024's inputs.
 
         Parameters
         ----------
-        None
+        timestamped : bool
+            if true, also return the acquisition and round-trip times
 
         Returns
         -------
-        volts : List of floats
-            the voltages on the ADAM's input channels
+        counts : numpy.ndarray
+            the 16-bit register values of the ADAM's input channels,
+            as floats
+        read_time : float
+            if ``timestamped``: time of acquisition, from ``clock``
+        round_trip : float
+            if ``timestamped``: round-trip time (sec) of the read
+
+        Raises
+        ------
+        ConnectionException
+            If not connected, or if the request fails, times out or
+            returns garbage; in the latter cases a background
+            reconnection is started.
+        """
+        counts = (await self.read_snapshot())["analog_inputs"]
+        if timestamped:
+            return counts, self.last_read_time, self.last_round_trip
+        return counts
+
+    async def read_snapshot(self):
+        """Read the analog inputs and all extra register ranges.
+
+        Returns
+        -------
+        snapshot : dict
+            range name: values; register values are a float
+            `numpy.ndarray` and bits a bool `numpy.ndarray`. The analog
+            inputs are named "analog_inputs".
+
+        Raises
+        ------
+        ConnectionException
+            If not connected, or if any request fails, times out or
+            returns garbage; in the latter cases a background
+            reconnection is started.
+        ModbusException
+            If the device returns an exception response, e.g. because
+            a range does not exist.
         """
+        if not self.connected:
+            # the socket may have died since the last read
+            self.start_reconnect()
+            raise ConnectionException(
+                f"Not connected to modbus device at "
+                f"{self.clientip}:{self.clientport}."
+            )
+        protocol = self.client.protocol
+        t0 = time.perf_counter()
         try:
-            readout = await self.client.protocol.read_input_registers(0, 8, unit=1)
-            voltages = [self.counts_to_volts(r) for r in readout.registers]
-            return voltages
-        except AttributeError as e:
-            self.log.debug(e)
-            # read_input_registers() *returns* (not raises) a
+            readouts = await asyncio.wait_for(
+                asyncio.gather(
+                    *[
+                        getattr(protocol, REGISTER_TABLES[request.table][0])(
+                            request.address, request.count, unit=request.unit
+                        )
+                        for request in self.read_plan
+                    ]
+                ),
+                timeout=self.request_timeout,
+            )
+        except asyncio.TimeoutError:
+            self._connection_lost("request timed out")
+        except ConnectionException as e:
+            self._connection_lost(e)
+        # the round trip is timed with the monotonic clock, which
+        # ``clock`` (e.g. TAI) may not be
+        round_trip = time.perf_counter() - t0
+        read_time = self.clock() - round_trip / 2
+
+        snapshot = dict()
+        for request, readout in zip(self.read_plan, readouts):
+            field = REGISTER_TABLES[request.table][1]
+            # read_input_registers() etc. *return* (not raise) a
             # ModbusIOException in the event of loss of ADAM network
-            # connectivity, which causes an AttributeError when we try
-            # to access the registers field. But the whole thing is
-            # really a connectivity problem, so we re-raise it as a
-            # ConnectionException, which we know how to handle. Weird
-            # exception handling is a known issue with pymodbus so it
-            # may see a fix in a future version, which may require
+            # connectivity, which has no registers field. But the whole
+            # thing is really a connectivity problem, so we treat it as
+            # one. Weird exception handling is a known issue with pymodbus
+            # so it may see a fix in a future version, which may require
             # minor code changes on our part.
             # https://github.com/riptideio/pymodbus/issues/298
-            raise ConnectionException(
-                f"Unable to reach modbus device at "
-                f"{self.clientip}:{self.clientport}."
+            if isinstance(readout, ExceptionResponse):
+                # the device understood the request, but refused it
+                raise ModbusException(
+                    f"Modbus device at {self.clientip}:{self.clientport} "
+                    f"refused to read {request}: {readout}"
+                )
+            values = getattr(readout, field, None)
+            if values is None:
+                self.log.debug(readout)
+                self._connection_lost(f"no {field} in response")
+            # bits are padded to a multiple of 8
+            if len(values) < request.count or (
+                field == "registers" and len(values) != request.count
+            ):
+                self._connection_lost(
+                    f"got {len(values)} {field} instead of {request.count}"
+                )
+            dtype = float if field == "registers" else bool
+            for name, offset, count in request.members:
+                end = offset + count
+                snapshot[name] = np.asarray(values[offset:end], dtype=dtype)
+        self.last_snapshot = snapshot
+        self.last_read_time = read_time
+        self.last_round_trip = round_trip
+        self.round_trip.update(round_trip)
+        return snapshot
+
+    def _connection_lost(self, reason):
+        """Close the connection, start reconnecting and raise
+        ConnectionException.
+        """
+        self.log.warning(
+            f"Lost connection to modbus device at "
+            f"{self.clientip}:{self.clientport}: {reason}; reconnecting."
+        )
+        self.client.stop()
+        self.start_reconnect()
+        raise ConnectionException(
+            f"Unable to reach modbus device at "
+            f"{self.clientip}:{self.clientport}: {reason}."
+        )
+
+    async def _reconnect_loop(self):
+        """Try to reconnect, with jittered exponential backoff, until
+        connected.
+        """
+        interval = self.reconnect_min_interval
+        while True:
+            # "equal jitter": half the interval, plus up to the other half
+            await asyncio.sleep(interval / 2 + random.uniform(0, interval / 2))
+            try:
+                await self.connect()
+            except Exception as e:
+                # including errors making the client, which connect
+                # retries
+                self.log.debug(f"Reconnection failed: {e!r}")
+                interval = min(interval * 2, self.reconnect_max_interval)
+                continue
+            self.num_reconnects += 1
+            self.log.info(
+                f"Reconnected to modbus device at {self.clientip}:{self.clientport}."
             )
+            return
+
+    async def read_voltage(self, timestamped=False):
+        """reads the voltage off of ADAM-6024's inputs for channels 0-5.
+
+        Parameters
+        ----------
+        timestamped : bool
+            if true, also return the acquisition and round-trip times
+
+        Returns
+        -------
+        volts : numpy.ndarray
+            the voltages on the ADAM's input channels
+        read_time : float
+            if ``timestamped``: time of acquisition, from ``clock``
+        round_trip : float
+            if ``timestamped``: round-trip time (sec) of the read
+        """
+        counts = await self.read_counts()
+        volts = self.counts_to_volts(counts)
+        if timestamped:
+            return volts, self.last_read_time, self.last_round_trip
+        return volts
 
     def counts_to_volts(self, counts):
         """converts discrete ADAM-6024 input readings into volts
 
         Parameters
         ----------
-        counts : integer
-            16-bit integer received from ADAM device
+        counts : integer or numpy.ndarray
+            16-bit integer(s) received from ADAM device
 
         Returns
         -------
-        volts : float
+        volts : float or numpy.ndarray
             counts converted into voltage number
         """
-        ctv = self.range_size / 65535
-        return counts * ctv + self.range_start
-
-    def _start_loop(self, loop):
-        """
-        Start Loop
-        :param loop:
-        :return:
-        """
-        asyncio.set_event_loop(loop)
-        loop.run_forever()
+        return counts * self.volts_per_count + self.range_start
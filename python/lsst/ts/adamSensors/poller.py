@@ -0,0 +1,112 @@
+__all__ = ["AdamPoller"]
+
+import asyncio
+import logging
+
+from pymodbus.exceptions import ConnectionException
+
+
+class AdamPoller:
+    """
+    Reads several ADAM controllers concurrently, with bounded parallelism
+    and per-device failure isolation. Each model applies its own request
+    timeout and reconnects on its own, so an unreachable device fails
+    fast without stalling the others.
+
+        Parameters
+        ----------
+        models : dict of str: AdamModel
+            the ADAM models to poll, keyed by device name
+        max_concurrency : int
+            maximum number of devices read at the same time
+        log : logging.Logger, optional
+            parent logger
+
+        Attributes
+        ----------
+        models : dict of str: AdamModel
+            the ADAM models, keyed by device name
+        failures : dict of str: int
+            number of failed reads (or connection attempts) per device
+    """
+
+    def __init__(self, models, max_concurrency=8, log=None):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency={max_concurrency} must be >= 1")
+        self.models = dict(models)
+        self.max_concurrency = max_concurrency
+        self.failures = {name: 0 for name in self.models}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        if log is None:
+            self.log = logging.getLogger(type(self).__name__)
+        else:
+            self.log = log.getChild(type(self).__name__)
+
+    async def connect(self):
+        """Connect to all devices concurrently.
+
+        A device that cannot be reached does not prevent the others from
+        connecting; it keeps trying to connect in the background, and its
+        reads fail until it succeeds.
+
+        Returns
+        -------
+        errors : dict of str: Exception
+            the connection error for each device that could not be reached
+
+        Raises
+        ------
+        ConnectionException
+            If no device could be reached.
+        """
+        results = await self._gather(self._connect_one)
+        errors = {
+            name: result
+            for name, result in results.items()
+            if isinstance(result, Exception)
+        }
+        for name, error in errors.items():
+            self.failures[name] += 1
+            self.log.warning(f"Could not connect to device {name}: {error}")
+        if errors and len(errors) == len(self.models):
+            raise ConnectionException("Unable to connect to any modbus device.")
+        return errors
+
+    async def close(self):
+        """Close the connections to all devices."""
+        await asyncio.gather(*[model.close() for model in self.models.values()])
+
+    async def poll(self):
+        """Read the raw register counts of all devices concurrently.
+
+        Returns
+        -------
+        results : dict of str: numpy.ndarray or Exception
+            the register counts read from each device, or the exception
+            raised while reading it
+        """
+        results = await self._gather(self._read_one)
+        for name, result in results.items():
+            if isinstance(result, Exception):
+                self.failures[name] += 1
+        return results
+
+    async def _gather(self, func):
+        names = list(self.models)
+        results = await asyncio.gather(
+            *[func(self.models[name]) for name in names], return_exceptions=True
+        )
+        return dict(zip(names, results))
+
+    async def _connect_one(self, model):
+        async with self._semaphore:
+            try:
+                await model.connect()
+            except Exception:
+                model.start_reconnect()
+                raise
+
+    async def _read_one(self, model):
+        async with self._semaphore:
+            return await model.read_counts()
@@ -0,0 +1,227 @@
+__all__ = ["SENSOR_TOPICS", "NUM_TELEMETRY_FIELDS", "ChangeFilter", "PublishPlan"]
+
+import numpy as np
+
+
+# Telemetry topic and field name format for each sensor type.
+# To support a new sensor type, add its topic here (and to the
+# sensor type enum in CONFIG_SCHEMA).
+SENSOR_TOPICS = {
+    "Pressure": ("tel_pressure", "pressure_ch{}"),
+    "Temperature": ("tel_temperature", "temp_ch{}"),
+}
+
+# Number of fields of each telemetry topic (e.g. pressure_ch0-5).
+NUM_TELEMETRY_FIELDS = 6
+
+
+class ChangeFilter:
+    """
+    Decides which channels have changed enough to be worth publishing.
+
+    A channel is due for publication if any of these hold:
+
+    * it has not been published yet, or its value became or stopped
+      being NaN
+    * its value differs from the last published value by at least the
+      larger of ``deadband`` and ``relative_deadband`` times the
+      magnitude of the last published value
+    * its value is on the other side of one of its ``thresholds`` than
+      the last published value
+    * it has not been published for its ``max_silence`` seconds
+
+    With the default deadbands of 0, every channel is always due.
+
+        Parameters
+        ----------
+        deadband : list of float
+            absolute deadband of each channel, in engineering units
+        relative_deadband : list of float
+            relative deadband of each channel, as a fraction of the
+            last published value
+        thresholds : list of list of float, optional
+            alarm or control thresholds of each channel
+        max_silence : float or list of float
+            maximum time (sec) between publications of each channel, or
+            of all channels
+
+        Attributes
+        ----------
+        last_values : numpy.ndarray
+            last published value of each channel (NaN if never published)
+        last_times : numpy.ndarray
+            time of the last publication of each channel
+    """
+
+    def __init__(self, deadband, relative_deadband, thresholds=None, max_silence=60):
+        self.deadband = np.asarray(deadband, dtype=float)
+        self.relative_deadband = np.asarray(relative_deadband, dtype=float)
+        num_channels = len(self.deadband)
+        if self.relative_deadband.shape != (num_channels,):
+            raise ValueError(
+                f"Need {num_channels} relative deadbands; got {relative_deadband}"
+            )
+        if np.any(self.deadband < 0) or np.any(self.relative_deadband < 0):
+            raise ValueError("Deadbands must be >= 0")
+        if thresholds is None:
+            thresholds = [[]] * num_channels
+        if len(thresholds) != num_channels:
+            raise ValueError(f"Need {num_channels} threshold lists; got {thresholds}")
+        # thresholds as (num_thresholds, num_channels), padded with NaN,
+        # which never compares as crossed
+        max_thresholds = max((len(values) for values in thresholds), default=0)
+        self.thresholds = np.full((max_thresholds, num_channels), np.nan)
+        for channel, values in enumerate(thresholds):
+            self.thresholds[: len(values), channel] = values
+        self.max_silence = np.asarray(max_silence, dtype=float)
+        if self.max_silence.ndim == 0:
+            self.max_silence = np.full(num_channels, self.max_silence)
+        if self.max_silence.shape != (num_channels,):
+            raise ValueError(
+                f"Need {num_channels} max_silence values; got {max_silence}"
+            )
+        self.last_values = np.full(num_channels, np.nan)
+        self.last_times = np.full(num_channels, -np.inf)
+
+    def due(self, values, time):
+        """Return a bool mask of the channels due for publication.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            new value of each channel
+        time : float
+            current time (sec), from a monotonic clock
+        """
+        last_values = self.last_values
+        change = np.abs(values - last_values)
+        limit = np.maximum(self.deadband, self.relative_deadband * np.abs(last_values))
+        due = np.isnan(values) != np.isnan(last_values)
+        with np.errstate(invalid="ignore"):
+            due |= ~(change < limit)
+            due &= ~(np.isnan(values) & np.isnan(last_values))
+            due |= time - self.last_times >= self.max_silence
+            if len(self.thresholds) > 0:
+                due |= np.any(
+                    (values >= self.thresholds) != (last_values >= self.thresholds),
+                    axis=0,
+                )
+        return due
+
+    def update(self, channels, values, time):
+        """Record that channels were published.
+
+        Parameters
+        ----------
+        channels : list of int
+            indices of the published channels
+        values : numpy.ndarray
+            value of every channel
+        time : float
+            time of publication (sec)
+        """
+        self.last_values[channels] = values[channels]
+        self.last_times[channels] = time
+
+
+class PublishPlan:
+    """
+    Precompiled map from converted channel values to telemetry topics.
+
+    The plan is built once, when the CSC is configured, so publishing a
+    cycle is one ``set_put`` call per topic, with no per-channel sensor
+    type comparisons.
+
+    Given a `ChangeFilter`, a topic is only published if at least one of
+    its channels is due; all of its fields are then updated.
+
+        Parameters
+        ----------
+        sensor_types : list of str
+            sensor type of each channel; channels of type "None" are
+            not published
+        topic_owner : object
+            object with the telemetry topics as attributes, usually the CSC
+        change_filter : ChangeFilter, optional
+            filter to suppress publication of unchanged values
+        fields : list of int, optional
+            index of the telemetry field of each channel; by default,
+            the channel index
+
+        Attributes
+        ----------
+        entries : list of tuple
+            (topic name, topic, ((field name, channel index), ...),
+            channel indices) for each topic to publish
+        num_sent : dict
+            topic name: number of samples published
+        num_suppressed : dict
+            topic name: number of samples not published because no
+            channel was due
+    """
+
+    def __init__(self, sensor_types, topic_owner, change_filter=None, fields=None):
+        if fields is None:
+            fields = range(len(sensor_types))
+        channels_by_topic = {}
+        for channel, (sensor_type, field_index) in enumerate(zip(sensor_types, fields)):
+            if sensor_type == "None":
+                continue
+            try:
+                topic_name, field_format = SENSOR_TOPICS[sensor_type]
+            except KeyError:
+                raise ValueError(
+                    f"Unknown sensor type {sensor_type!r} for channel {channel}"
+                )
+            if not 0 <= field_index < NUM_TELEMETRY_FIELDS:
+                raise ValueError(
+                    f"Channel {channel} field={field_index} must be in the "
+                    f"range [0, {NUM_TELEMETRY_FIELDS}) to publish it as "
+                    f"{sensor_type}; use type None to not publish it"
+                )
+            field = field_format.format(field_index)
+            topic_channels = channels_by_topic.setdefault(topic_name, [])
+            for other_channel, other_field in topic_channels:
+                if other_field == field:
+                    raise ValueError(
+                        f"Channels {other_channel} and {channel} both publish "
+                        f"{topic_name}.{field}"
+                    )
+            topic_channels.append((channel, field))
+
+        self.entries = [
+            (
+                topic_name,
+                getattr(topic_owner, topic_name),
+                tuple((field, channel) for channel, field in channels),
+                [channel for channel, field in channels],
+            )
+            for topic_name, channels in channels_by_topic.items()
+        ]
+        self.change_filter = change_filter
+        self.num_sent = {topic_name: 0 for topic_name in channels_by_topic}
+        self.num_suppressed = {topic_name: 0 for topic_name in channels_by_topic}
+
+    def publish(self, values, time=0):
+        """Set and publish each topic of the plan, or each topic with
+        a channel that is due if there is a change filter.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            converted value of each channel
+        time : float
+            current time (sec), from a monotonic clock; only used by the
+            change filter
+        """
+        if self.change_filter is not None:
+            due = self.change_filter.due(values, time).tolist()
+        value_list = values.tolist()
+        for topic_name, topic, fields, channels in self.entries:
+            if self.change_filter is not None:
+                if not any(due[channel] for channel in channels):
+                    self.num_suppressed[topic_name] += 1
+                    continue
+                self.change_filter.update(channels, values, time)
+            topic.set_put(**{field: value_list[channel] for field, channel in fields})
+            self.num_sent[topic_name] += 1
@@ -0,0 +1,121 @@
+__all__ = [
+    "RegisterRange",
+    "ReadRequest",
+    "REGISTER_TABLES",
+    "ADAM6024_ANALOG_INPUTS",
+    "ADAM6024_DIAGNOSTIC_RANGES",
+    "plan_reads",
+]
+
+from collections import namedtuple
+
+RegisterRange = namedtuple(
+    "RegisterRange", ["name", "table", "address", "count", "unit"], defaults=(1,)
+)
+RegisterRange.__doc__ = """A named block of Modbus registers or bits to read.
+
+``table`` is one of the keys of `REGISTER_TABLES`; ``address`` is
+0-based and ``unit`` is the Modbus unit (slave) ID.
+"""
+
+ReadRequest = namedtuple(
+    "ReadRequest", ["table", "unit", "address", "count", "members"]
+)
+ReadRequest.__doc__ = """One Modbus read request covering one or more
+`RegisterRange`.
+
+``members`` is a tuple of (name, offset, count) giving where each range
+lies in the response.
+"""
+
+# Modbus table name: (pymodbus read method, response attribute, maximum
+# number of values per request allowed by the Modbus specification)
+REGISTER_TABLES = {
+    "coils": ("read_coils", "bits", 2000),
+    "discrete_inputs": ("read_discrete_inputs", "bits", 2000),
+    "holding_registers": ("read_holding_registers", "registers", 125),
+    "input_registers": ("read_input_registers", "registers", 125),
+}
+
+ADAM6024_ANALOG_INPUTS = RegisterRange("analog_inputs", "input_registers", 0, 8)
+
+# Other data of the ADAM-6024 worth reading with the analog inputs.
+ADAM6024_DIAGNOSTIC_RANGES = (
+    RegisterRange("analog_output_readback", "input_registers", 10, 2),
+    RegisterRange("analog_input_status", "input_registers", 100, 6),
+    RegisterRange("digital_inputs", "discrete_inputs", 0, 2),
+    RegisterRange("digital_outputs", "coils", 16, 2),
+)
+
+
+def plan_reads(ranges, max_gap=16):
+    """Merge register ranges into as few read requests as possible.
+
+    Ranges of the same table and unit are merged if they overlap or are
+    separated by at most ``max_gap`` unwanted values, as long as the
+    merged request stays within the Modbus limit on values per request.
+    Reading a few unwanted registers is much cheaper than another round
+    trip.
+
+    Parameters
+    ----------
+    ranges : list of RegisterRange
+        the ranges to read; names must be unique
+    max_gap : int
+        maximum number of unwanted values to read to merge two ranges
+
+    Returns
+    -------
+    requests : list of ReadRequest
+        the requests, sorted by table, unit and address
+
+    Raises
+    ------
+    ValueError
+        If a name is repeated, a table is unknown, or a range is empty or
+        too long for one request.
+    """
+    names = set()
+    groups = dict()
+    for register_range in ranges:
+        if register_range.name in names:
+            raise ValueError(f"Duplicate register range name {register_range.name!r}")
+        names.add(register_range.name)
+        if register_range.table not in REGISTER_TABLES:
+            raise ValueError(
+                f"Unknown table {register_range.table!r} for {register_range.name!r}; "
+                f"must be one of {sorted(REGISTER_TABLES)}"
+            )
+        max_count = REGISTER_TABLES[register_range.table][2]
+        if not 1 <= register_range.count <= max_count:
+            raise ValueError(
+                f"count={register_range.count} of {register_range.name!r} must be "
+                f"in the range [1, {max_count}]"
+            )
+        groups.setdefault((register_range.table, register_range.unit), []).append(
+            register_range
+        )
+
+    requests = []
+    for (table, unit), group in sorted(groups.items()):
+        max_count = REGISTER_TABLES[table][2]
+        group.sort(key=lambda register_range: register_range.address)
+        members = []
+        start = group[0].address
+        end = start
+        for register_range in group:
+            range_end = register_range.address + register_range.count
+            gap = register_range.address - end
+            too_long = max(end, range_end) - start > max_count
+            if gap > max_gap or too_long:
+                requests.append(
+                    ReadRequest(table, unit, start, end - start, tuple(members))
+                )
+                members = []
+                start = register_range.address
+                end = start
+            offset = register_range.address - start
+            members.append((register_range.name, offset, register_range.count))
+            end = max(end, range_end)
+        requests.append(ReadRequest(table, unit, start, end - start, tuple(members)))
+    return requests
@@ -0,0 +1,131 @@
+__all__ = ["ReplaySource"]
+
+import time
+
+import numpy as np
+
+from .spool import read_spool
+
+
+class ReplaySource:
+    """
+    Plays back recorded raw samples as the analog inputs of simulated
+    ADAM devices.
+
+    Give one to `AdamModel` (in simulation mode) as ``replay_source``,
+    and its `MockModbusClient` returns the recorded counts instead of its
+    own waveforms. Each device needs its own source, with the columns of
+    the recording for its channels.
+
+    Playback is either timed, sample-and-hold, with the recording's clock
+    running ``speed`` times faster than the real one (so 100 compresses
+    100 seconds of recording into one), or, with ``speed=None``, one
+    recorded sample per read, as fast as the reader goes, which is the
+    way to measure throughput.
+
+    Recorded NaN counts (channels whose device could not be read) are
+    played back as a failed read, so the reader sees the device
+    fail the way it did.
+
+        Parameters
+        ----------
+        timestamps : numpy.ndarray
+            time of each sample (sec), increasing
+        counts : numpy.ndarray
+            raw counts, shape (num_samples, num_channels)
+        speed : float or None
+            playback speed, relative to real time; None for one sample
+            per read
+        repeat : bool
+            start over at the end of the recording? If false, the last
+            sample is held.
+
+        Attributes
+        ----------
+        num_reads : int
+            number of samples read
+        num_repeats : int
+            number of times playback started over
+    """
+
+    def __init__(self, timestamps, counts, speed=1, repeat=True):
+        timestamps = np.asarray(timestamps, dtype=float)
+        counts = np.asarray(counts, dtype=float)
+        if len(timestamps) == 0:
+            raise ValueError("Cannot replay an empty recording")
+        if counts.ndim != 2 or len(counts) != len(timestamps):
+            raise ValueError(
+                f"counts shape {counts.shape} does not match "
+                f"{len(timestamps)} timestamps"
+            )
+        if speed is not None and speed <= 0:
+            raise ValueError(f"speed={speed} must be > 0 or None")
+        self.timestamps = timestamps - timestamps[0]
+        self.counts = np.where(np.isnan(counts), np.nan, np.clip(counts, 0, 65535))
+        self.speed = speed
+        self.repeat = repeat
+        self.duration = self.timestamps[-1]
+        self.num_reads = 0
+        self.num_repeats = 0
+        self._start_time = None
+        self._index = 0
+
+    @classmethod
+    def from_spool(cls, directory, channels=None, start=None, end=None, **kwargs):
+        """Make a replay source from spool files; see `SpoolWriter`.
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path
+            directory of spool files
+        channels : list of int, optional
+            recorded channels to play, in order; all if None
+        start, end : float, optional
+            time range to replay (TAI unix seconds)
+        **kwargs
+            additional arguments for the constructor
+        """
+        timestamps, counts = read_spool(directory, start=start, end=end)
+        if channels is not None:
+            counts = counts[:, channels]
+        return cls(timestamps, counts, **kwargs)
+
+    @property
+    def num_channels(self):
+        return self.counts.shape[1]
+
+    def next_index(self):
+        """Return the index of the recorded sample to play now."""
+        self.num_reads += 1
+        if self.speed is None:
+            index = self._index
+            self._index += 1
+            if self._index >= len(self.timestamps):
+                if self.repeat:
+                    self._index = 0
+                    self.num_repeats += 1
+                else:
+                    self._index -= 1
+            return index
+
+        now = time.monotonic()
+        if self._start_time is None:
+            self._start_time = now
+        elapsed = (now - self._start_time) * self.speed
+        if elapsed > self.duration:
+            if self.repeat and self.duration > 0:
+                self.num_repeats = int(elapsed // self.duration)
+                elapsed %= self.duration
+            else:
+                elapsed = self.duration
+        return np.searchsorted(self.timestamps, elapsed, side="right") - 1
+
+    def read(self):
+        """Get the counts to play now.
+
+        Returns
+        -------
+        counts : numpy.ndarray
+            the counts of each channel, NaN where the recording has none
+        """
+        return self.counts[self.next_index()]
@@ -0,0 +1,113 @@
+__all__ = ["FixedRateScheduler"]
+
+import asyncio
+import math
+
+
+class FixedRateScheduler:
+    """
+    Paces a loop at a fixed rate by sleeping until absolute deadlines.
+
+    Deadlines lie on a grid ``start + n * interval`` of the event loop's
+    monotonic clock, so time spent in each cycle does not accumulate
+    as drift. A cycle that runs past its deadline is counted as an
+    overrun, and any deadlines it ran over are skipped (counted as
+    missed) so the loop stays on the grid rather than bursting to
+    catch up.
+
+        Parameters
+        ----------
+        interval : float
+            period between cycles (sec)
+
+        Attributes
+        ----------
+        num_cycles : int
+            number of cycles started
+        num_overruns : int
+            number of cycles that ended after the next deadline
+        num_missed : int
+            number of deadlines skipped because of overruns
+        jitter : float
+            lateness (sec) of the most recent wakeup relative to its
+            deadline
+    """
+
+    def __init__(self, interval):
+        if interval <= 0:
+            raise ValueError(f"interval={interval} must be > 0")
+        self.interval = interval
+        self.deadline = None
+        self.num_cycles = 0
+        self.num_overruns = 0
+        self.num_missed = 0
+        self.jitter = 0
+        self._reset_jitter_stats()
+
+    async def wait(self):
+        """Wait for the start of the next cycle.
+
+        The first call returns at once and defines the start of the grid.
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self.deadline is None:
+            self.deadline = now
+        else:
+            self.deadline += self.interval
+            if now > self.deadline:
+                self.num_overruns += 1
+                num_missed = math.floor((now - self.deadline) / self.interval) + 1
+                self.num_missed += num_missed
+                self.deadline += num_missed * self.interval
+            await asyncio.sleep(self.deadline - now)
+            now = loop.time()
+        self.num_cycles += 1
+        self._add_jitter(now - self.deadline)
+
+    def set_interval(self, interval):
+        """Change the period between cycles.
+
+        The next deadline is one new interval after the most recent one,
+        and the grid continues from there.
+        """
+        if interval <= 0:
+            raise ValueError(f"interval={interval} must be > 0")
+        self.interval = interval
+
+    def report(self):
+        """Return the scheduler metrics, and restart the jitter statistics.
+
+        Returns
+        -------
+        metrics : dict
+            ``num_cycles``, ``num_overruns`` and ``num_missed`` since the
+            scheduler was created, and ``mean_jitter`` and ``max_jitter``
+            (sec) since the previous report.
+        """
+        if self._jitter_count > 0:
+            mean_jitter = self._jitter_sum / self._jitter_count
+            max_jitter = self._jitter_max
+        else:
+            mean_jitter = math.nan
+            max_jitter = math.nan
+        metrics = dict(
+            num_cycles=self.num_cycles,
+            num_overruns=self.num_overruns,
+            num_missed=self.num_missed,
+            mean_jitter=mean_jitter,
+            max_jitter=max_jitter,
+        )
+        self._reset_jitter_stats()
+        return metrics
+
+    def _add_jitter(self, jitter):
+        self.jitter = jitter
+        self._jitter_sum += jitter
+        self._jitter_count += 1
+        self._jitter_max = max(self._jitter_max, jitter)
+
+    def _reset_jitter_stats(self):
+        self._jitter_sum = 0
+        self._jitter_count = 0
+        self._jitter_max = 0
@@ -0,0 +1,299 @@
+__all__ = [
+    "AdamSimulator",
+    "constant_waveform",
+    "sine_waveform",
+    "ramp_waveform",
+    "step_waveform",
+    "noise_waveform",
+    "start_simulators",
+]
+
+import asyncio
+import logging
+import math
+import random
+import struct
+import time
+
+import numpy as np
+
+# Modbus function codes handled by the simulator
+READ_COILS = 1
+READ_DISCRETE_INPUTS = 2
+READ_HOLDING_REGISTERS = 3
+READ_INPUT_REGISTERS = 4
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 1
+ILLEGAL_DATA_ADDRESS = 2
+
+MBAP_HEADER = struct.Struct(">HHHB")
+READ_REQUEST = struct.Struct(">BHH")
+
+
+def constant_waveform(volts):
+    """Return a waveform with a constant voltage."""
+    return lambda t: volts
+
+
+def sine_waveform(amplitude=10, period=10, offset=0, phase=0):
+    """Return a sinusoidal waveform.
+
+    Parameters
+    ----------
+    amplitude : float
+        amplitude (volts)
+    period : float
+        period (sec)
+    offset : float
+        mean voltage
+    phase : float
+        phase (radians)
+    """
+    return lambda t: offset + amplitude * math.sin(2 * math.pi * t / period + phase)
+
+
+def ramp_waveform(start=-10, end=10, period=10):
+    """Return a sawtooth waveform that ramps from ``start`` to ``end``
+    volts every ``period`` seconds.
+    """
+    return lambda t: start + (end - start) * ((t / period) % 1)
+
+
+def step_waveform(before=0, after=10, step_time=1):
+    """Return a waveform that steps from ``before`` to ``after`` volts
+    ``step_time`` seconds after ``t=0``.
+    """
+    return lambda t: before if t < step_time else after
+
+
+def noise_waveform(waveform, sigma):
+    """Return ``waveform`` with Gaussian noise of ``sigma`` volts added."""
+    return lambda t: waveform(t) + random.gauss(0, sigma)
+
+
+class AdamSimulator:
+    """
+    Local Modbus/TCP server that emulates the register map of an ADAM-6024.
+
+    Register map (0-based addresses):
+
+    * input (and holding) registers 0-5: analog inputs, in counts
+      (0 = -10 V, 65535 = +10 V), computed from each channel's waveform
+      at the time of the request
+    * input registers 10-11: analog output readback
+    * input registers 100-105: analog input status (0 = OK)
+    * discrete inputs 0-1: digital inputs
+    * coils 16-17: digital outputs
+
+    Each response is delayed by ``latency`` plus a uniformly distributed
+    random ``jitter``, and each request is ignored (as if the packet were
+    lost) with probability ``loss_probability``. Responses are sent
+    independently, so pipelined requests are served concurrently.
+
+        Parameters
+        ----------
+        host : str
+            host to listen on
+        port : int
+            port to listen on; 0 picks a free port, see `port`
+        waveforms : list of callable, optional
+            for each analog input, a function of time (sec) returning
+            volts; the default resembles `MockModbusClient`: two slow
+            sine waves and constant -10, +10, 0 and 0 volts
+        latency : float
+            fixed response delay (sec)
+        jitter : float
+            maximum additional random response delay (sec)
+        loss_probability : float
+            probability that a request is not answered
+        log : logging.Logger, optional
+            parent logger
+
+        Attributes
+        ----------
+        input_registers : numpy.ndarray
+            the input register table; analog inputs are refreshed on
+            each request
+        discrete_inputs : numpy.ndarray
+            the discrete input table
+        coils : numpy.ndarray
+            the coil table
+        num_requests : int
+            number of requests received
+        num_dropped : int
+            number of requests not answered
+        max_in_flight : int
+            most delayed requests awaiting their response at once; more
+            than one if the client pipelines its requests
+    """
+
+    num_analog_inputs = 6
+    num_registers = 256
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        waveforms=None,
+        latency=0,
+        jitter=0,
+        loss_probability=0,
+        log=None,
+    ):
+        self.host = host
+        self.port = port
+        if waveforms is None:
+            waveforms = [
+                sine_waveform(period=7 * 2 * math.pi),
+                constant_waveform(-10),
+                constant_waveform(10),
+                constant_waveform(0),
+                constant_waveform(0),
+                sine_waveform(period=11 * 2 * math.pi),
+            ]
+        if len(waveforms) != self.num_analog_inputs:
+            raise ValueError(
+                f"Need {self.num_analog_inputs} waveforms; got {len(waveforms)}"
+            )
+        self.waveforms = list(waveforms)
+        self.latency = latency
+        self.jitter = jitter
+        self.loss_probability = loss_probability
+        self.input_registers = np.zeros(self.num_registers, dtype=np.uint16)
+        self.discrete_inputs = np.zeros(self.num_registers, dtype=bool)
+        self.coils = np.zeros(self.num_registers, dtype=bool)
+        self.num_requests = 0
+        self.num_dropped = 0
+        self.max_in_flight = 0
+        self._num_in_flight = 0
+        self.server = None
+        self._writers = set()
+        self._start_time = time.monotonic()
+
+        if log is None:
+            self.log = logging.getLogger(type(self).__name__)
+        else:
+            self.log = log.getChild(type(self).__name__)
+
+    async def start(self):
+        """Start the server; if ``port`` was 0, set it to the port used."""
+        self.server = await asyncio.start_server(
+            self._handle_connection, host=self.host, port=self.port
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.log.debug(f"ADAM simulator listening on {self.host}:{self.port}")
+
+    async def close(self):
+        """Stop the server and close all connections."""
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def volts_to_counts(self, volts):
+        """Convert volts to ADAM-6024 counts, clipped to the input range."""
+        counts = round((volts + 10) * 65535 / 20)
+        return min(max(counts, 0), 65535)
+
+    def update_analog_inputs(self):
+        """Evaluate the waveforms into analog input registers 0-5."""
+        t = time.monotonic() - self._start_time
+        for i, waveform in enumerate(self.waveforms):
+            self.input_registers[i] = self.volts_to_counts(waveform(t))
+
+    def handle_pdu(self, pdu):
+        """Compute the response PDU (function code and data) for a
+        request PDU.
+        """
+        if len(pdu) == 0:
+            return bytes([0x80, ILLEGAL_FUNCTION])
+        function_code = pdu[0]
+        if function_code not in (
+            READ_COILS,
+            READ_DISCRETE_INPUTS,
+            READ_HOLDING_REGISTERS,
+            READ_INPUT_REGISTERS,
+        ):
+            return bytes([function_code | 0x80, ILLEGAL_FUNCTION])
+        try:
+            function_code, address, count = READ_REQUEST.unpack(pdu)
+        except struct.error:
+            return bytes([function_code | 0x80, ILLEGAL_DATA_ADDRESS])
+        end = address + count
+        if count < 1 or end > self.num_registers:
+            return bytes([function_code | 0x80, ILLEGAL_DATA_ADDRESS])
+
+        if function_code in (READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS):
+            self.update_analog_inputs()
+            data = self.input_registers[address:end].astype(">u2").tobytes()
+        else:
+            table = self.coils if function_code == READ_COILS else self.discrete_inputs
+            data = np.packbits(table[address:end], bitorder="little").tobytes()
+        return bytes([function_code, len(data)]) + data
+
+    async def _handle_connection(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        self._writers.add(writer)
+        try:
+            while True:
+                header = await reader.readexactly(MBAP_HEADER.size)
+                transaction_id, protocol_id, length, unit = MBAP_HEADER.unpack(header)
+                pdu = await reader.readexactly(length - 1)
+                self.num_requests += 1
+                if random.random() < self.loss_probability:
+                    self.num_dropped += 1
+                    continue
+                response_pdu = self.handle_pdu(pdu)
+                header = MBAP_HEADER.pack(
+                    transaction_id, protocol_id, len(response_pdu) + 1, unit
+                )
+                response = header + response_pdu
+                delay = self.latency + random.uniform(0, self.jitter)
+                if delay > 0:
+                    self._num_in_flight += 1
+                    self.max_in_flight = max(self.max_in_flight, self._num_in_flight)
+                    loop.call_later(delay, self._write_delayed, writer, response)
+                else:
+                    writer.write(response)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _write_delayed(self, writer, data):
+        self._num_in_flight -= 1
+        if not writer.is_closing():
+            writer.write(data)
+
+
+async def start_simulators(num_simulators, host="127.0.0.1", **kwargs):
+    """Start several ADAM simulators, each on its own free port.
+
+    Parameters
+    ----------
+    num_simulators : int
+        number of simulators to start
+    host : str
+        host to listen on
+    **kwargs
+        additional arguments for `AdamSimulator`
+
+    Returns
+    -------
+    simulators : list of AdamSimulator
+        the running simulators; close them with `AdamSimulator.close`
+    """
+    simulators = [AdamSimulator(host=host, **kwargs) for i in range(num_simulators)]
+    await asyncio.gather(*[simulator.start() for simulator in simulators])
+    return simulators
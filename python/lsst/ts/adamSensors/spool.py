@@ -0,0 +1,379 @@
+__all__ = [
+    "SPOOL_SUFFIX",
+    "spool_dtype",
+    "SpoolWriter",
+    "read_spool_file",
+    "list_spool_files",
+    "read_spool",
+    "replay_spool",
+]
+
+import asyncio
+import concurrent.futures
+import datetime
+import functools
+import logging
+import pathlib
+import struct
+
+import numpy as np
+
+from .decimation import channel_statistics
+
+SPOOL_SUFFIX = ".adamspool"
+
+# File header: magic, format version, number of channels, reserved.
+# The header is 16 bytes, so records that follow stay 8-byte aligned.
+SPOOL_MAGIC = b"ADAMSPL\0"
+SPOOL_VERSION = 1
+SPOOL_HEADER = struct.Struct("<8sHHI")
+
+
+def spool_dtype(num_channels):
+    """Return the numpy dtype of one spool record.
+
+    Each record is the time of the poll (TAI unix seconds, float64) and
+    the raw register counts of each channel (float32, which holds any
+    16-bit count exactly, and NaN for channels that could not be read).
+    """
+    return np.dtype([("timestamp", "<f8"), ("counts", "<f4", (num_channels,))])
+
+
+class SpoolWriter:
+    """
+    Appends timestamped raw samples to a local binary spool.
+
+    Samples are copied into a preallocated record buffer, which is cheap
+    enough to do on the event loop at every poll. Full buffers (and, at
+    most ``flush_interval`` apart, partial ones) are written by a single
+    background thread, in order, so the event loop never waits for the
+    disk. If the disk falls so far behind that ``max_pending`` batches
+    are waiting, further batches are dropped and counted rather than
+    queued without limit.
+
+    Each spool file starts with a 16 byte header followed by fixed-size
+    records (see `spool_dtype`), so it can be read back with zero copies
+    by `read_spool_file`. A new file is started when the current one
+    would exceed ``max_file_size``. Each file is named for the time of
+    its first sample, e.g. ``adam-20240101T120000.000000.adamspool``, so
+    file names sort in time order. Like the timestamps, that time is in
+    TAI, not UTC: it is about 37 seconds ahead of the UTC wall clock.
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path
+            directory for the spool files; created if needed
+        num_channels : int
+            number of channels in each sample
+        max_file_size : int
+            maximum size (bytes) of each spool file
+        batch_size : int
+            number of samples written per batch
+        flush_interval : float
+            maximum time (sec) a sample waits in the buffer
+        max_pending : int
+            maximum number of batches waiting to be written
+        log : logging.Logger, optional
+            parent logger
+
+        Attributes
+        ----------
+        path : pathlib.Path
+            current spool file, or None if none has been started
+        num_written : int
+            number of samples written to disk
+        num_dropped : int
+            number of samples dropped because the disk fell behind or
+            a write failed
+
+    ``num_written`` and ``num_dropped`` are only updated on the event
+    loop, when a write finishes, so they can be read there without a
+    lock.
+    """
+
+    def __init__(
+        self,
+        directory,
+        num_channels,
+        max_file_size=64 * 1024 * 1024,
+        batch_size=1000,
+        flush_interval=1,
+        max_pending=10,
+        log=None,
+    ):
+        self.directory = pathlib.Path(directory)
+        self.num_channels = num_channels
+        self.dtype = spool_dtype(num_channels)
+        max_records = (max_file_size - SPOOL_HEADER.size) // self.dtype.itemsize
+        if max_records < 1:
+            raise ValueError(
+                f"max_file_size={max_file_size} cannot hold a single record"
+            )
+        self.max_records = max_records
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.path = None
+        self.num_written = 0
+        self.num_dropped = 0
+
+        if log is None:
+            self.log = logging.getLogger(type(self).__name__)
+        else:
+            self.log = log.getChild(type(self).__name__)
+
+        self._buffer = np.zeros(batch_size, dtype=self.dtype)
+        self._num_buffered = 0
+        self._first_buffered_time = None
+        self._pending = set()
+        self._file = None
+        self._num_file_records = 0
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="AdamSpool"
+        )
+
+    def append(self, timestamp, counts):
+        """Append one sample; write the buffer if it is due.
+
+        Must be called from the event loop that will `close` the writer.
+
+        Parameters
+        ----------
+        timestamp : float
+            time of the sample (TAI unix seconds)
+        counts : numpy.ndarray
+            raw register counts of each channel
+        """
+        record = self._buffer[self._num_buffered]
+        record["timestamp"] = timestamp
+        record["counts"] = counts
+        self._num_buffered += 1
+        if self._first_buffered_time is None:
+            self._first_buffered_time = timestamp
+        buffer_full = self._num_buffered >= self.batch_size
+        if buffer_full or timestamp - self._first_buffered_time >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Start writing the buffered samples in the background."""
+        if self._num_buffered == 0:
+            return
+        batch = self._buffer[: self._num_buffered].copy()
+        self._num_buffered = 0
+        self._first_buffered_time = None
+        if len(self._pending) >= self.max_pending:
+            self.num_dropped += len(batch)
+            return
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, self._write, batch
+        )
+        self._pending.add(future)
+        future.add_done_callback(functools.partial(self._write_done, len(batch)))
+
+    async def close(self):
+        """Write all buffered samples, close the file and stop the
+        writer thread.
+        """
+        self.flush()
+        if self._pending:
+            await asyncio.wait(list(self._pending))
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._close_file
+        )
+        self._executor.shutdown(wait=True)
+
+    def _write_done(self, num_records, future):
+        self._pending.discard(future)
+        if future.cancelled():
+            self.num_dropped += num_records
+            return
+        num_written, exception = future.result()
+        self.num_written += num_written
+        self.num_dropped += num_records - num_written
+        if exception is not None:
+            self.log.error(f"Failed to write to spool file {self.path}: {exception!r}")
+
+    def _write(self, batch):
+        """Write a batch of records, rotating files as needed.
+
+        Runs in the writer thread, so it leaves the counters to
+        `_write_done`.
+
+        Returns
+        -------
+        num_written : int
+            number of records written
+        exception : Exception or None
+            the error that stopped the write, if any
+        """
+        num_written = 0
+        try:
+            while len(batch) > 0:
+                if self._file is None or self._num_file_records >= self.max_records:
+                    self._open_file(batch[0]["timestamp"])
+                num_records = min(len(batch), self.max_records - self._num_file_records)
+                self._file.write(batch[:num_records].tobytes())
+                self._file.flush()
+                self._num_file_records += num_records
+                num_written += num_records
+                batch = batch[num_records:]
+        except Exception as e:
+            return num_written, e
+        return num_written, None
+
+    def _open_file(self, timestamp):
+        self._close_file()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # the timestamps are TAI, so this is a TAI calendar time, although
+        # datetime knows no such time zone
+        start = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+        name = start.strftime("adam-%Y%m%dT%H%M%S.%f")
+        path = self.directory / f"{name}{SPOOL_SUFFIX}"
+        suffix = 1
+        while path.exists():
+            path = self.directory / f"{name}_{suffix:03d}{SPOOL_SUFFIX}"
+            suffix += 1
+        self._file = open(path, "wb")
+        self._file.write(
+            SPOOL_HEADER.pack(SPOOL_MAGIC, SPOOL_VERSION, self.num_channels, 0)
+        )
+        self._num_file_records = 0
+        self.path = path
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_spool_file(path):
+    """Map the records of a spool file into memory, without copying.
+
+    A partly written last record (e.g. after a crash) is ignored.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        the spool file
+
+    Returns
+    -------
+    records : numpy.ndarray
+        read-only structured array (a `numpy.memmap`) with fields
+        ``timestamp`` and ``counts``; see `spool_dtype`
+
+    Raises
+    ------
+    ValueError
+        If the file is not a spool file.
+    """
+    path = pathlib.Path(path)
+    with open(path, "rb") as f:
+        header = f.read(SPOOL_HEADER.size)
+    if len(header) < SPOOL_HEADER.size:
+        raise ValueError(f"{path} is too short to be a spool file")
+    magic, version, num_channels, _ = SPOOL_HEADER.unpack(header)
+    if magic != SPOOL_MAGIC or version != SPOOL_VERSION:
+        raise ValueError(f"{path} is not a version {SPOOL_VERSION} spool file")
+    dtype = spool_dtype(num_channels)
+    num_records = (path.stat().st_size - SPOOL_HEADER.size) // dtype.itemsize
+    if num_records == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(
+        path, dtype=dtype, mode="r", offset=SPOOL_HEADER.size, shape=(num_records,)
+    )
+
+
+def list_spool_files(directory):
+    """Return the spool files in a directory, oldest first."""
+    return sorted(pathlib.Path(directory).glob(f"*{SPOOL_SUFFIX}"))
+
+
+def read_spool(directory, start=None, end=None):
+    """Read the samples of all spool files in a directory.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        directory of spool files
+    start : float, optional
+        only return samples at or after this time (TAI unix seconds)
+    end : float, optional
+        only return samples before this time (TAI unix seconds)
+
+    Returns
+    -------
+    timestamps : numpy.ndarray
+        time of each sample, oldest first
+    counts : numpy.ndarray
+        raw counts, shape (num_samples, num_channels)
+
+    Raises
+    ------
+    ValueError
+        If the files in the time range have different numbers of
+        channels, e.g. because the channels were reconfigured between
+        runs; select the samples of one run with ``start`` and ``end``.
+    """
+    timestamps = []
+    counts = []
+    first_path = None
+    for path in list_spool_files(directory):
+        records = read_spool_file(path)
+        if len(records) == 0:
+            continue
+        if end is not None and records[0]["timestamp"] >= end:
+            continue
+        if start is not None and records[-1]["timestamp"] < start:
+            continue
+        if first_path is None:
+            first_path = path
+            num_channels = records["counts"].shape[1]
+        elif records["counts"].shape[1] != num_channels:
+            raise ValueError(
+                f"{path} has {records['counts'].shape[1]} channels, but "
+                f"{first_path} has {num_channels}"
+            )
+        file_timestamps = records["timestamp"]
+        begin = 0 if start is None else np.searchsorted(file_timestamps, start)
+        stop = len(records) if end is None else np.searchsorted(file_timestamps, end)
+        timestamps.append(file_timestamps[begin:stop])
+        counts.append(records["counts"][begin:stop])
+    if not timestamps:
+        return np.zeros(0), np.zeros((0, 0))
+    return np.concatenate(timestamps), np.concatenate(counts).astype(float)
+
+
+def replay_spool(directory, converter, start=None, end=None, interval=None):
+    """Convert spooled raw samples to engineering units, e.g. to backfill
+    lost telemetry or reprocess it with new calibration coefficients.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        directory of spool files
+    converter : ChannelConverter
+        converter with the coefficients to apply
+    start, end : float, optional
+        time range to replay (TAI unix seconds); see `read_spool`
+    interval : float, optional
+        if given, average the samples over consecutive intervals of this
+        many seconds, as the CSC does over its ``publish_interval``
+
+    Returns
+    -------
+    timestamps : numpy.ndarray
+        time of each sample, or of the last sample of each interval
+    values : numpy.ndarray
+        values in engineering units, shape (n, num_channels)
+    """
+    timestamps, counts = read_spool(directory, start=start, end=end)
+    if len(timestamps) == 0:
+        return timestamps, np.zeros((0, converter.num_channels))
+    values = converter.convert(counts)
+    if interval is None:
+        return timestamps, values
+    bins = np.floor((timestamps - timestamps[0]) / interval)
+    splits = np.flatnonzero(np.diff(bins)) + 1
+    averaged = [channel_statistics(block).mean for block in np.split(values, splits)]
+    return timestamps[np.append(splits, len(timestamps)) - 1], np.array(averaged)
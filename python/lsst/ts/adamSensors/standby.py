@@ -0,0 +1,139 @@
+__all__ = ["StandbyPoller"]
+
+import asyncio
+import logging
+
+
+class StandbyPoller:
+    """
+    Keeps the connections of an `AdamPoller` open and checked while the
+    CSC is in STANDBY, so the next start can reuse them instead of
+    connecting again, and can publish the most recent sample at once.
+
+    The devices are polled every ``interval``; a poll is cheap enough at
+    a slow rate to keep the connections (and any NAT or firewall state)
+    alive and to notice a device that goes away. Each device that
+    becomes unavailable or available again is logged, as in the
+    telemetry loop.
+
+        Parameters
+        ----------
+        poller : AdamPoller
+            the connected poller to keep warm
+        interval : float
+            time (sec) between polls
+        log : logging.Logger, optional
+            parent logger
+
+        Attributes
+        ----------
+        poller : AdamPoller
+            the poller
+        num_polls : int
+            number of polls made
+        failing : set of str
+            names of the devices that could not be read in the most
+            recent poll
+        latest : tuple or None
+            (timestamp, counts) of the most recent poll that read any
+            device, where counts is a dict of device name: register
+            counts of the devices read; None if there was none
+    """
+
+    def __init__(self, poller, interval, log=None):
+        if interval <= 0:
+            raise ValueError(f"interval={interval} must be > 0")
+        self.poller = poller
+        self.interval = interval
+        self.num_polls = 0
+        self.failing = set()
+        self.latest = None
+        self._task = None
+        self._stop_event = asyncio.Event()
+
+        if log is None:
+            self.log = logging.getLogger(type(self).__name__)
+        else:
+            self.log = log.getChild(type(self).__name__)
+
+    @property
+    def running(self):
+        """Is the poller being polled?"""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def healthy(self):
+        """Did the most recent poll read every device?
+
+        False before the first poll, or if polling stopped because of an
+        error.
+        """
+        if self.num_polls == 0 or self.failing:
+            return False
+        if self._task is None or not self._task.done():
+            return True
+        return self._task.exception() is None
+
+    def start(self):
+        """Start polling."""
+        if self.running:
+            raise RuntimeError("Already running")
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self):
+        """Stop polling, leaving the connections open.
+
+        A poll in progress is allowed to finish (it takes at most the
+        models' request timeout), rather than cancelled part way through
+        a Modbus transaction on a connection that is to be reused.
+
+        Returns
+        -------
+        poller : AdamPoller
+            the poller
+        """
+        if self._task is None:
+            return self.poller
+        self._stop_event.set()
+        try:
+            await self._task
+        except Exception:
+            self.log.exception("Standby polling failed")
+        return self.poller
+
+    async def close(self):
+        """Stop polling and close the connections."""
+        await self.stop()
+        await self.poller.close()
+
+    async def poll(self):
+        """Poll the devices once, updating `failing` and `latest`."""
+        results = await self.poller.poll()
+        self.num_polls += 1
+        models = self.poller.models
+        counts = dict()
+        read_time_sum = 0
+        for name, result in results.items():
+            if isinstance(result, Exception):
+                if name not in self.failing:
+                    self.log.warning(
+                        f"Device {name} is unavailable in standby: {result}"
+                    )
+                    self.failing.add(name)
+                continue
+            if name in self.failing:
+                self.log.info(f"Device {name} is available again")
+                self.failing.discard(name)
+            counts[name] = result
+            read_time_sum += models[name].last_read_time
+        if counts:
+            self.latest = (read_time_sum / len(counts), counts)
+
+    async def _poll_loop(self):
+        while not self._stop_event.is_set():
+            await self.poll()
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
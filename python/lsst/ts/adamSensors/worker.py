@@ -0,0 +1,428 @@
+__all__ = ["SharedSampleRing", "AcquisitionWorker"]
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .model import AdamModel
+from .poller import AdamPoller
+from .scheduler import FixedRateScheduler
+
+# Indices of the control words in the header of a SharedSampleRing
+_WRITE_COUNT = 0
+_STATE = 1
+_STOP = 2
+_INTERVAL = 3
+_HEADER_SIZE = 4
+
+# Values of the state control word, set by the worker
+_STARTING = 0
+_RUNNING = 1
+_FAILED = 2
+
+
+class SharedSampleRing:
+    """
+    Ring buffer of timestamped samples in shared memory, written by one
+    process and read by another without locks.
+
+    The writer stores a sample in slot ``count % capacity`` and then
+    increments the write count in the header; the reader copies every
+    sample written since its last read and then checks the write count
+    again, discarding any slot the writer may have started overwriting
+    while it was copying. Each control word is one aligned 8-byte store,
+    so it is never seen half written. If the reader falls more than
+    ``capacity`` samples behind, the oldest samples are lost and counted
+    in ``num_lost``.
+
+    Create the ring in one process and `attach` to it by name in the
+    other; both must `close` it, and the creator must `unlink` it.
+
+        Parameters
+        ----------
+        capacity : int
+            number of samples held
+        num_values : int
+            number of values in each sample
+        name : str, optional
+            name of an existing ring to attach to; if None, a new ring
+            is created
+
+        Attributes
+        ----------
+        num_read : int
+            number of samples returned by `read`
+        num_lost : int
+            number of samples overwritten before they could be read
+    """
+
+    def __init__(self, capacity, num_values, name=None):
+        if capacity < 2:
+            raise ValueError(f"capacity={capacity} must be >= 2")
+        self.capacity = capacity
+        self.num_values = num_values
+        header_bytes = _HEADER_SIZE * 8
+        timestamp_bytes = capacity * 8
+        size = header_bytes + timestamp_bytes + capacity * num_values * 8
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        buffer = self._shm.buf
+        self._header = np.ndarray((_HEADER_SIZE,), dtype=np.int64, buffer=buffer)
+        self._timestamps = np.ndarray(
+            (capacity,), dtype=float, buffer=buffer, offset=header_bytes
+        )
+        self._values = np.ndarray(
+            (capacity, num_values),
+            dtype=float,
+            buffer=buffer,
+            offset=header_bytes + timestamp_bytes,
+        )
+        if name is None:
+            self._header[:] = 0
+        self.num_read = 0
+        self.num_lost = 0
+
+    @classmethod
+    def attach(cls, name, capacity, num_values):
+        """Attach to a ring created by another process."""
+        return cls(capacity, num_values, name=name)
+
+    @property
+    def name(self):
+        """Name of the shared memory block, to `attach` to."""
+        return self._shm.name
+
+    @property
+    def write_count(self):
+        """Number of samples written."""
+        return int(self._header[_WRITE_COUNT])
+
+    def append(self, timestamp, values):
+        """Write one sample, overwriting the oldest if the ring is full.
+
+        Only one process may write to a ring.
+        """
+        slot = self._header[_WRITE_COUNT] % self.capacity
+        self._timestamps[slot] = timestamp
+        self._values[slot] = values
+        self._header[_WRITE_COUNT] += 1
+
+    def read(self):
+        """Return copies of the samples written since the last read.
+
+        Only one process may read from a ring.
+
+        Returns
+        -------
+        timestamps : numpy.ndarray
+            time of each sample, oldest first
+        values : numpy.ndarray
+            the samples, shape (n, num_values)
+        """
+        end = self.write_count
+        start = max(self.num_read + self.num_lost, end - self.capacity)
+        slots = np.arange(start, end) % self.capacity
+        timestamps = self._timestamps[slots]
+        values = self._values[slots]
+        # the writer may have started overwriting the oldest slots
+        # while they were being copied
+        num_torn = max(0, self.write_count + 1 - self.capacity - start)
+        num_torn = min(num_torn, len(slots))
+        self.num_lost += start + num_torn - self.num_read - self.num_lost
+        self.num_read += len(slots) - num_torn
+        return timestamps[num_torn:], values[num_torn:]
+
+    def close(self):
+        """Release this process's view of the ring."""
+        # the numpy views must go before the buffer can be released
+        self._header = self._timestamps = self._values = None
+        self._shm.close()
+
+    def unlink(self):
+        """Free the shared memory, once every process has closed it."""
+        self._shm.unlink()
+
+
+class AcquisitionWorker:
+    """
+    Polls ADAM controllers in a separate process, which writes the
+    samples to a `SharedSampleRing` for the owner to `read`.
+
+    The worker has its own interpreter and event loop, so garbage
+    collection, DDS traffic and command handling in the owner's process
+    cannot delay the reads. Each sample holds the
+    ``AdamModel.num_registers`` analog input registers of each device in
+    turn, NaN for a device that could not be read, and is timestamped
+    with the mean acquisition time of the devices that were read.
+
+    The process is started with the "spawn" method, since forking a
+    process that runs threads (as salobj does) is unsafe.
+
+        Parameters
+        ----------
+        devices : list of dict
+            name, ip and port of each controller, in sample order
+        sample_interval : float
+            time (sec) between samples; see `set_sample_interval`
+        capacity : int
+            number of samples the ring holds; the owner must `read` more
+            often than ``capacity * sample_interval`` to not lose samples
+        model_kwargs : dict, optional
+            other arguments of `AdamModel`, the same for every device
+        replay_sources : list of ReplaySource, optional
+            ``replay_source`` for the model of each device
+        max_concurrency : int
+            maximum number of devices read at the same time
+        clock_offset : float
+            offset (sec) to add to `time.time` to timestamp samples, e.g.
+            ``salobj.current_tai() - time.time()`` for TAI
+        log : logging.Logger, optional
+            parent logger
+
+        Attributes
+        ----------
+        ring : SharedSampleRing
+            the samples, or None if not started
+        process : multiprocessing.Process
+            the worker process, or None if not started
+    """
+
+    def __init__(
+        self,
+        devices,
+        sample_interval,
+        capacity,
+        model_kwargs=None,
+        replay_sources=None,
+        max_concurrency=8,
+        clock_offset=0,
+        log=None,
+    ):
+        self.devices = [
+            (device["name"], device["ip"], device["port"]) for device in devices
+        ]
+        self.sample_interval = sample_interval
+        self.capacity = capacity
+        self.model_kwargs = dict() if model_kwargs is None else dict(model_kwargs)
+        if replay_sources is None:
+            replay_sources = [None] * len(devices)
+        self.replay_sources = list(replay_sources)
+        self.max_concurrency = max_concurrency
+        self.clock_offset = clock_offset
+        self.num_values = len(devices) * AdamModel.num_registers
+        self.ring = None
+        self.process = None
+
+        if log is None:
+            self.log = logging.getLogger(type(self).__name__)
+        else:
+            self.log = log.getChild(type(self).__name__)
+
+    @property
+    def alive(self):
+        """Is the worker process running?"""
+        return self.process is not None and self.process.is_alive()
+
+    def device_slices(self):
+        """Return a dict of device name: slice of its registers in a
+        sample.
+        """
+        size = AdamModel.num_registers
+        return {
+            name: slice(i * size, (i + 1) * size)
+            for i, (name, ip, port) in enumerate(self.devices)
+        }
+
+    async def start(self, timeout=10):
+        """Start the worker and wait until it has connected.
+
+        Raises
+        ------
+        RuntimeError
+            If the worker cannot connect to any device, or exits or
+            does not connect within ``timeout`` seconds.
+        """
+        if self.process is not None:
+            raise RuntimeError("Already started")
+        self.ring = SharedSampleRing(self.capacity, self.num_values)
+        context = multiprocessing.get_context("spawn")
+        try:
+            self.process = context.Process(
+                target=run_acquisition,
+                name="AdamAcquisitionWorker",
+                args=(
+                    self.ring.name,
+                    self.capacity,
+                    self.devices,
+                    self.sample_interval,
+                    self.model_kwargs,
+                    self.replay_sources,
+                    self.max_concurrency,
+                    self.clock_offset,
+                    self.log.getEffectiveLevel(),
+                ),
+                daemon=True,
+            )
+            self.process.start()
+        except Exception:
+            # free the shared memory, which would otherwise outlive us
+            self.process = None
+            self.ring.close()
+            self.ring.unlink()
+            self.ring = None
+            raise
+        header = self.ring._header
+        t0 = time.monotonic()
+        while header[_STATE] == _STARTING:
+            if not self.process.is_alive() or time.monotonic() - t0 > timeout:
+                break
+            await asyncio.sleep(0.01)
+        if header[_STATE] != _RUNNING:
+            await self.stop()
+            raise RuntimeError(
+                "Acquisition worker could not connect to any device "
+                f"of {[device[0] for device in self.devices]}."
+            )
+        self.log.info(f"Acquisition worker started; pid={self.process.pid}")
+
+    def set_sample_interval(self, sample_interval):
+        """Change the time (sec) between samples.
+
+        The worker picks up the change at its next sample; if it is
+        restarted, it starts with the new interval.
+        """
+        if sample_interval <= 0:
+            raise ValueError(f"sample_interval={sample_interval} must be > 0")
+        self.sample_interval = sample_interval
+        if self.ring is not None:
+            self.ring._header[_INTERVAL] = round(sample_interval * 1e9)
+
+    def read(self):
+        """Return the samples acquired since the last read; see
+        `SharedSampleRing.read`.
+        """
+        return self.ring.read()
+
+    async def stop(self, timeout=5):
+        """Stop the worker, killing it if it does not stop within
+        ``timeout`` seconds, and free the ring.
+        """
+        if self.process is None:
+            return
+        self.ring._header[_STOP] = 1
+        t0 = time.monotonic()
+        while self.process.is_alive() and time.monotonic() - t0 < timeout:
+            await asyncio.sleep(0.01)
+        if self.process.is_alive():
+            self.log.warning("Acquisition worker did not stop; killing it")
+            self.process.kill()
+        self.process.join()
+        self.process.close()
+        self.process = None
+        self.ring.close()
+        self.ring.unlink()
+        self.ring = None
+
+
+def run_acquisition(
+    ring_name,
+    capacity,
+    devices,
+    sample_interval,
+    model_kwargs,
+    replay_sources,
+    max_concurrency,
+    clock_offset,
+    log_level,
+):
+    """Main function of the `AcquisitionWorker` process."""
+    logging.basicConfig(level=log_level)
+    log = logging.getLogger("AdamAcquisitionWorker")
+    ring = SharedSampleRing.attach(
+        ring_name, capacity, len(devices) * AdamModel.num_registers
+    )
+    try:
+        asyncio.run(
+            _acquire(
+                ring,
+                devices,
+                sample_interval,
+                model_kwargs,
+                replay_sources,
+                max_concurrency,
+                clock_offset,
+                log,
+            )
+        )
+    except Exception:
+        log.exception("Acquisition failed")
+        ring._header[_STATE] = _FAILED
+    finally:
+        ring.close()
+
+
+async def _acquire(
+    ring,
+    devices,
+    sample_interval,
+    model_kwargs,
+    replay_sources,
+    max_concurrency,
+    clock_offset,
+    log,
+):
+    def clock():
+        return time.time() + clock_offset
+
+    poller = AdamPoller(
+        {
+            name: AdamModel(
+                ip,
+                port,
+                log=log,
+                clock=clock,
+                replay_source=replay_source,
+                **model_kwargs,
+            )
+            for (name, ip, port), replay_source in zip(devices, replay_sources)
+        },
+        max_concurrency=max_concurrency,
+        log=log,
+    )
+    header = ring._header
+    try:
+        await poller.connect()
+        header[_STATE] = _RUNNING
+        size = AdamModel.num_registers
+        slices = [
+            (model, slice(i * size, (i + 1) * size))
+            for i, model in enumerate(poller.models.values())
+        ]
+        sample = np.full(ring.num_values, np.nan)
+        scheduler = FixedRateScheduler(sample_interval)
+        while header[_STOP] == 0:
+            # a requested sample interval, in ns, or 0 for no change
+            interval = header[_INTERVAL] / 1e9
+            if interval > 0 and interval != scheduler.interval:
+                scheduler.set_interval(interval)
+            await scheduler.wait()
+            results = await poller.poll()
+            read_time_sum = 0
+            num_read = 0
+            sample.fill(np.nan)
+            for (model, registers), result in zip(slices, results.values()):
+                if isinstance(result, Exception):
+                    continue
+                sample[registers] = result[:size]
+                read_time_sum += model.last_read_time
+                num_read += 1
+            timestamp = read_time_sum / num_read if num_read > 0 else clock()
+            ring.append(timestamp, sample)
+    finally:
+        await poller.close()
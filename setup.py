@@ -33,7 +33,11 @@ setuptools.setup(
     packages=setuptools.find_namespace_packages(where="python"),
     package_dir={"": "python"},
     package_data={"": ["*.rst", "*.yaml"]},
-    scripts=["bin/run_adamSensors.py"],
+    scripts=[
+        "bin/run_adamSensors.py",
+        "bin/run_adamSimulator.py",
+        "bin/replay_adamSpool.py",
+    ],
     tests_require=test_reqs,
     license="GPL",
     project_urls={
@@ -0,0 +1,13 @@
+from lsst.ts import adamSensors
+
+
+def make_models(n, request_timeout=2):
+    """Make ``n`` models of mock ADAM devices, named adam0, adam1, ...,
+    for an `AdamPoller`.
+    """
+    return {
+        f"adam{i}": adamSensors.AdamModel(
+            "fakeIP", 502 + i, simulation_mode=True, request_timeout=request_timeout
+        )
+        for i in range(n)
+    }
@@ -0,0 +1,193 @@
+import time
+import unittest
+
+import numpy as np
+import pytest
+
+from lsst.ts import adamSensors
+
+SLOW_INTERVAL = 0.1
+FAST_INTERVAL = 0.01
+PUBLISH_INTERVAL = 0.5
+
+
+def run_profile(adaptive_rate, waveform, duration, noise=0):
+    """Sample a waveform of time (sec) as the telemetry loop does, in
+    simulated time, publishing a window every `PUBLISH_INTERVAL`.
+
+    Returns
+    -------
+    intervals : list of tuple
+        (start time, sample interval) of each window after the first
+    """
+    rng = np.random.default_rng(3)
+    intervals = []
+    t = 0
+    while t < duration:
+        num_samples = max(1, round(PUBLISH_INTERVAL / adaptive_rate.interval))
+        times = t + adaptive_rate.interval * np.arange(num_samples)
+        values = np.array([waveform(sample_time) for sample_time in times], dtype=float)
+        values += rng.normal(scale=noise, size=num_samples) if noise else 0
+        statistics = adamSensors.channel_statistics(values[:, np.newaxis])
+        adaptive_rate.update(statistics, float(np.mean(times)))
+        t = times[-1] + adaptive_rate.interval
+        intervals.append((round(t, 6), adaptive_rate.interval))
+    return intervals
+
+
+def interval_at(intervals, t):
+    """Return the sample interval of the first window starting after
+    time t.
+    """
+    for end_time, interval in intervals:
+        if end_time > t:
+            return interval
+    return intervals[-1][1]
+
+
+class AdaptiveRateTestCase(unittest.TestCase):
+    def make_adaptive_rate(self, activity, hold_time=2):
+        return adamSensors.AdaptiveRate(
+            [activity],
+            slow_interval=SLOW_INTERVAL,
+            fast_interval=FAST_INTERVAL,
+            hold_time=hold_time,
+        )
+
+    def test_step(self):
+        adaptive_rate = self.make_adaptive_rate(dict(rate=1))
+        intervals = run_profile(
+            adaptive_rate, adamSensors.step_waveform(0, 5, step_time=5), duration=15
+        )
+        assert interval_at(intervals, 4.5) == SLOW_INTERVAL
+        # fast from the window after the step until hold_time after the
+        # step is no longer seen
+        assert interval_at(intervals, 5.6) == FAST_INTERVAL
+        assert interval_at(intervals, 7) == FAST_INTERVAL
+        assert interval_at(intervals, 9) == SLOW_INTERVAL
+        assert adaptive_rate.num_changes == 2
+        assert not adaptive_rate.active
+
+    def test_ramp(self):
+        """A ramp of 2 V/sec from t=5 to 15: one tooth of the sawtooth."""
+        sawtooth = adamSensors.ramp_waveform(start=-10, end=10, period=10)
+
+        def ramp(t):
+            return sawtooth(min(max(t - 5, 0), 9.99))
+
+        adaptive_rate = self.make_adaptive_rate(dict(rate=1))
+        intervals = run_profile(adaptive_rate, ramp, duration=25)
+        assert interval_at(intervals, 4) == SLOW_INTERVAL
+        for t in (6, 10, 14, 16):
+            assert interval_at(intervals, t) == FAST_INTERVAL
+        assert interval_at(intervals, 18) == SLOW_INTERVAL
+        assert adaptive_rate.num_changes == 2
+        # the measured rate of the ramp
+        adaptive_rate = self.make_adaptive_rate(dict(rate=1))
+        run_profile(adaptive_rate, ramp, duration=8)
+        assert adaptive_rate.rate[0] == pytest.approx(2, rel=0.01)
+
+    def test_std(self):
+        """Noise above the std threshold is activity, below it is not."""
+        flat = adamSensors.constant_waveform(1)
+        adaptive_rate = self.make_adaptive_rate(dict(std=0.1), hold_time=0)
+        intervals = run_profile(adaptive_rate, flat, duration=5, noise=0.01)
+        assert adaptive_rate.num_changes == 0
+        intervals = run_profile(adaptive_rate, flat, duration=5, noise=1)
+        assert {interval for _, interval in intervals} == {FAST_INTERVAL}
+
+    def test_nan(self):
+        adaptive_rate = self.make_adaptive_rate(dict(rate=1, std=0.1))
+        statistics = adamSensors.channel_statistics(np.full((5, 1), np.nan))
+        for t in range(5):
+            assert not adaptive_rate.update(statistics, t)
+        assert not adaptive_rate.active
+
+    def test_disabled(self):
+        # no fast interval
+        adaptive_rate = adamSensors.AdaptiveRate([dict(rate=1)], SLOW_INTERVAL)
+        assert not adaptive_rate.enabled
+        # no thresholds
+        adaptive_rate = adamSensors.AdaptiveRate([dict()], SLOW_INTERVAL, FAST_INTERVAL)
+        assert not adaptive_rate.enabled
+        run_profile(adaptive_rate, adamSensors.step_waveform(), duration=5)
+        assert adaptive_rate.interval == SLOW_INTERVAL
+
+    def test_resume_from(self):
+        adaptive_rate = self.make_adaptive_rate(dict(rate=1))
+        run_profile(adaptive_rate, adamSensors.step_waveform(0, 5, 1), duration=2)
+        assert adaptive_rate.active
+        reloaded = self.make_adaptive_rate(dict(rate=2))
+        reloaded.resume_from(adaptive_rate)
+        assert reloaded.interval == FAST_INTERVAL
+        disabled = adamSensors.AdaptiveRate([dict()], SLOW_INTERVAL, FAST_INTERVAL)
+        disabled.resume_from(adaptive_rate)
+        assert disabled.interval == SLOW_INTERVAL
+        with pytest.raises(ValueError):
+            reloaded.resume_from(
+                adamSensors.AdaptiveRate([dict()] * 2, SLOW_INTERVAL, FAST_INTERVAL)
+            )
+
+    def test_invalid(self):
+        for args in (
+            ([dict(slope=1)], SLOW_INTERVAL, FAST_INTERVAL),
+            ([dict()], 0, 0),
+            ([dict()], SLOW_INTERVAL, SLOW_INTERVAL),
+            ([dict()], SLOW_INTERVAL, -1),
+        ):
+            with self.subTest(args=args):
+                with pytest.raises(ValueError):
+                    adamSensors.AdaptiveRate(*args)
+
+
+class AdaptiveSamplingTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_simulated_step(self):
+        """Poll a simulated controller whose input steps, changing the
+        scheduler's interval as the telemetry loop does.
+        """
+        slow_interval = 0.05
+        fast_interval = 0.005
+        publish_interval = 0.1
+        waveforms = [adamSensors.step_waveform(0, 5, step_time=0.5)]
+        waveforms += [adamSensors.constant_waveform(0)] * 5
+        adaptive_rate = adamSensors.AdaptiveRate(
+            [dict(rate=1)] + [dict()] * 5,
+            slow_interval=slow_interval,
+            fast_interval=fast_interval,
+            hold_time=0.3,
+        )
+        async with adamSensors.AdamSimulator(waveforms=waveforms) as simulator:
+            model = adamSensors.AdamModel("127.0.0.1", simulator.port)
+            await model.connect()
+            scheduler = adamSensors.FixedRateScheduler(adaptive_rate.interval)
+            sample_times = []
+            window = []
+            window_times = []
+            t0 = time.monotonic()
+            while time.monotonic() - t0 < 1.5:
+                await scheduler.wait()
+                volts = await model.read_voltage()
+                sample_times.append(time.monotonic() - t0)
+                window_times.append(sample_times[-1])
+                window.append(volts[:6])
+                if len(window) * scheduler.interval < publish_interval:
+                    continue
+                statistics = adamSensors.channel_statistics(np.array(window))
+                adaptive_rate.update(statistics, np.mean(window_times))
+                window = []
+                window_times = []
+                scheduler.set_interval(adaptive_rate.interval)
+            await model.close()
+
+        sample_times = np.array(sample_times)
+        assert adaptive_rate.num_changes == 2
+        # slow before the step, then fast for at least hold_time
+        num_before_step = np.sum(sample_times < 0.5)
+        assert num_before_step < 0.5 / slow_interval + 2
+        num_fast = np.sum(np.diff(sample_times) < slow_interval / 2)
+        assert num_fast > 0.3 / fast_interval / 2
+        assert np.diff(sample_times)[-1] > slow_interval / 2
+
+
+if __name__ == "__main__":
+    unittest.main()
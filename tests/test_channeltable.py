@@ -0,0 +1,149 @@
+import types
+import unittest
+
+import numpy as np
+import pytest
+from lsst.ts import adamSensors
+
+from topic_helpers import make_topic_owner
+
+
+def make_config(**kwargs):
+    """Make a configuration with the schema defaults."""
+    properties = adamSensors.CONFIG_SCHEMA["properties"]
+    config = {name: properties[name].get("default") for name in properties}
+    config.update(kwargs)
+    return types.SimpleNamespace(**config)
+
+
+class ChannelTableTestCase(unittest.TestCase):
+    def make_table(self, config):
+        return adamSensors.ChannelTable.from_config(
+            config, adamSensors.configured_devices(config)
+        )
+
+    def test_analog_input_settings(self):
+        config = make_config(
+            devices=[
+                dict(name="a", ip="1.2.3.4", channels=[0, 2]),
+                dict(name="b", ip="1.2.3.5", channels=[5, 1]),
+            ],
+            analog_input_1_type="Pressure",
+            analog_input_1_coefficients=[2.0, 0.0],
+        )
+        table = self.make_table(config)
+        assert table.num_channels == adamSensors.NUM_ANALOG_INPUT_SETTINGS
+        assert [spec.device for spec in table.specs] == [
+            "a",
+            "b",
+            "a",
+            None,
+            None,
+            "b",
+        ]
+        assert table.device_map["a"][0].tolist() == [0, 2]
+        assert table.device_map["a"][1].tolist() == [0, 1]
+        assert table.device_map["b"][0].tolist() == [1, 5]
+        assert table.device_map["b"][1].tolist() == [1, 0]
+        assert table.fields == list(range(6))
+        assert table.make_converter().convert([0, 0, 0, 0, 0, 0])[1] == -20
+
+        config.devices[1]["channels"] = [2]
+        with pytest.raises(ValueError):
+            self.make_table(config)
+
+    def test_channel_list(self):
+        """Eight channels of two 8-input controllers, not all published."""
+        channels = [
+            dict(device="a", register=i, type="Pressure", field=i) for i in range(6)
+        ]
+        channels += [
+            dict(device="a", register=7, type="None"),
+            dict(
+                device="b",
+                register=3,
+                type="Temperature",
+                field=0,
+                coefficients=[10.0, 0.0],
+                deadband=1,
+                max_silence=10,
+                limits=dict(alarm_high=5),
+                filter=dict(median_length=3),
+                activity=dict(rate=2),
+            ),
+        ]
+        config = make_config(
+            devices=[dict(name="a", ip="1.2.3.4"), dict(name="b", ip="1.2.3.5")],
+            channels=channels,
+        )
+        table = self.make_table(config)
+        assert table.num_channels == 8
+        assert table.device_map["a"][1].tolist() == [0, 1, 2, 3, 4, 5, 7]
+        assert table.device_map["b"][0].tolist() == [7]
+        assert table.device_map["b"][1].tolist() == [3]
+        assert table.names[5:] == ["pressure_ch5", "channel_6", "temp_ch0"]
+
+        converter = table.make_converter()
+        assert converter.num_channels == 8
+        values = converter.volts_to_units(np.ones(8))
+        assert values[7] == 10
+
+        owner = make_topic_owner()
+        plan = table.make_publish_plan(owner)
+        plan.publish(values)
+        assert owner.tel_pressure.published == [
+            {f"pressure_ch{i}": 1.0 for i in range(6)}
+        ]
+        assert owner.tel_temperature.published == [dict(temp_ch0=10.0)]
+        # within the deadband
+        plan.publish(values + 0.5)
+        assert len(owner.tel_temperature.published) == 1
+        # the channel's own max_silence overrides the default of 60 sec
+        assert plan.change_filter.max_silence.tolist() == [60] * 7 + [10]
+        plan.publish(values + 0.5, time=10)
+        assert len(owner.tel_temperature.published) == 2
+
+        checker = table.make_limit_checker()
+        assert checker.check(values, 0).tolist() == [7]
+        assert checker.severity[7] == 2
+
+        channel_filter = table.make_filter(sample_interval=0.01)
+        assert [stage.channels.tolist() for stage in channel_filter.stages] == [[7]]
+
+        adaptive_rate = table.make_adaptive_rate(1, fast_interval=0.1)
+        assert adaptive_rate.enabled
+        assert adaptive_rate.max_rate[7] == 2
+
+    def test_default_device(self):
+        config = make_config(channels=[dict(type="Pressure"), dict(register=4)])
+        table = self.make_table(config)
+        assert table.device_map["adam"][1].tolist() == [0, 4]
+
+    def test_invalid(self):
+        two_devices = [dict(name="a", ip="1.2.3.4"), dict(name="b", ip="1.2.3.5")]
+        for kwargs in (
+            # no device given, and more than one
+            dict(devices=two_devices, channels=[dict(register=0)]),
+            # unknown device
+            dict(channels=[dict(device="c")]),
+            # shared register
+            dict(channels=[dict(register=1), dict(register=1)]),
+            # duplicate device names
+            dict(devices=two_devices[:1] * 2),
+        ):
+            with self.subTest(kwargs=kwargs):
+                with pytest.raises(ValueError):
+                    self.make_table(make_config(**kwargs))
+
+        # published to a field that does not exist, or twice
+        for channels in (
+            [dict(register=i, type="Pressure") for i in range(7)],
+            [dict(register=i, type="Pressure", field=2) for i in range(2)],
+        ):
+            table = self.make_table(make_config(channels=channels))
+            with pytest.raises(ValueError):
+                table.make_publish_plan(make_topic_owner())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import numpy as np
+import pytest
+from lsst.ts import adamSensors
+
+
+COEFFICIENTS = [[1.0, 0.0], [2.0, -3.0], [0.5, 1.0, -2.0], [344738.0, 0.0], [7.0], []]
+
+
+class ConverterTestCase(unittest.TestCase):
+    def test_counts_to_volts(self):
+        converter = adamSensors.ChannelConverter(COEFFICIENTS)
+        volts = converter.counts_to_volts([0, 65535, 32767.5, 0, 0, 0, 1, 2])
+        assert volts.shape == (6,)
+        assert volts[0] == pytest.approx(-10)
+        assert volts[1] == pytest.approx(10)
+        assert volts[2] == pytest.approx(0)
+
+    def test_matches_poly1d(self):
+        converter = adamSensors.ChannelConverter(COEFFICIENTS)
+        counts = np.array([123, 4567, 32768, 50000, 65535, 0, 11, 12])
+        model = adamSensors.AdamModel("fakeIP", 502, simulation_mode=True)
+        expected = [
+            np.poly1d(coeffs)(model.counts_to_volts(count))
+            for coeffs, count in zip(COEFFICIENTS, counts)
+        ]
+        np.testing.assert_allclose(converter.convert(counts), expected)
+
+    def test_batch(self):
+        converter = adamSensors.ChannelConverter(COEFFICIENTS)
+        rng = np.random.default_rng(42)
+        batch = rng.integers(0, 65536, size=(100, 8))
+        values = converter.convert(batch)
+        assert values.shape == (100, 6)
+        for counts, row in zip(batch, values):
+            np.testing.assert_allclose(converter.convert(counts), row)
+
+    def test_nan_propagates(self):
+        converter = adamSensors.ChannelConverter(COEFFICIENTS)
+        counts = np.full(6, np.nan)
+        counts[1] = 0
+        values = converter.convert(counts)
+        assert values[1] == pytest.approx(-23)
+        assert np.isnan(values[0])
+
+    def test_bad_coefficients(self):
+        with pytest.raises(ValueError):
+            adamSensors.ChannelConverter([])
+        with pytest.raises(ValueError):
+            adamSensors.ChannelConverter([[], []])
+
+    def test_calibration_kinds(self):
+        calibrations = [
+            dict(),
+            dict(kind="log10"),
+            dict(kind="table", table=[[-10, 0], [0, 100], [5, 110], [10, 150]]),
+            dict(kind="rtd", coefficients=[10.0, 100.0]),
+            dict(kind="thermocouple", coefficients=[1000.0, 0.0]),
+            dict(
+                kind="thermocouple",
+                coefficients=[1000.0, 0.0],
+                thermocouple_type="T",
+                reference_temperature=25,
+            ),
+        ]
+        converter = adamSensors.ChannelConverter(
+            [[2.0, -3.0], [1.0, -5.0], [1.0, 0.0], [], [], []],
+            calibrations=calibrations,
+        )
+        assert converter.kinds == [
+            "polynomial",
+            "log10",
+            "table",
+            "rtd",
+            "thermocouple",
+            "thermocouple",
+        ]
+        volts = np.array(
+            [
+                [1.0, 2.0, -5.0, 0.0, 0.004096, 0.0],
+                [-1.0, -1.0, 2.5, 3.85055, 0.041276, 0.009288 - 0.000992],
+                [0.0, 0.0, 12.0, -8.148, -0.005891, 0.0],
+            ]
+        )
+        values = converter.volts_to_units(volts)
+        # NIST ITS-90 and IEC 60751 reference values
+        np.testing.assert_allclose(
+            values,
+            [
+                [-1, 1e-3, 50, 0, 100, 25],
+                [-5, 1e-6, 105, 100, 1000, 200],
+                [-3, 1e-5, 166, -200, -200, 25],
+            ],
+            rtol=1e-6,
+            atol=0.07,
+        )
+        for row, volts_row in zip(values, volts):
+            np.testing.assert_allclose(converter.volts_to_units(volts_row), row)
+
+        volts[0, :] = np.nan
+        assert np.isnan(converter.volts_to_units(volts)[0]).all()
+
+    def test_thermocouple_emf(self):
+        for thermocouple_type, temperature, emf in (
+            ("K", 100, 4.096),
+            ("K", 1000, 41.276),
+            ("T", 200, 9.288),
+        ):
+            assert adamSensors.thermocouple_emf(
+                temperature, thermocouple_type
+            ) == pytest.approx(emf, abs=1e-3)
+        with pytest.raises(ValueError):
+            adamSensors.thermocouple_emf(-10, "K")
+
+    def test_bad_calibrations(self):
+        for calibration in (
+            dict(kind="spline"),
+            dict(kind="table", table=[[0, 1]]),
+            dict(kind="table", table=[[0, 1], [0, 2]]),
+            dict(kind="rtd", r0=0),
+            dict(kind="thermocouple", thermocouple_type="Q"),
+        ):
+            with self.subTest(calibration=calibration):
+                with pytest.raises(ValueError):
+                    adamSensors.ChannelConverter(
+                        [[1.0, 0.0]], calibrations=[calibration]
+                    )
+        with pytest.raises(ValueError):
+            adamSensors.ChannelConverter([[1.0, 0.0]] * 2, calibrations=[dict()])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,12 @@
 import unittest
+import unittest.mock
 import asyncio
 import pathlib
+import tempfile
+import threading
+import time
+
+import numpy as np
 
 from lsst.ts import salobj
 from lsst.ts import adamSensors
@@ -10,6 +16,22 @@ STD_TIMEOUT = 15  # standard command timeout (sec)
 TEST_CONFIG_DIR = pathlib.Path(__file__).parents[1].joinpath("tests", "data", "config")
 
 
+def high_rate_channels(settings):
+    """Return the channels of high_rate_config.yaml as a ``channels``
+    list, for `AdamCSC.reload_channels`.
+
+    Parameters
+    ----------
+    settings : dict of int: dict
+        extra settings of some channels, keyed by channel index
+    """
+    types = ["Pressure"] * 5 + ["Temperature"]
+    return [
+        dict(type=sensor_type, **settings.get(i, dict()))
+        for i, sensor_type in enumerate(types)
+    ]
+
+
 class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
     def basic_make_csc(self, initial_state, config_dir, simulation_mode):
         return adamSensors.adamSensorsCSC.AdamCSC(
@@ -82,6 +104,700 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
             )
             self.assertNotEqual(temp_data1.temp_ch5, temp_data2.temp_ch5)
 
+    async def test_multiple_devices(self):
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="multi_device_config.yaml",
+            )
+            self.assertEqual(set(self.csc.poller.models), {"adam_a", "adam_b"})
+            # inputs 1 and 2 of each device are -10 and 10 volts
+            await self.assert_next_sample(
+                pressure_ch1=-10,
+                pressure_ch2=10,
+                pressure_ch4=-10,
+                topic=self.remote.tel_pressure,
+                flush=True,
+            )
+            await self.assert_next_sample(
+                temp_ch5=10, topic=self.remote.tel_temperature, flush=True
+            )
+
+    async def test_high_rate_decimation(self):
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="high_rate_config.yaml",
+            )
+            await self.assert_next_sample(
+                pressure_ch1=-10,
+                pressure_ch2=10,
+                topic=self.remote.tel_pressure,
+                flush=True,
+            )
+            stats = self.csc.statistics
+            # 100 samples per published value, most of which must be there
+            self.assertGreater(stats.count[1], 80)
+            self.assertAlmostEqual(stats.std[1], 0)
+            self.assertLessEqual(stats.min[0], stats.mean[0])
+            self.assertLessEqual(stats.mean[0], stats.max[0])
+
+            timestamps, values = self.csc.get_recent_samples(num_samples=50)
+            self.assertEqual(values.shape, (50, 6))
+            self.assertTrue(np.all(np.diff(timestamps) > 0))
+            np.testing.assert_allclose(values[:, 2], 10)
+            timestamps, values = self.csc.get_recent_samples(since=timestamps[-10])
+            self.assertGreaterEqual(len(timestamps), 10)
+
+            latencies = self.csc.get_latency_summary()
+            self.assertEqual(list(latencies), list(self.csc.latency_stages))
+            self.assertGreater(latencies["read"]["count"], 80)
+            self.assertGreater(latencies["publish"]["count"], 0)
+            self.assertLessEqual(latencies["read"]["p50"], latencies["read"]["max"])
+
+            link_latency = self.csc.get_link_latency()
+            self.assertEqual(list(link_latency), ["adam"])
+            self.assertGreater(link_latency["adam"]["count"], 80)
+            self.assertGreaterEqual(link_latency["adam"]["srtt"], 0)
+            # samples are stamped with their acquisition time, which is
+            # before they are stored
+            model = self.csc.poller.models["adam"]
+            self.assertLessEqual(timestamps[-1], salobj.current_tai())
+            self.assertLessEqual(model.last_read_time, salobj.current_tai())
+
+    async def test_instrumentation_overhead(self):
+        """Timing the stages of the telemetry loop must cost little CPU
+        time per cycle compared to the loop without it.
+        """
+        with tempfile.TemporaryDirectory() as tempdir:
+            config = (TEST_CONFIG_DIR / "high_rate_config.yaml").read_text()
+            for enabled in ("true", "false"):
+                path = pathlib.Path(tempdir) / f"instrumentation_{enabled}.yaml"
+                path.write_text(config + f"instrumentation_enabled: {enabled}\n")
+
+            async with self.make_csc(
+                initial_state=salobj.State.STANDBY,
+                config_dir=tempdir,
+                simulation_mode=1,
+            ):
+
+                async def cpu_time_per_cycle(enabled, duration=1):
+                    await salobj.set_summary_state(
+                        self.remote,
+                        salobj.State.ENABLED,
+                        settingsToApply=f"instrumentation_{enabled}.yaml",
+                    )
+                    client = self.csc.poller.models["adam"].client
+                    await asyncio.sleep(0.2)
+                    num_requests0 = client.num_requests
+                    cpu0 = time.process_time()
+                    await asyncio.sleep(duration)
+                    cpu_time = time.process_time() - cpu0
+                    num_cycles = client.num_requests - num_requests0
+                    await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+                    self.assertGreater(num_cycles, 50)
+                    return cpu_time / num_cycles
+
+                # take the cheapest of several alternating runs, to reduce
+                # the noise of the rest of the process (e.g. DDS)
+                enabled_times = []
+                disabled_times = []
+                for i in range(3):
+                    enabled_times.append(await cpu_time_per_cycle("true"))
+                    disabled_times.append(await cpu_time_per_cycle("false"))
+                overhead = min(enabled_times) / min(disabled_times) - 1
+                # it is about 1%; the margin is for noise
+                self.assertLess(overhead, 0.2, f"overhead {overhead:.1%}")
+
+    async def test_read_diagnostics(self):
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="diagnostics_config.yaml",
+            )
+            await self.assert_next_sample(
+                pressure_ch1=-10,
+                pressure_ch2=10,
+                topic=self.remote.tel_pressure,
+                flush=True,
+            )
+            snapshot = self.csc.get_device_snapshots()["adam"]
+            self.assertEqual(snapshot["analog_input_status"].tolist(), [0] * 6)
+            self.assertEqual(snapshot["digital_inputs"].tolist(), [False, False])
+
+    async def test_deadband(self):
+        """Unchanged values are not published every cycle."""
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="deadband_config.yaml",
+            )
+            await self.assert_next_sample(
+                pressure_ch1=-10,
+                pressure_ch2=10,
+                topic=self.remote.tel_pressure,
+            )
+            await asyncio.sleep(2)
+            plan = self.csc.publish_plan
+            # 20 publish cycles, between which no channel changes by 1 V
+            self.assertGreater(plan.num_suppressed["tel_pressure"], 10)
+            self.assertGreater(plan.num_suppressed["tel_temperature"], 10)
+            self.assertGreaterEqual(plan.num_sent["tel_pressure"], 1)
+
+    async def test_replay(self):
+        """Simulation mode 1 plays back a recording from a spool."""
+        with tempfile.TemporaryDirectory() as tempdir:
+            spool_dir = pathlib.Path(tempdir) / "spool"
+            writer = adamSensors.SpoolWriter(spool_dir, 6)
+            counts = np.array([32768, 0, 65535, 32768, 0, 65535])
+            for i in range(100):
+                writer.append(1600000000 + i * 0.1, counts)
+            await writer.close()
+            config_dir = pathlib.Path(tempdir) / "config"
+            config_dir.mkdir()
+            config = (TEST_CONFIG_DIR / "pytest_config.yaml").read_text()
+            config += f"replay_directory: {spool_dir}\nreplay_speed: 10\n"
+            (config_dir / "replay_config.yaml").write_text(config)
+
+            async with self.make_csc(
+                initial_state=salobj.State.STANDBY,
+                config_dir=config_dir,
+                simulation_mode=1,
+            ):
+                await salobj.set_summary_state(
+                    self.remote,
+                    salobj.State.ENABLED,
+                    settingsToApply="replay_config.yaml",
+                )
+                await self.assert_next_sample(
+                    pressure_ch1=-10,
+                    pressure_ch2=10,
+                    pressure_ch4=-10,
+                    topic=self.remote.tel_pressure,
+                    flush=True,
+                )
+                await self.assert_next_sample(
+                    temp_ch5=10, topic=self.remote.tel_temperature, flush=True
+                )
+                source = self.csc.poller.models["adam"].replay_source
+                self.assertGreater(source.num_reads, 0)
+
+    async def test_calibration(self):
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="calibration_config.yaml",
+            )
+            self.assertEqual(self.csc.converter.kinds[1:4], ["table", "log10", "rtd"])
+            data = await self.assert_next_sample(
+                topic=self.remote.tel_pressure, flush=True
+            )
+            self.assertAlmostEqual(data.pressure_ch1, 5)
+            self.assertAlmostEqual(data.pressure_ch2, 100, places=3)
+            data = await self.assert_next_sample(
+                topic=self.remote.tel_temperature, flush=True
+            )
+            self.assertAlmostEqual(data.temp_ch3, 100, places=3)
+
+    async def test_channel_list(self):
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="channel_list_config.yaml",
+            )
+            self.assertEqual(self.csc.channel_table.num_channels, 8)
+            await self.assert_next_sample(
+                pressure_ch0=-10,
+                pressure_ch1=10,
+                pressure_ch5=-10,
+                topic=self.remote.tel_pressure,
+                flush=True,
+            )
+            await self.assert_next_sample(
+                temp_ch3=-20, topic=self.remote.tel_temperature, flush=True
+            )
+            timestamps, values = self.csc.get_recent_samples(num_samples=1)
+            self.assertEqual(values.shape, (1, 8))
+
+    async def test_reload_channels(self):
+        """Channel settings can be changed without a gap in the samples."""
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="high_rate_config.yaml",
+            )
+            await self.assert_next_sample(
+                pressure_ch1=-10, topic=self.remote.tel_pressure, flush=True
+            )
+            task = self.csc.telemetry_loop_task
+            model = self.csc.poller.models["adam"]
+            client = model.client
+            reload_time = salobj.current_tai()
+
+            self.csc.reload_channels({"analog_input_1_coefficients": [2.0, 0.0]})
+            self.assertEqual(self.csc.num_reloads, 1)
+            await self.assert_next_sample(
+                pressure_ch1=-20, topic=self.remote.tel_pressure, flush=True
+            )
+            self.assertIs(self.csc.telemetry_loop_task, task)
+            self.assertIs(model.client, client)
+            self.assertEqual(model.num_reconnects, 0)
+
+            # no cycle was missed across the reload
+            timestamps, values = self.csc.get_recent_samples(since=reload_time - 0.5)
+            self.assertLess(timestamps[0], reload_time)
+            self.assertGreater(timestamps[-1], reload_time + 0.5)
+            self.assertLess(np.max(np.diff(timestamps)), 5 * 0.01)
+            self.assertFalse(np.any(np.isnan(values)))
+
+            for settings in (
+                # not a channel setting
+                dict(sample_interval=0.1),
+                # invalid
+                dict(analog_input_1_type="Humidity"),
+                # more channels than are being sampled
+                dict(channels=[dict(register=i) for i in range(7)]),
+            ):
+                with self.subTest(settings=settings):
+                    with self.assertRaises(RuntimeError):
+                        self.csc.reload_channels(settings)
+            self.assertEqual(self.csc.num_reloads, 1)
+            self.assertEqual(self.csc.config.analog_input_1_coefficients, [2.0, 0.0])
+
+    async def test_acquisition_worker(self):
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="worker_config.yaml",
+            )
+            self.assertIsNone(self.csc.poller)
+            worker = self.csc.worker
+            self.assertTrue(worker.alive)
+            await self.assert_next_sample(
+                pressure_ch1=-10,
+                pressure_ch2=10,
+                topic=self.remote.tel_pressure,
+                flush=True,
+            )
+            # 100 samples per published value, taken by the worker
+            self.assertGreater(self.csc.statistics.count[1], 80)
+            timestamps, values = self.csc.get_recent_samples(num_samples=50)
+            self.assertTrue(np.all(np.diff(timestamps) > 0))
+            np.testing.assert_allclose(values[:, 2], 10)
+
+            # the worker is stopped with the telemetry loop
+            await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+            self.assertIsNone(self.csc.worker)
+            self.assertIsNone(worker.process)
+            self.assertFalse(worker.alive)
+
+    async def test_worker_restart_fails(self):
+        """If a dead worker cannot be restarted, the CSC goes to FAULT."""
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="worker_config.yaml",
+            )
+            self.remote.evt_summaryState.flush()
+            worker = self.csc.worker
+            worker.start = unittest.mock.AsyncMock(
+                side_effect=RuntimeError("Cannot start")
+            )
+            worker.process.kill()
+            await self.assert_next_summary_state(salobj.State.FAULT)
+            await self.assert_next_sample(
+                self.remote.evt_errorCode,
+                errorCode=self.csc.worker_restart_error,
+            )
+            self.assertIsNone(self.csc.worker)
+            self.assertEqual(self.csc.num_worker_restarts, 0)
+
+    async def test_adaptive_rate(self):
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            with self.assertLogs(self.csc.log, level="INFO") as logs:
+                await salobj.set_summary_state(
+                    self.remote,
+                    salobj.State.ENABLED,
+                    settingsToApply="adaptive_config.yaml",
+                )
+                await asyncio.sleep(1)
+            self.assertTrue(self.csc.adaptive_rate.active)
+            self.assertIn(
+                "Sampling every 0.01 sec (100 Hz); active channels: pressure_ch0",
+                "\n".join(logs.output),
+            )
+            timestamps, values = self.csc.get_recent_samples(num_samples=10)
+            self.assertAlmostEqual(np.median(np.diff(timestamps)), 0.01, delta=0.003)
+
+            # AO-0 is quiet by these thresholds
+            with self.assertLogs(self.csc.log, level="INFO") as logs:
+                self.csc.reload_channels(
+                    dict(
+                        channels=[
+                            dict(type="Pressure", activity=dict(rate=100)),
+                            dict(type="Pressure"),
+                            dict(type="Pressure"),
+                        ]
+                    )
+                )
+                # still fast until activity_hold_time has passed
+                self.assertTrue(self.csc.adaptive_rate.active)
+                await asyncio.sleep(1.5)
+            self.assertFalse(self.csc.adaptive_rate.active)
+            self.assertIn("all channels quiet", "\n".join(logs.output))
+            timestamps, values = self.csc.get_recent_samples(num_samples=5)
+            self.assertAlmostEqual(np.median(np.diff(timestamps)), 0.1, delta=0.02)
+
+    async def test_limits(self):
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="high_rate_config.yaml",
+            )
+            await self.assert_next_sample(
+                pressure_ch1=-10, topic=self.remote.tel_pressure, flush=True
+            )
+            self.assertFalse(self.csc.limit_checker.enabled)
+
+            # channel 1 reads -10, channel 2 reads 10
+            with self.assertLogs(self.csc.log, level="WARNING") as logs:
+                self.csc.reload_channels(
+                    dict(
+                        channels=high_rate_channels(
+                            {
+                                1: dict(limits=dict(warning_low=-5, alarm_low=-9)),
+                                2: dict(limits=dict(warning_high=9.5)),
+                            }
+                        )
+                    )
+                )
+                await asyncio.sleep(0.1)
+            self.assertEqual(self.csc.limit_checker.severity[:3].tolist(), [0, 2, 1])
+            # each change is reported once, as soon as it happens
+            self.assertEqual(len(logs.records), 2)
+            alarm = [record for record in logs.records if record.levelname == "ERROR"]
+            self.assertIn("pressure_ch1 alarm", alarm[0].getMessage())
+            self.assertIn("limits", self.csc.get_latency_summary())
+
+            with self.assertLogs(self.csc.log, level="INFO") as logs:
+                self.csc.reload_channels(
+                    dict(
+                        channels=high_rate_channels(
+                            {2: dict(limits=dict(warning_high=9.5))}
+                        )
+                    )
+                )
+                await asyncio.sleep(0.1)
+            self.assertEqual(self.csc.limit_checker.severity[:3].tolist(), [0, 0, 1])
+            self.assertTrue(
+                any("pressure_ch1 normal" in message for message in logs.output)
+            )
+
+    async def test_filters(self):
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="high_rate_config.yaml",
+            )
+            self.assertFalse(self.csc.channel_filter.enabled)
+            self.csc.reload_channels(
+                dict(
+                    channels=high_rate_channels(
+                        {
+                            1: dict(
+                                filter=dict(median_length=5, time_constant=0.1),
+                                limits=dict(alarm_low=-20),
+                            )
+                        }
+                    )
+                )
+            )
+            self.assertTrue(self.csc.channel_filter.enabled)
+            # channel 1 reads a constant -10, which the filters keep
+            await self.assert_next_sample(
+                pressure_ch1=-10, topic=self.remote.tel_pressure, flush=True
+            )
+            await self.assert_next_sample(
+                pressure_ch1=-10, topic=self.remote.tel_pressure
+            )
+            self.assertIn("filter", self.csc.get_latency_summary())
+            self.assertEqual(self.csc.limit_checker.severity[1], 0)
+
+            with self.assertRaises(RuntimeError):
+                self.csc.reload_channels(
+                    dict(
+                        channels=high_rate_channels(
+                            {1: dict(filter=dict(median_length=0))}
+                        )
+                    )
+                )
+
+    async def test_reconnect(self):
+        """Telemetry resumes on its own after the connection drops."""
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote, salobj.State.ENABLED, settingsToApply="pytest_config.yaml"
+            )
+            await self.assert_next_sample(topic=self.remote.tel_pressure, flush=True)
+            model = self.csc.poller.models["adam"]
+            model.client.drop_connection()
+
+            # channels are NaN while the device is unavailable
+            data = await self.assert_next_sample(
+                topic=self.remote.tel_pressure, flush=True
+            )
+            self.assertTrue(np.isnan(data.pressure_ch1))
+
+            await self.assert_next_sample(
+                pressure_ch1=-10, topic=self.remote.tel_pressure, flush=True
+            )
+            self.assertEqual(model.num_reconnects, 1)
+            self.assertEqual(self.csc.summary_state, salobj.State.ENABLED)
+
+    async def test_tcp_simulator(self):
+        """Simulation mode 2 talks to local Modbus/TCP simulators."""
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=2,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="multi_device_config.yaml",
+            )
+            self.assertEqual(len(self.csc.simulators), 2)
+            data = await self.assert_next_sample(
+                topic=self.remote.tel_pressure, flush=True
+            )
+            self.assertAlmostEqual(data.pressure_ch1, -10)
+            self.assertAlmostEqual(data.pressure_ch2, 10)
+            self.assertAlmostEqual(data.pressure_ch4, -10)
+            await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+            self.assertEqual(self.csc.simulators, [])
+
+    async def test_tcp_simulator_start_fails(self):
+        """The simulators are closed if the devices cannot be connected."""
+        start_simulators = adamSensors.adamSensorsCSC.start_simulators
+        simulators = []
+
+        async def spy_start_simulators(*args, **kwargs):
+            started = await start_simulators(*args, **kwargs)
+            simulators.extend(started)
+            return started
+
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=2,
+        ):
+            for target, method_name, settings in (
+                (adamSensors.AdamPoller, "connect", "pytest_config.yaml"),
+                (adamSensors.AcquisitionWorker, "start", "worker_config.yaml"),
+            ):
+                with self.subTest(target=target.__name__):
+                    simulators.clear()
+                    with unittest.mock.patch.object(
+                        target, method_name, side_effect=RuntimeError("Cannot connect")
+                    ), unittest.mock.patch.object(
+                        adamSensors.adamSensorsCSC,
+                        "start_simulators",
+                        spy_start_simulators,
+                    ):
+                        with self.assertRaises(RuntimeError):
+                            await salobj.set_summary_state(
+                                self.remote,
+                                salobj.State.ENABLED,
+                                settingsToApply=settings,
+                            )
+                    self.assertEqual(len(simulators), 1)
+                    self.assertIsNone(simulators[0].server)
+                    self.assertEqual(self.csc.simulators, [])
+
+    async def test_warm_standby(self):
+        """The connections are kept open in STANDBY and reused by the
+        next start, which publishes at once.
+        """
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="warm_standby_config.yaml",
+            )
+            poller = self.csc.poller
+            await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+            self.assertIsNone(self.csc.poller)
+            standby_poller = self.csc.standby_poller
+            self.assertIs(standby_poller.poller, poller)
+            self.assertTrue(standby_poller.running)
+            await asyncio.sleep(0.5)
+            self.assertTrue(standby_poller.healthy)
+            for model in poller.models.values():
+                self.assertTrue(model.connected)
+
+            # the standby sample is published before a publish_interval
+            self.remote.tel_pressure.flush()
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="warm_standby_config.yaml",
+            )
+            self.assertIs(self.csc.poller, poller)
+            self.assertIsNone(self.csc.standby_poller)
+            data = await self.remote.tel_pressure.next(flush=False, timeout=0.5)
+            self.assertAlmostEqual(data.pressure_ch2, 10)
+
+            # other devices need new connections
+            await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+            await salobj.set_summary_state(
+                self.remote,
+                salobj.State.ENABLED,
+                settingsToApply="multi_device_config.yaml",
+            )
+            self.assertIsNot(self.csc.poller, poller)
+            for model in poller.models.values():
+                self.assertFalse(model.connected)
+            # which are closed in STANDBY without warm_standby
+            await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+            self.assertIsNone(self.csc.poller)
+            self.assertIsNone(self.csc.standby_poller)
+
+    async def test_warm_standby_replay(self):
+        """Connections that play back a recording are kept warm and
+        reused too.
+        """
+        with tempfile.TemporaryDirectory() as tempdir:
+            spool_dir = pathlib.Path(tempdir) / "spool"
+            writer = adamSensors.SpoolWriter(spool_dir, 6)
+            counts = np.array([32768, 0, 65535, 32768, 0, 65535])
+            for i in range(100):
+                writer.append(1600000000 + i * 0.1, counts)
+            await writer.close()
+            config_dir = pathlib.Path(tempdir) / "config"
+            config_dir.mkdir()
+            config = (TEST_CONFIG_DIR / "warm_standby_config.yaml").read_text()
+            config += f"replay_directory: {spool_dir}\nreplay_speed: 10\n"
+            (config_dir / "replay_config.yaml").write_text(config)
+
+            async with self.make_csc(
+                initial_state=salobj.State.STANDBY,
+                config_dir=config_dir,
+                simulation_mode=1,
+            ):
+                await salobj.set_summary_state(
+                    self.remote,
+                    salobj.State.ENABLED,
+                    settingsToApply="replay_config.yaml",
+                )
+                poller = self.csc.poller
+                await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+                self.assertIs(self.csc.standby_poller.poller, poller)
+
+                # configure() builds a new channel table, with new arrays
+                await salobj.set_summary_state(
+                    self.remote,
+                    salobj.State.ENABLED,
+                    settingsToApply="replay_config.yaml",
+                )
+                self.assertIs(self.csc.poller, poller)
+                await self.assert_next_sample(
+                    pressure_ch2=10, topic=self.remote.tel_pressure, flush=True
+                )
+
+    async def test_no_thread_leak(self):
+        """Repeated STANDBY -> ENABLED -> STANDBY cycles must not
+        leave threads behind.
+        """
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=1,
+        ):
+            # One warm-up cycle, so lazily created threads (e.g. the
+            # default executor) are not counted as leaks.
+            await salobj.set_summary_state(
+                self.remote, salobj.State.ENABLED, settingsToApply="pytest_config.yaml"
+            )
+            await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+            n_threads = threading.active_count()
+
+            for i in range(5):
+                await salobj.set_summary_state(
+                    self.remote,
+                    salobj.State.ENABLED,
+                    settingsToApply="pytest_config.yaml",
+                )
+                await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+
+            self.assertLessEqual(threading.active_count(), n_threads)
+
     async def test_bad_sensor_type(self):
         async with self.make_csc(
             initial_state=salobj.State.STANDBY,
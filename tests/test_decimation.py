@@ -0,0 +1,31 @@
+import unittest
+import numpy as np
+import pytest
+from lsst.ts import adamSensors
+
+
+class DecimationTestCase(unittest.TestCase):
+    def test_statistics(self):
+        rng = np.random.default_rng(3)
+        values = rng.normal(size=(200, 4))
+        stats = adamSensors.channel_statistics(values)
+        np.testing.assert_allclose(stats.mean, values.mean(axis=0))
+        np.testing.assert_allclose(stats.min, values.min(axis=0))
+        np.testing.assert_allclose(stats.max, values.max(axis=0))
+        np.testing.assert_allclose(stats.std, values.std(axis=0))
+        assert list(stats.count) == [200] * 4
+
+    def test_statistics_ignore_nan(self):
+        values = np.array([[1.0, np.nan], [3.0, np.nan], [np.nan, np.nan]])
+        stats = adamSensors.channel_statistics(values)
+        assert stats.mean[0] == pytest.approx(2)
+        assert stats.min[0] == 1
+        assert stats.max[0] == 3
+        assert stats.std[0] == pytest.approx(1)
+        assert list(stats.count) == [2, 0]
+        for field in (stats.mean, stats.min, stats.max, stats.std):
+            assert np.isnan(field[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import math
+import unittest
+
+import numpy as np
+import pytest
+
+from lsst.ts import adamSensors
+
+
+def reference_filter(samples, settings, sample_interval):
+    """Filter one channel's samples the straightforward way."""
+
+    def windows(values, length):
+        padded = np.concatenate([np.full(length - 1, values[0]), values])
+        return np.lib.stride_tricks.sliding_window_view(padded, length)
+
+    output = np.array(samples, dtype=float)
+    output = np.median(windows(output, settings.get("median_length", 1)), axis=1)
+    output = np.mean(windows(output, settings.get("average_length", 1)), axis=1)
+    if "time_constant" in settings:
+        alpha = 1 - math.exp(-sample_interval / settings["time_constant"])
+        state = output[0]
+        for i, value in enumerate(output):
+            state += alpha * (value - state)
+            output[i] = state
+    return output
+
+
+class ChannelFilterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.settings = [
+            dict(),
+            dict(median_length=5),
+            dict(median_length=3),
+            dict(average_length=4),
+            dict(time_constant=0.05),
+            dict(median_length=5, average_length=3, time_constant=0.1),
+            dict(median_length=4),
+        ]
+        rng = np.random.default_rng(7)
+        self.samples = rng.normal(size=(100, len(self.settings))).cumsum(axis=0)
+
+    def test_reference(self):
+        channel_filter = adamSensors.ChannelFilter(self.settings, 0.01)
+        assert channel_filter.enabled
+        # channels with the same settings are filtered together
+        assert len(channel_filter.stages) == 7
+        filtered = channel_filter.process(self.samples.copy())
+        for channel, settings in enumerate(self.settings):
+            expected = reference_filter(self.samples[:, channel], settings, 0.01)
+            np.testing.assert_allclose(filtered[:, channel], expected, atol=1e-12)
+
+    def test_one_sample_at_a_time(self):
+        batch_filter = adamSensors.ChannelFilter(self.settings, 0.01)
+        sample_filter = adamSensors.ChannelFilter(self.settings, 0.01)
+        expected = batch_filter.process(self.samples.copy())
+        for sample, expected_sample in zip(self.samples, expected):
+            values = sample.copy()
+            assert sample_filter.process(values) is values
+            np.testing.assert_allclose(values, expected_sample)
+
+    def test_spike_rejection(self):
+        channel_filter = adamSensors.ChannelFilter([dict(median_length=5)], 0.01)
+        samples = np.ones((20, 1))
+        samples[[5, 11, 12], 0] = 1000
+        filtered = channel_filter.process(samples)
+        assert filtered[:, 0].tolist() == [1] * 20
+
+    def test_nan(self):
+        """A failed read is NaN and the channel restarts after it."""
+        channel_filter = adamSensors.ChannelFilter(
+            [dict(average_length=4, time_constant=1), dict(median_length=3)], 0.1
+        )
+        samples = np.array(
+            [[0, 5], [0, 5], [np.nan, 5], [10, 6], [10, 6], [10, 6]], dtype=float
+        )
+        filtered = channel_filter.process(samples.copy())
+        assert filtered[:2, 0].tolist() == [0, 0]
+        assert np.isnan(filtered[2, 0])
+        # reseeded with 10, not averaged with the samples before the gap
+        assert filtered[3:, 0].tolist() == [10, 10, 10]
+        assert filtered[:, 1].tolist() == [5, 5, 5, 5, 6, 6]
+
+    def test_reset(self):
+        channel_filter = adamSensors.ChannelFilter([dict(time_constant=1)], 0.1)
+        channel_filter.process(np.zeros((5, 1)))
+        assert channel_filter.process(np.array([10.0]))[0] < 10
+        channel_filter.reset()
+        assert channel_filter.process(np.array([10.0]))[0] == 10
+
+    def test_set_sample_interval(self):
+        """The low-pass time constant stays the same in seconds."""
+        fast_filter = adamSensors.ChannelFilter([dict(time_constant=1)], 0.01)
+        slow_filter = adamSensors.ChannelFilter([dict(time_constant=1)], 0.1)
+        fast_filter.set_sample_interval(0.1)
+        samples = np.zeros((10, 1))
+        samples[1:] = 1
+        np.testing.assert_allclose(
+            fast_filter.process(samples.copy()), slow_filter.process(samples.copy())
+        )
+        with pytest.raises(ValueError):
+            fast_filter.set_sample_interval(0)
+
+    def test_no_filters(self):
+        channel_filter = adamSensors.ChannelFilter([dict()] * 3, 0.01)
+        assert not channel_filter.enabled
+        values = np.arange(3.0)
+        assert channel_filter.process(values).tolist() == [0, 1, 2]
+        # a window of 1 does nothing
+        assert not adamSensors.ChannelFilter([dict(median_length=1)], 0.01).enabled
+
+    def test_invalid(self):
+        for settings, sample_interval in (
+            ([dict(median=3)], 0.01),
+            ([dict(median_length=0)], 0.01),
+            ([dict(average_length=2.5)], 0.01),
+            ([dict(time_constant=0)], 0.01),
+            ([dict()], 0),
+        ):
+            with self.subTest(settings=settings, sample_interval=sample_interval):
+                with pytest.raises(ValueError):
+                    adamSensors.ChannelFilter(settings, sample_interval)
+
+
+if __name__ == "__main__":
+    unittest.main()
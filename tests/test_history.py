@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+import pytest
+from lsst.ts import adamSensors
+
+
+def fill(history, num_samples):
+    for i in range(num_samples):
+        history.append(100.0 + i, [i, -i])
+
+
+class HistoryTestCase(unittest.TestCase):
+    def test_last(self):
+        history = adamSensors.SampleHistory(5, 2)
+        timestamps, samples = history.last(3)
+        assert len(timestamps) == 0
+        assert samples.shape == (0, 2)
+
+        fill(history, 3)
+        assert len(history) == 3
+        timestamps, samples = history.last(10)
+        np.testing.assert_array_equal(timestamps, [100, 101, 102])
+        np.testing.assert_array_equal(samples[:, 0], [0, 1, 2])
+
+    def test_wrap(self):
+        history = adamSensors.SampleHistory(5, 2)
+        for num_samples in range(6, 17):
+            history.clear()
+            fill(history, num_samples)
+            assert len(history) == 5
+            timestamps, samples = history.last(5)
+            expected = np.arange(num_samples - 5, num_samples)
+            np.testing.assert_array_equal(samples[:, 0], expected)
+            np.testing.assert_array_equal(samples[:, 1], -expected)
+            np.testing.assert_array_equal(timestamps, 100 + expected)
+            timestamps, samples = history.last(2)
+            np.testing.assert_array_equal(samples[:, 0], expected[-2:])
+
+    def test_since(self):
+        history = adamSensors.SampleHistory(5, 2)
+        fill(history, 8)
+        timestamps, samples = history.since(105.5)
+        np.testing.assert_array_equal(timestamps, [106, 107])
+        timestamps, samples = history.since(105)
+        np.testing.assert_array_equal(samples[:, 0], [5, 6, 7])
+        timestamps, samples = history.since(0)
+        assert len(timestamps) == 5
+        timestamps, samples = history.since(200)
+        assert len(timestamps) == 0
+
+    def test_views(self):
+        history = adamSensors.SampleHistory(5, 2)
+        fill(history, 7)
+        timestamps, samples = history.last(3)
+        assert np.shares_memory(samples, history._samples)
+        assert np.shares_memory(timestamps, history._timestamps)
+        with pytest.raises(ValueError):
+            samples[0, 0] = 1
+
+    def test_bad_capacity(self):
+        with pytest.raises(ValueError):
+            adamSensors.SampleHistory(0, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
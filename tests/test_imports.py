@@ -0,0 +1,48 @@
+import unittest
+import importlib
+import subprocess
+import sys
+
+from lsst.ts import adamSensors
+
+HEAVY_MODULES = ("numpy", "pymodbus", "lsst.ts.salobj")
+
+
+def imported_heavy_modules(code):
+    """Run code in a fresh interpreter and return the heavy modules it
+    imported.
+    """
+    code += f"\nimport sys\nprint(*[m for m in {HEAVY_MODULES} if m in sys.modules])"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+class ImportTestCase(unittest.TestCase):
+    def test_lazy(self):
+        for code in (
+            "import lsst.ts.adamSensors",
+            "from lsst.ts.adamSensors import CONFIG_SCHEMA",
+            "from lsst.ts.adamSensors import plan_reads, StageLatencies",
+        ):
+            with self.subTest(code=code):
+                assert imported_heavy_modules(code) == []
+        modules = imported_heavy_modules("from lsst.ts.adamSensors import AdamModel")
+        assert set(modules) == {"numpy", "pymodbus"}
+
+    def test_names(self):
+        """The lazily loaded names are those of each submodule."""
+        for submodule, names in adamSensors._SUBMODULE_NAMES.items():
+            module = importlib.import_module(f"lsst.ts.adamSensors.{submodule}")
+            assert names == module.__all__
+            assert getattr(adamSensors, submodule) is module
+            for name in names:
+                assert getattr(adamSensors, name) is getattr(module, name)
+                assert name in dir(adamSensors)
+        with self.assertRaises(AttributeError):
+            adamSensors.no_such_name
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import math
+
+import numpy as np
+import pytest
+
+from lsst.ts import adamSensors
+
+STAGES = ("wakeup", "read", "store", "convert", "publish", "cycle")
+
+
+class InstrumentationTestCase(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = adamSensors.LatencyHistogram()
+        rng = np.random.default_rng(1)
+        durations = rng.lognormal(mean=math.log(1e-3), sigma=1, size=10000)
+        for duration in durations:
+            histogram.record(duration)
+        # one bin is 10 ** (1 / 50) - 1 = 4.7% wide
+        for percent in (50, 99):
+            assert histogram.percentile(percent) == pytest.approx(
+                np.percentile(durations, percent), rel=0.05
+            )
+        summary = histogram.summary()
+        assert summary["count"] == len(durations)
+        assert summary["max"] == durations.max()
+        assert histogram.percentile(100) == durations.max()
+
+    def test_out_of_range(self):
+        histogram = adamSensors.LatencyHistogram(min_duration=1e-6, max_duration=1)
+        for duration in (0, 1e-9, 10, 1000):
+            histogram.record(duration)
+        assert histogram.count == 4
+        assert histogram.percentile(50) == pytest.approx(1e-6)
+        assert histogram.max == 1000
+        assert histogram.percentile(100) == 1000
+
+    def test_empty_and_reset(self):
+        histogram = adamSensors.LatencyHistogram()
+        summary = histogram.summary()
+        assert summary["count"] == 0
+        assert math.isnan(summary["p50"])
+        assert math.isnan(summary["max"])
+        histogram.record(0.01)
+        histogram.reset()
+        assert histogram.count == 0
+        assert math.isnan(histogram.percentile(99))
+
+        with pytest.raises(ValueError):
+            adamSensors.LatencyHistogram(min_duration=1, max_duration=1)
+
+    def test_stage_latencies(self):
+        latencies = adamSensors.StageLatencies(STAGES)
+        latencies.record("read", 0.002)
+        latencies.record("read", 0.004)
+        summary = latencies.summary()
+        assert list(summary) == list(STAGES)
+        assert summary["read"]["count"] == 2
+        assert summary["read"]["max"] == 0.004
+        assert summary["wakeup"]["count"] == 0
+
+        report = latencies.report()
+        assert report == summary
+        assert latencies.last_report == report
+        assert latencies.summary()["read"]["count"] == 0
+        assert "read p50=" in latencies.format()
+
+        disabled = adamSensors.StageLatencies(STAGES, enabled=False)
+        disabled.record("read", 0.002)
+        assert disabled.summary()["read"]["count"] == 0
+
+    def test_round_trip_estimator(self):
+        estimator = adamSensors.RoundTripEstimator()
+        assert estimator.count == 0
+        assert math.isnan(estimator.summary()["srtt"])
+
+        estimator.update(0.010)
+        assert estimator.srtt == 0.010
+        assert estimator.rttvar == 0.005
+        assert estimator.latency == 0.005
+        assert estimator.timeout == pytest.approx(0.030)
+
+        # one slow reply barely moves the estimate
+        estimator.update(0.090)
+        assert estimator.srtt == pytest.approx(0.020)
+        assert estimator.last == 0.090
+        assert estimator.min == 0.010
+
+        # a lasting change is tracked
+        for i in range(80):
+            estimator.update(0.002)
+        assert estimator.srtt == pytest.approx(0.002, rel=0.01)
+        assert estimator.rttvar < 0.0005
+        assert estimator.min == 0.002
+        summary = estimator.summary()
+        assert summary["count"] == 82
+        assert summary["latency"] == pytest.approx(0.001, rel=0.01)
+
+        estimator.reset()
+        assert estimator.count == 0
+        assert math.isnan(estimator.min)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+import pytest
+
+from lsst.ts import adamSensors
+
+
+class LimitCheckerTestCase(unittest.TestCase):
+    def test_value_limits(self):
+        checker = adamSensors.LimitChecker(
+            [
+                dict(warning_high=10, alarm_high=20, warning_low=-10, alarm_low=-20),
+                dict(alarm_high=5),
+                dict(),
+            ]
+        )
+        assert checker.enabled
+        assert not checker.checks_rate
+
+        def check(values):
+            return checker.check(np.array(values, dtype=float), 0).tolist()
+
+        assert check([0, 0, 1e9]) == []
+        assert check([11, 0, 0]) == [0]
+        assert checker.severity.tolist() == [1, 0, 0]
+        assert check([21, 0, 0]) == [0]
+        assert checker.severity.tolist() == [2, 0, 0]
+        assert check([15, 0, 0]) == [0]
+        assert checker.severity.tolist() == [1, 0, 0]
+        assert check([-25, 0, 0]) == [0]
+        assert checker.severity.tolist() == [2, 0, 0]
+        # a channel with only an alarm limit goes straight to alarm
+        assert check([0, 6, 0]) == [0, 1]
+        assert checker.severity.tolist() == [0, 2, 0]
+        assert checker.num_changes == 6
+
+    def test_hysteresis(self):
+        checker = adamSensors.LimitChecker([dict(warning_high=10, hysteresis=1)])
+        severities = []
+        for value in (9.5, 10.5, 9.5, 10.5, 9.1, 8.9, 9.5):
+            checker.check(np.array([value]), 0)
+            severities.append(int(checker.severity[0]))
+        assert severities == [0, 1, 1, 1, 1, 0, 0]
+
+    def test_nan(self):
+        """A channel that could not be read keeps its severity."""
+        checker = adamSensors.LimitChecker([dict(alarm_low=0)])
+        assert checker.check(np.array([-1.0]), 0).tolist() == [0]
+        assert checker.check(np.array([np.nan]), 0).tolist() == []
+        assert checker.severity[0] == 2
+
+    def test_rate(self):
+        checker = adamSensors.LimitChecker(
+            [dict(warning_rate=1, alarm_rate=10), dict()], rate_interval=1
+        )
+        assert checker.checks_rate
+        # the rate is measured over a second, not between samples
+        for i, value in enumerate([0, 0.5, 2.5]):
+            checker.check(np.array([value, 0]), i * 0.5)
+        assert checker.rate[0] == pytest.approx(2.5)
+        assert checker.severity.tolist() == [1, 0]
+        assert "warning_rate=1" in checker.describe(0, 2.5)
+        # held until the next measurement
+        checker.check(np.array([2.5, 0]), 1.5)
+        assert checker.severity.tolist() == [1, 0]
+        checker.check(np.array([-20.0, 0]), 2)
+        assert checker.rate[0] == pytest.approx(-22.5)
+        assert checker.severity.tolist() == [2, 0]
+        checker.check(np.array([-20.0, 0]), 3)
+        assert checker.severity.tolist() == [0, 0]
+
+    def test_describe(self):
+        checker = adamSensors.LimitChecker([dict(warning_low=0, alarm_low=-5)])
+        checker.check(np.array([-1.0]), 0)
+        assert checker.describe(0, -1) == "warning: value=-1 below warning_low=0"
+        checker.check(np.array([-6.0]), 0)
+        assert checker.describe(0, -6) == "alarm: value=-6 below alarm_low=-5"
+        checker.check(np.array([1.0]), 0)
+        assert checker.describe(0, 1) == "normal: value=1"
+
+    def test_no_limits(self):
+        checker = adamSensors.LimitChecker([dict()] * 4)
+        assert not checker.enabled
+        assert checker.num_channels == 4
+
+    def test_invalid(self):
+        for limits in (
+            [dict(warning_hi=1)],
+            [dict(warning_low=2, warning_high=1)],
+            [dict(hysteresis=-1)],
+        ):
+            with self.subTest(limits=limits):
+                with pytest.raises(ValueError):
+                    adamSensors.LimitChecker(limits)
+        with pytest.raises(ValueError):
+            adamSensors.LimitChecker([dict()], rate_interval=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,11 @@
 import unittest
+import unittest.mock
 import asyncio
+import math
+import time
+import threading
 import pytest
+from pymodbus.exceptions import ConnectionException, ModbusException
 from lsst.ts import adamSensors
 
 
@@ -8,9 +13,95 @@ class ModelTestCase(unittest.IsolatedAsyncioTestCase):
     async def test_connect(self):
         m = adamSensors.AdamModel("fakeIP", 502, simulation_mode=True)
         assert m is not None
+        assert not m.connected
+        await m.connect()
+        assert m.connected
+        await m.close()
+        assert not m.connected
+
+    async def test_no_private_thread(self):
+        n_threads = threading.active_count()
+        m = adamSensors.AdamModel("fakeIP", 502, simulation_mode=True)
+        await m.connect()
+        await m.read_voltage()
+        await m.close()
+        assert threading.active_count() == n_threads
+
+    async def test_read_counts(self):
+        m = adamSensors.AdamModel("fakeIP", 502, simulation_mode=True)
+        await m.connect()
+        counts = await m.read_counts()
+        assert counts[1] == 0
+        assert counts[2] == 65535
+        v = await m.read_voltage()
+        assert v[1:3] == pytest.approx([-10, 10])
+
+    async def test_read_snapshot(self):
+        m = adamSensors.AdamModel(
+            "fakeIP",
+            502,
+            simulation_mode=True,
+            extra_ranges=adamSensors.ADAM6024_DIAGNOSTIC_RANGES,
+        )
+        await m.connect()
+        m.client.input_registers[10:12] = [1234, 4321]
+        m.client.discrete_inputs[1] = True
+        m.client.coils[16] = True
+        snapshot = await m.read_snapshot()
+        assert set(snapshot) == {
+            "analog_inputs",
+            "analog_output_readback",
+            "analog_input_status",
+            "digital_inputs",
+            "digital_outputs",
+        }
+        assert snapshot["analog_inputs"][1:3].tolist() == [0, 65535]
+        assert snapshot["analog_output_readback"].tolist() == [1234, 4321]
+        assert snapshot["analog_input_status"].tolist() == [0] * 6
+        assert snapshot["digital_inputs"].tolist() == [False, True]
+        assert snapshot["digital_outputs"].tolist() == [True, False]
+        assert m.last_snapshot is snapshot
+        # the 5 ranges take 4 requests, sent together
+        assert m.client.num_requests == 4
+        await m.close()
+
+    async def test_read_snapshot_refused(self):
+        m = adamSensors.AdamModel(
+            "fakeIP",
+            502,
+            simulation_mode=True,
+            extra_ranges=[adamSensors.RegisterRange("bad", "coils", 250, 10)],
+        )
+        await m.connect()
+        with pytest.raises(ModbusException):
+            await m.read_snapshot()
+        # a refused request is not a connection problem
+        assert m.connected
+        assert not m.reconnecting
+        await m.close()
+
+    async def test_read_snapshot_simulator(self):
+        async with adamSensors.AdamSimulator(latency=0.1) as simulator:
+            simulator.input_registers[10] = 1000
+            simulator.coils[17] = True
+            m = adamSensors.AdamModel(
+                simulator.host,
+                simulator.port,
+                extra_ranges=adamSensors.ADAM6024_DIAGNOSTIC_RANGES,
+            )
+            await m.connect()
+            snapshot = await m.read_snapshot()
+            # the requests are pipelined: all sent before any is answered
+            assert simulator.num_requests == 4
+            assert simulator.max_in_flight == 4
+            assert snapshot["analog_inputs"][1:3].tolist() == [0, 65535]
+            assert snapshot["analog_output_readback"].tolist() == [1000, 0]
+            assert snapshot["digital_outputs"].tolist() == [False, True]
+            await m.close()
 
     async def test_read_voltage(self):
         m = adamSensors.AdamModel("fakeIP", 502, simulation_mode=True)
+        await m.connect()
         v1 = await m.read_voltage()
 
         # check the min, max, and zero-ish values from simulator
@@ -24,6 +115,141 @@ class ModelTestCase(unittest.IsolatedAsyncioTestCase):
         v2 = await m.read_voltage()
         assert v1[0] != v2[0]
 
+    async def test_read_timestamps(self):
+        """Reads are timestamped at the midpoint of the round trip."""
+        async with adamSensors.AdamSimulator(latency=0.02) as simulator:
+            m = adamSensors.AdamModel(
+                simulator.host, simulator.port, clock=lambda: time.time() + 37
+            )
+            assert math.isnan(m.last_read_time)
+            await m.connect()
+            t0 = time.time() + 37
+            volts, read_time, round_trip = await m.read_voltage(timestamped=True)
+            t1 = time.time() + 37
+            assert volts[1:3] == pytest.approx([-10, 10])
+            assert round_trip >= 0.02
+            assert round_trip <= t1 - t0
+            assert read_time == pytest.approx((t0 + t1) / 2, abs=0.005)
+            assert (read_time, round_trip) == (m.last_read_time, m.last_round_trip)
+
+            counts, read_time2, round_trip2 = await m.read_counts(timestamped=True)
+            assert read_time2 > read_time + 0.02
+            assert m.round_trip.count == 2
+            assert m.round_trip.min == min(round_trip, round_trip2)
+            await m.close()
+
+    async def make_connected_model(self, **kwargs):
+        m = adamSensors.AdamModel(
+            "fakeIP", 502, simulation_mode=True, request_timeout=0.2, **kwargs
+        )
+        # keep the backoff short for tests
+        m.reconnect_min_interval = 0.02
+        await m.connect()
+        return m
+
+    async def wait_reconnected(self, m, timeout=5):
+        await asyncio.wait_for(m.reconnect_task, timeout=timeout)
+        assert m.connected
+
+    async def test_reconnect_after_drop(self):
+        m = await self.make_connected_model()
+        m.client.drop_connection()
+        with pytest.raises(ConnectionException):
+            await m.read_counts()
+        # reads fail fast while disconnected
+        with pytest.raises(ConnectionException):
+            await m.read_counts()
+
+        await self.wait_reconnected(m)
+        counts = await m.read_counts()
+        assert counts[2] == 65535
+        assert m.num_reconnects == 1
+        await m.close()
+
+    async def test_reconnect_after_timeout(self):
+        m = await self.make_connected_model()
+        m.client.latency = 1
+        with pytest.raises(ConnectionException):
+            await m.read_counts()
+        assert not m.connected
+        assert m.reconnecting
+        m.client.latency = 0
+        await self.wait_reconnected(m)
+        await m.read_counts()
+        await m.close()
+
+    async def test_reconnect_after_garbage(self):
+        m = await self.make_connected_model()
+        m.client.garbage_probability = 1
+        with pytest.raises(ConnectionException):
+            await m.read_counts()
+        assert m.reconnecting
+        m.client.garbage_probability = 0
+        await self.wait_reconnected(m)
+        await m.read_counts()
+        await m.close()
+
+    async def test_reconnect_after_client_error(self):
+        """A model whose client cannot be made keeps retrying."""
+        m = adamSensors.AdamModel("fakeIP", 502, simulation_mode=True)
+        m.reconnect_min_interval = 0.02
+        with unittest.mock.patch.object(
+            adamSensors.model, "MockModbusClient", side_effect=OSError("no client")
+        ):
+            with pytest.raises(OSError):
+                await m.connect()
+            assert m.client is None
+            m.start_reconnect()
+            assert m.reconnecting
+            await asyncio.sleep(0.1)
+            assert not m.connected
+        await self.wait_reconnected(m)
+        await m.read_counts()
+        await m.close()
+        # a closed model is not reconnected
+        m.start_reconnect()
+        assert not m.reconnecting
+
+    async def test_backoff(self):
+        m = await self.make_connected_model(reconnect_max_interval=0.08)
+        m.client.refuse_connections = True
+        m.client.drop_probability = 1
+        with pytest.raises(ConnectionException):
+            await m.read_counts()
+        num_attempts = m.client.num_connect_attempts
+
+        # attempts start 0.01-0.02 sec apart, and are 0.04-0.08 sec apart
+        # once the backoff saturates
+        await asyncio.sleep(0.5)
+        assert m.reconnecting
+        num_attempts = m.client.num_connect_attempts - num_attempts
+        assert 6 <= num_attempts <= 20
+
+        m.client.refuse_connections = False
+        m.client.drop_probability = 0
+        t0 = asyncio.get_running_loop().time()
+        await self.wait_reconnected(m)
+        assert asyncio.get_running_loop().time() - t0 < 0.1
+        await m.close()
+        assert not m.reconnecting
+
+    async def test_random_faults(self):
+        """Polling through random drops and garbage recovers on its own."""
+        m = await self.make_connected_model()
+        m.client.drop_probability = 0.1
+        m.client.garbage_probability = 0.1
+        num_good = 0
+        for i in range(200):
+            try:
+                await m.read_counts()
+                num_good += 1
+            except ConnectionException:
+                pass
+            await asyncio.sleep(0.005)
+        assert num_good > 0
+        assert m.num_reconnects > 0
+        await m.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import asyncio
+import pytest
+from pymodbus.exceptions import ConnectionException
+from lsst.ts import adamSensors
+
+from poller_helpers import make_models
+
+
+class PollerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_poll(self):
+        poller = adamSensors.AdamPoller(make_models(3))
+        errors = await poller.connect()
+        assert errors == {}
+        results = await poller.poll()
+        assert set(results) == {"adam0", "adam1", "adam2"}
+        for counts in results.values():
+            assert counts[1] == 0
+            assert counts[2] == 65535
+        await poller.close()
+        for model in poller.models.values():
+            assert not model.connected
+
+    async def test_reads_are_concurrent(self):
+        latency = 0.2
+        poller = adamSensors.AdamPoller(make_models(4), max_concurrency=4)
+        await poller.connect()
+        for model in poller.models.values():
+            model.client.latency = latency
+        t0 = asyncio.get_running_loop().time()
+        await poller.poll()
+        duration = asyncio.get_running_loop().time() - t0
+        assert duration < 2 * latency
+
+    async def test_bounded_concurrency(self):
+        latency = 0.1
+        poller = adamSensors.AdamPoller(make_models(4), max_concurrency=2)
+        await poller.connect()
+        for model in poller.models.values():
+            model.client.latency = latency
+        t0 = asyncio.get_running_loop().time()
+        await poller.poll()
+        duration = asyncio.get_running_loop().time() - t0
+        assert duration >= 2 * latency
+
+    async def test_failure_isolation(self):
+        poller = adamSensors.AdamPoller(make_models(3, request_timeout=0.2))
+        await poller.connect()
+        # adam1 hangs and adam2 is disconnected
+        poller.models["adam1"].client.latency = 10
+        await poller.models["adam2"].close()
+
+        t0 = asyncio.get_running_loop().time()
+        results = await poller.poll()
+        duration = asyncio.get_running_loop().time() - t0
+        assert duration < 1
+        assert results["adam0"][2] == 65535
+        assert isinstance(results["adam1"], ConnectionException)
+        assert isinstance(results["adam2"], ConnectionException)
+        assert poller.failures == {"adam0": 0, "adam1": 1, "adam2": 1}
+        await poller.close()
+
+    async def test_connect_all_fail(self):
+        poller = adamSensors.AdamPoller(
+            {"bad": adamSensors.AdamModel("127.0.0.1", 1, request_timeout=1)}
+        )
+        with pytest.raises(ConnectionException):
+            await poller.connect()
+        # but it keeps trying
+        assert poller.models["bad"].reconnecting
+        await poller.close()
+        assert not poller.models["bad"].reconnecting
+
+    def test_bad_concurrency(self):
+        with pytest.raises(ValueError):
+            adamSensors.AdamPoller(make_models(1), max_concurrency=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
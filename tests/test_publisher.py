@@ -0,0 +1,138 @@
+import unittest
+import numpy as np
+import pytest
+from lsst.ts import adamSensors
+
+from topic_helpers import make_topic_owner
+
+
+class PublishPlanTestCase(unittest.TestCase):
+    def test_publish(self):
+        owner = make_topic_owner()
+        plan = adamSensors.PublishPlan(
+            ["Pressure", "None", "Pressure", "Temperature", "None", "Temperature"],
+            owner,
+        )
+        plan.publish(np.arange(6, dtype=float))
+        assert owner.tel_pressure.published == [
+            dict(pressure_ch0=0.0, pressure_ch2=2.0)
+        ]
+        assert owner.tel_temperature.published == [dict(temp_ch3=3.0, temp_ch5=5.0)]
+
+    def test_unused_topic_not_published(self):
+        owner = make_topic_owner()
+        plan = adamSensors.PublishPlan(["Pressure"] * 6, owner)
+        plan.publish(np.zeros(6))
+        assert len(owner.tel_pressure.published) == 1
+        assert owner.tel_temperature.published == []
+
+    def test_bad_sensor_type(self):
+        with pytest.raises(ValueError):
+            adamSensors.PublishPlan(["Shmessure"], make_topic_owner())
+
+    def test_change_filter(self):
+        owner = make_topic_owner()
+        change_filter = adamSensors.ChangeFilter(
+            deadband=[1, 1, 0, 0],
+            relative_deadband=[0, 0, 0.1, 0.1],
+            max_silence=10,
+        )
+        plan = adamSensors.PublishPlan(
+            ["Pressure", "Pressure", "Temperature", "Temperature"],
+            owner,
+            change_filter=change_filter,
+        )
+        # the first values are always published
+        plan.publish(np.array([0.0, 0.0, 100.0, 100.0]), time=0)
+        # small changes are suppressed; the relative deadband is 10 of 100
+        plan.publish(np.array([0.5, -0.5, 105.0, 95.0]), time=1)
+        assert len(owner.tel_pressure.published) == 1
+        assert len(owner.tel_temperature.published) == 1
+        # one channel out of its deadband publishes its whole topic
+        plan.publish(np.array([0.5, 1.0, 105.0, 95.0]), time=2)
+        assert owner.tel_pressure.published[-1] == dict(
+            pressure_ch0=0.5, pressure_ch1=1.0
+        )
+        assert len(owner.tel_temperature.published) == 1
+        # keepalive
+        plan.publish(np.array([0.5, 1.0, 105.0, 95.0]), time=10)
+        assert len(owner.tel_pressure.published) == 2
+        assert len(owner.tel_temperature.published) == 2
+        assert plan.num_sent == dict(tel_pressure=2, tel_temperature=2)
+        assert plan.num_suppressed == dict(tel_pressure=2, tel_temperature=2)
+
+    def test_change_filter_max_silence(self):
+        change_filter = adamSensors.ChangeFilter(
+            deadband=[1, 1, 1], relative_deadband=[0, 0, 0], max_silence=[5, 20, 60]
+        )
+        values = np.zeros(3)
+        change_filter.update([0, 1, 2], values, time=0)
+        assert change_filter.due(values, time=4).tolist() == [False, False, False]
+        assert change_filter.due(values, time=5).tolist() == [True, False, False]
+        assert change_filter.due(values, time=20).tolist() == [True, True, False]
+
+        with pytest.raises(ValueError):
+            adamSensors.ChangeFilter([0, 0], [0, 0], max_silence=[1, 2, 3])
+
+    def test_change_filter_thresholds(self):
+        change_filter = adamSensors.ChangeFilter(
+            deadband=[10, 10],
+            relative_deadband=[0, 0],
+            thresholds=[[5, 8], []],
+            max_silence=100,
+        )
+        values = np.array([4.0, 4.0])
+        assert change_filter.due(values, time=0).tolist() == [True, True]
+        change_filter.update([0, 1], values, time=0)
+        assert change_filter.due(np.array([4.9, 5.1]), time=1).tolist() == [
+            False,
+            False,
+        ]
+        # crossing up or down publishes at once
+        assert change_filter.due(np.array([5.1, 5.1]), time=1).tolist() == [
+            True,
+            False,
+        ]
+        change_filter.update([0], np.array([6.0, 4.0]), time=1)
+        assert change_filter.due(np.array([4.0, 4.0]), time=2).tolist() == [
+            True,
+            False,
+        ]
+
+    def test_change_filter_nan(self):
+        change_filter = adamSensors.ChangeFilter(
+            deadband=[1, 1], relative_deadband=[0, 0], max_silence=100
+        )
+        change_filter.update([0, 1], np.array([np.nan, 1.0]), time=0)
+        # NaN to NaN is no change; a channel going NaN is
+        assert change_filter.due(np.array([np.nan, np.nan]), time=1).tolist() == [
+            False,
+            True,
+        ]
+        assert change_filter.due(np.array([1.0, 1.0]), time=1).tolist() == [
+            True,
+            False,
+        ]
+
+    def test_change_filter_default_publishes_all(self):
+        owner = make_topic_owner()
+        plan = adamSensors.PublishPlan(
+            ["Pressure"] * 2,
+            owner,
+            change_filter=adamSensors.ChangeFilter([0, 0], [0, 0]),
+        )
+        for i in range(3):
+            plan.publish(np.zeros(2), time=i)
+        assert len(owner.tel_pressure.published) == 3
+
+    def test_bad_change_filter(self):
+        with pytest.raises(ValueError):
+            adamSensors.ChangeFilter([1, 1], [0])
+        with pytest.raises(ValueError):
+            adamSensors.ChangeFilter([-1], [0])
+        with pytest.raises(ValueError):
+            adamSensors.ChangeFilter([1], [0], thresholds=[[], []])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import pytest
+from lsst.ts import adamSensors
+from lsst.ts.adamSensors import RegisterRange
+
+
+class ReadPlanTestCase(unittest.TestCase):
+    def test_merge(self):
+        requests = adamSensors.plan_reads(
+            [
+                RegisterRange("b", "input_registers", 10, 2),
+                RegisterRange("a", "input_registers", 0, 8),
+                RegisterRange("overlap", "input_registers", 4, 2),
+                RegisterRange("far", "input_registers", 100, 6),
+            ],
+            max_gap=16,
+        )
+        assert requests == [
+            adamSensors.ReadRequest(
+                "input_registers",
+                1,
+                0,
+                12,
+                (("a", 0, 8), ("overlap", 4, 2), ("b", 10, 2)),
+            ),
+            adamSensors.ReadRequest("input_registers", 1, 100, 6, (("far", 0, 6),)),
+        ]
+
+    def test_no_merge_across_tables_or_units(self):
+        requests = adamSensors.plan_reads(
+            [
+                RegisterRange("inputs", "input_registers", 0, 8),
+                RegisterRange("holding", "holding_registers", 8, 2),
+                RegisterRange("other_unit", "input_registers", 8, 2, unit=2),
+                RegisterRange("coils", "coils", 16, 2),
+                RegisterRange("discrete", "discrete_inputs", 0, 2),
+            ]
+        )
+        assert len(requests) == 5
+
+    def test_max_gap(self):
+        ranges = [
+            RegisterRange("a", "input_registers", 0, 8),
+            RegisterRange("b", "input_registers", 12, 2),
+        ]
+        assert len(adamSensors.plan_reads(ranges, max_gap=4)) == 1
+        assert len(adamSensors.plan_reads(ranges, max_gap=3)) == 2
+
+    def test_max_count(self):
+        requests = adamSensors.plan_reads(
+            [
+                RegisterRange("a", "input_registers", 0, 100),
+                RegisterRange("b", "input_registers", 100, 100),
+                RegisterRange("bits", "coils", 0, 100),
+                RegisterRange("more_bits", "coils", 100, 100),
+            ]
+        )
+        assert [(r.table, r.address, r.count) for r in requests] == [
+            ("coils", 0, 200),
+            ("input_registers", 0, 100),
+            ("input_registers", 100, 100),
+        ]
+
+    def test_adam6024_ranges(self):
+        requests = adamSensors.plan_reads(
+            [
+                adamSensors.ADAM6024_ANALOG_INPUTS,
+                *adamSensors.ADAM6024_DIAGNOSTIC_RANGES,
+            ]
+        )
+        # analog inputs and analog output readback share one request
+        assert len(requests) == 4
+
+    def test_invalid(self):
+        for ranges in (
+            [RegisterRange("a", "input_registers", 0, 1)] * 2,
+            [RegisterRange("a", "shmregisters", 0, 1)],
+            [RegisterRange("a", "input_registers", 0, 0)],
+            [RegisterRange("a", "input_registers", 0, 126)],
+        ):
+            with pytest.raises(ValueError):
+                adamSensors.plan_reads(ranges)
+
+
+if __name__ == "__main__":
+    unittest.main()
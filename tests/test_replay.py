@@ -0,0 +1,107 @@
+import unittest
+import tempfile
+import time
+
+import numpy as np
+import pytest
+from pymodbus.exceptions import ConnectionException
+from lsst.ts import adamSensors
+
+NUM_CHANNELS = 6
+
+
+def make_recording(num_samples, interval=0.1):
+    timestamps = 1600000000.0 + np.arange(num_samples) * interval
+    counts = np.arange(num_samples * NUM_CHANNELS, dtype=float).reshape(
+        num_samples, NUM_CHANNELS
+    )
+    return timestamps, counts
+
+
+class ReplaySourceTestCase(unittest.TestCase):
+    def test_step(self):
+        timestamps, counts = make_recording(3)
+        source = adamSensors.ReplaySource(timestamps, counts, speed=None)
+        assert source.num_channels == NUM_CHANNELS
+        played = [source.read().tolist() for i in range(4)]
+        assert played == counts.tolist() + counts[:1].tolist()
+        assert source.num_reads == 4
+        assert source.num_repeats == 1
+
+        source = adamSensors.ReplaySource(timestamps, counts, speed=None, repeat=False)
+        played = [source.read().tolist() for i in range(4)]
+        assert played == counts.tolist() + counts[-1:].tolist()
+        assert source.num_repeats == 0
+
+    def test_timed(self):
+        # 10 seconds of recording played in 0.1 seconds
+        timestamps, counts = make_recording(101)
+        source = adamSensors.ReplaySource(timestamps, counts, speed=100)
+        assert source.next_index() == 0
+        time.sleep(0.05)
+        assert 45 <= source.next_index() <= 80
+        time.sleep(0.07)
+        source.next_index()
+        assert source.num_repeats == 1
+
+    def test_clip(self):
+        timestamps, counts = make_recording(2)
+        counts[0, 0] = -5
+        counts[0, 1] = 70000
+        counts[0, 2] = np.nan
+        source = adamSensors.ReplaySource(timestamps, counts, speed=None)
+        sample = source.read()
+        assert sample[:2].tolist() == [0, 65535]
+        assert np.isnan(sample[2])
+
+    def test_invalid(self):
+        timestamps, counts = make_recording(3)
+        with pytest.raises(ValueError):
+            adamSensors.ReplaySource([], np.zeros((0, NUM_CHANNELS)))
+        with pytest.raises(ValueError):
+            adamSensors.ReplaySource(timestamps, counts[:2])
+        with pytest.raises(ValueError):
+            adamSensors.ReplaySource(timestamps, counts, speed=0)
+
+
+class ReplayModelTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_from_spool(self):
+        timestamps, counts = make_recording(50)
+        with tempfile.TemporaryDirectory() as directory:
+            writer = adamSensors.SpoolWriter(directory, NUM_CHANNELS)
+            for timestamp, sample in zip(timestamps, counts):
+                writer.append(timestamp, sample)
+            await writer.close()
+            source = adamSensors.ReplaySource.from_spool(
+                directory, channels=[4, 5], start=timestamps[10], speed=None
+            )
+        assert source.num_channels == 2
+        np.testing.assert_array_equal(source.read(), counts[10, 4:])
+
+    async def test_model(self):
+        """Recorded counts go through the model, one sample per read."""
+        timestamps, counts = make_recording(5)
+        counts[3, 1] = np.nan
+        source = adamSensors.ReplaySource(timestamps, counts, speed=None)
+        m = adamSensors.AdamModel(
+            "fakeIP",
+            502,
+            simulation_mode=True,
+            extra_ranges=adamSensors.ADAM6024_DIAGNOSTIC_RANGES,
+            replay_source=source,
+        )
+        await m.connect()
+        for i in range(3):
+            snapshot = await m.read_snapshot()
+            assert snapshot["analog_inputs"][:6].tolist() == counts[i].tolist()
+        # the status registers are read separately, but are not a sample
+        assert source.num_reads == 3
+
+        # a sample whose device could not be read fails the read
+        with pytest.raises(ConnectionException):
+            await m.read_counts()
+        await m.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
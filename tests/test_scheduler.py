@@ -0,0 +1,95 @@
+import unittest
+import math
+import random
+import unittest.mock
+import pytest
+from lsst.ts import adamSensors
+
+
+class FakeClock:
+    """Stands in for the asyncio module used by `FixedRateScheduler`,
+    with a loop clock that only advances when slept on.
+    """
+
+    def __init__(self):
+        self.now = 0
+
+    def get_running_loop(self):
+        return self
+
+    def time(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += max(delay, 0)
+
+
+class SchedulerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_no_drift(self):
+        """Variable work per cycle must not change the period."""
+        interval = 0.02
+        num_cycles = 50
+        clock = FakeClock()
+        with unittest.mock.patch.object(adamSensors.scheduler, "asyncio", clock):
+            scheduler = adamSensors.FixedRateScheduler(interval)
+            start_times = []
+            for i in range(num_cycles):
+                await scheduler.wait()
+                start_times.append(clock.now)
+                await clock.sleep(random.uniform(0, interval / 2))
+        assert start_times == pytest.approx([i * interval for i in range(num_cycles)])
+        assert scheduler.num_cycles == num_cycles
+        assert scheduler.num_overruns == 0
+        assert scheduler.num_missed == 0
+
+    async def test_overrun(self):
+        interval = 0.05
+        clock = FakeClock()
+        with unittest.mock.patch.object(adamSensors.scheduler, "asyncio", clock):
+            scheduler = adamSensors.FixedRateScheduler(interval)
+            await scheduler.wait()
+            # run over the next deadline and the one after it
+            await clock.sleep(interval * 2.5)
+            await scheduler.wait()
+        assert scheduler.num_overruns == 1
+        assert scheduler.num_missed == 2
+        # still on the grid
+        assert clock.now == pytest.approx(interval * 3)
+
+    async def test_report(self):
+        scheduler = adamSensors.FixedRateScheduler(0.01)
+        metrics = scheduler.report()
+        assert metrics["num_cycles"] == 0
+        assert math.isnan(metrics["mean_jitter"])
+        for i in range(5):
+            await scheduler.wait()
+        metrics = scheduler.report()
+        assert metrics["num_cycles"] == 5
+        assert 0 <= metrics["mean_jitter"] <= metrics["max_jitter"]
+        assert math.isnan(scheduler.report()["max_jitter"])
+
+    async def test_set_interval(self):
+        clock = FakeClock()
+        with unittest.mock.patch.object(adamSensors.scheduler, "asyncio", clock):
+            scheduler = adamSensors.FixedRateScheduler(0.05)
+            await scheduler.wait()
+            await scheduler.wait()
+            assert clock.now == pytest.approx(0.05)
+            scheduler.set_interval(0.01)
+            wakeups = []
+            for i in range(10):
+                await scheduler.wait()
+                wakeups.append(clock.now)
+        # the grid continues one new interval after the last deadline
+        assert wakeups == pytest.approx([0.05 + 0.01 * (i + 1) for i in range(10)])
+        assert scheduler.num_overruns == 0
+
+    def test_bad_interval(self):
+        with pytest.raises(ValueError):
+            adamSensors.FixedRateScheduler(0)
+        with pytest.raises(ValueError):
+            adamSensors.FixedRateScheduler(1).set_interval(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import asyncio
+import struct
+import pytest
+from pymodbus.exceptions import ConnectionException
+from lsst.ts import adamSensors
+
+
+class SimulatorTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_read_through_pymodbus(self):
+        async with adamSensors.AdamSimulator() as simulator:
+            m = adamSensors.AdamModel("127.0.0.1", simulator.port)
+            await m.connect()
+            counts = await m.read_counts()
+            assert len(counts) == 8
+            assert counts[1] == 0
+            assert counts[2] == 65535
+            assert counts[3] == pytest.approx(32767.5, abs=1)
+            await m.close()
+            assert simulator.num_requests == 1
+
+    async def test_waveforms(self):
+        waveforms = [
+            adamSensors.constant_waveform(5),
+            adamSensors.sine_waveform(amplitude=2, period=0.2),
+            adamSensors.ramp_waveform(period=0.3),
+            adamSensors.noise_waveform(adamSensors.constant_waveform(0), 0.5),
+            adamSensors.constant_waveform(-20),
+            adamSensors.constant_waveform(20),
+        ]
+        async with adamSensors.AdamSimulator(waveforms=waveforms) as simulator:
+            m = adamSensors.AdamModel("127.0.0.1", simulator.port)
+            await m.connect()
+            v1 = await m.read_voltage()
+            await asyncio.sleep(0.05)
+            v2 = await m.read_voltage()
+            assert v1[0] == pytest.approx(5, abs=1e-3)
+            assert v1[1] != v2[1]
+            assert v1[2] != v2[2]
+            # out of range voltages are clipped
+            assert v1[4] == pytest.approx(-10)
+            assert v1[5] == pytest.approx(10)
+            await m.close()
+
+    async def test_latency(self):
+        latency = 0.05
+        async with adamSensors.AdamSimulator(latency=latency) as simulator:
+            m = adamSensors.AdamModel("127.0.0.1", simulator.port)
+            await m.connect()
+            t0 = asyncio.get_running_loop().time()
+            await m.read_counts()
+            assert asyncio.get_running_loop().time() - t0 >= latency * 0.9
+            assert simulator.max_in_flight == 1
+            await m.close()
+
+    async def test_packet_loss(self):
+        async with adamSensors.AdamSimulator(loss_probability=1) as simulator:
+            m = adamSensors.AdamModel("127.0.0.1", simulator.port, request_timeout=0.2)
+            await m.connect()
+            with pytest.raises(ConnectionException):
+                await m.read_counts()
+            assert simulator.num_dropped == 1
+            await m.close()
+
+    async def test_many_instances(self):
+        simulators = await adamSensors.start_simulators(4)
+        try:
+            ports = {simulator.port for simulator in simulators}
+            assert len(ports) == 4
+            poller = adamSensors.AdamPoller(
+                {
+                    f"adam{i}": adamSensors.AdamModel("127.0.0.1", simulator.port)
+                    for i, simulator in enumerate(simulators)
+                }
+            )
+            await poller.connect()
+            results = await poller.poll()
+            for counts in results.values():
+                assert counts[2] == 65535
+            await poller.close()
+        finally:
+            for simulator in simulators:
+                await simulator.close()
+
+    def test_handle_pdu(self):
+        simulator = adamSensors.AdamSimulator()
+        simulator.discrete_inputs[1] = True
+        response = simulator.handle_pdu(struct.pack(">BHH", 2, 0, 2))
+        assert response == bytes([2, 1, 0b10])
+
+        response = simulator.handle_pdu(struct.pack(">BHH", 4, 1, 2))
+        assert response == bytes([4, 4, 0, 0, 0xFF, 0xFF])
+
+        # unsupported function code and bad address
+        assert simulator.handle_pdu(bytes([6, 0, 0, 0, 1])) == bytes([0x86, 1])
+        response = simulator.handle_pdu(struct.pack(">BHH", 4, 250, 10))
+        assert response == bytes([0x84, 2])
+
+    def test_bad_waveforms(self):
+        with pytest.raises(ValueError):
+            adamSensors.AdamSimulator(waveforms=[])
+
+
+if __name__ == "__main__":
+    unittest.main()
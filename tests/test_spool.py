@@ -0,0 +1,187 @@
+import unittest
+import pathlib
+import tempfile
+import threading
+
+import numpy as np
+import pytest
+from lsst.ts import adamSensors
+
+NUM_CHANNELS = 6
+
+
+def make_samples(num_samples, t0=1600000000.0, interval=0.01):
+    timestamps = t0 + np.arange(num_samples) * interval
+    counts = np.arange(num_samples * NUM_CHANNELS, dtype=float).reshape(
+        num_samples, NUM_CHANNELS
+    )
+    counts %= 65536
+    return timestamps, counts
+
+
+class SpoolTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.directory = self.tempdir.name
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    async def write(self, timestamps, counts, **kwargs):
+        writer = adamSensors.SpoolWriter(self.directory, NUM_CHANNELS, **kwargs)
+        for timestamp, sample in zip(timestamps, counts):
+            writer.append(timestamp, sample)
+        await writer.close()
+        return writer
+
+    async def test_round_trip(self):
+        timestamps, counts = make_samples(2500)
+        counts[10, 2] = np.nan
+        # appends do not yield to the writer thread, so allow every batch
+        # to be pending
+        writer = await self.write(timestamps, counts, batch_size=100, max_pending=25)
+        assert writer.num_written == 2500
+        assert writer.num_dropped == 0
+
+        paths = adamSensors.list_spool_files(self.directory)
+        assert len(paths) == 1
+        records = adamSensors.read_spool_file(paths[0])
+        assert isinstance(records, np.memmap)
+        assert records.dtype.itemsize == 8 + 4 * NUM_CHANNELS
+        np.testing.assert_array_equal(records["timestamp"], timestamps)
+        np.testing.assert_array_equal(records["counts"], counts)
+
+        read_timestamps, read_counts = adamSensors.read_spool(
+            self.directory, start=timestamps[100], end=timestamps[200]
+        )
+        np.testing.assert_array_equal(read_timestamps, timestamps[100:200])
+        np.testing.assert_array_equal(read_counts, counts[100:200])
+
+    async def test_rotation(self):
+        timestamps, counts = make_samples(1000)
+        record_size = adamSensors.spool_dtype(NUM_CHANNELS).itemsize
+        # 16 byte header + 300 records per file
+        max_file_size = 16 + 300 * record_size
+        await self.write(
+            timestamps, counts, batch_size=128, max_file_size=max_file_size
+        )
+        paths = adamSensors.list_spool_files(self.directory)
+        assert [len(adamSensors.read_spool_file(path)) for path in paths] == [
+            300,
+            300,
+            300,
+            100,
+        ]
+        for path in paths:
+            assert path.stat().st_size <= max_file_size
+        read_timestamps, read_counts = adamSensors.read_spool(self.directory)
+        np.testing.assert_array_equal(read_timestamps, timestamps)
+        np.testing.assert_array_equal(read_counts, counts)
+
+    async def test_flush_interval(self):
+        timestamps, counts = make_samples(10, interval=0.5)
+        writer = adamSensors.SpoolWriter(
+            self.directory, NUM_CHANNELS, batch_size=1000, flush_interval=1
+        )
+        for timestamp, sample in zip(timestamps[:3], counts[:3]):
+            writer.append(timestamp, sample)
+        # the third sample is 1 second after the first
+        await writer.close()
+        assert writer.num_written == 3
+
+    async def test_writes_off_event_loop(self):
+        writer = adamSensors.SpoolWriter(self.directory, NUM_CHANNELS, batch_size=10)
+        write_threads = set()
+        write = writer._write
+
+        def recording_write(batch):
+            write_threads.add(threading.current_thread())
+            return write(batch)
+
+        writer._write = recording_write
+        timestamps, counts = make_samples(100)
+        for timestamp, sample in zip(timestamps, counts):
+            writer.append(timestamp, sample)
+        await writer.close()
+        assert writer.num_written == 100
+        assert len(write_threads) == 1
+        assert threading.current_thread() not in write_threads
+
+    async def test_backpressure(self):
+        writer = adamSensors.SpoolWriter(
+            self.directory, NUM_CHANNELS, batch_size=10, max_pending=1
+        )
+        timestamps, counts = make_samples(100)
+        # no chance for the writer thread to finish between appends
+        for timestamp, sample in zip(timestamps, counts):
+            writer.append(timestamp, sample)
+        await writer.close()
+        assert writer.num_dropped > 0
+        assert writer.num_written + writer.num_dropped == 100
+
+    async def test_mixed_channel_counts(self):
+        timestamps, counts = make_samples(10)
+        await self.write(timestamps, counts)
+        # a later run with one more channel
+        writer = adamSensors.SpoolWriter(self.directory, NUM_CHANNELS + 1)
+        for timestamp in timestamps + 100:
+            writer.append(timestamp, np.zeros(NUM_CHANNELS + 1))
+        await writer.close()
+        with pytest.raises(ValueError, match="channels"):
+            adamSensors.read_spool(self.directory)
+        # each run can still be read on its own
+        read_timestamps, read_counts = adamSensors.read_spool(
+            self.directory, start=timestamps[0] + 100
+        )
+        assert read_counts.shape == (10, NUM_CHANNELS + 1)
+
+    async def test_write_error(self):
+        # the spool directory cannot be made where a file is
+        path = pathlib.Path(self.directory) / "not_a_directory"
+        path.write_text("")
+        writer = adamSensors.SpoolWriter(path, NUM_CHANNELS, batch_size=10)
+        timestamps, counts = make_samples(25)
+        for timestamp, sample in zip(timestamps, counts):
+            writer.append(timestamp, sample)
+        await writer.close()
+        assert writer.num_written == 0
+        assert writer.num_dropped == 25
+
+    async def test_truncated_file(self):
+        timestamps, counts = make_samples(10)
+        await self.write(timestamps, counts)
+        (path,) = adamSensors.list_spool_files(self.directory)
+        with open(path, "ab") as f:
+            f.write(b"\0" * 5)
+        assert len(adamSensors.read_spool_file(path)) == 10
+
+        bad_path = path.with_name("bad" + adamSensors.SPOOL_SUFFIX)
+        bad_path.write_bytes(b"not a spool file at all")
+        with pytest.raises(ValueError):
+            adamSensors.read_spool_file(bad_path)
+
+    async def test_replay(self):
+        timestamps, counts = make_samples(300, interval=0.01)
+        await self.write(timestamps, counts)
+        converter = adamSensors.ChannelConverter([[2.0, 1.0]] * NUM_CHANNELS)
+        replay_timestamps, values = adamSensors.replay_spool(self.directory, converter)
+        np.testing.assert_array_equal(replay_timestamps, timestamps)
+        np.testing.assert_allclose(values, converter.convert(counts))
+
+        replay_timestamps, values = adamSensors.replay_spool(
+            self.directory, converter, interval=1
+        )
+        assert len(replay_timestamps) == 3
+        np.testing.assert_allclose(
+            values[0], converter.convert(counts[:100]).mean(axis=0)
+        )
+
+        replay_timestamps, values = adamSensors.replay_spool(
+            self.directory, converter, start=timestamps[-1] + 1
+        )
+        assert len(replay_timestamps) == 0
+        assert values.shape == (0, NUM_CHANNELS)
+
+
+if __name__ == "__main__":
+    unittest.main()
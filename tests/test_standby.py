@@ -0,0 +1,57 @@
+import unittest
+import asyncio
+import pytest
+from lsst.ts import adamSensors
+
+from poller_helpers import make_models
+
+
+class StandbyPollerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_poll(self):
+        poller = adamSensors.AdamPoller(make_models(2, request_timeout=0.2))
+        await poller.connect()
+        standby_poller = adamSensors.StandbyPoller(poller, interval=0.05)
+        assert not standby_poller.healthy
+        assert standby_poller.latest is None
+        standby_poller.start()
+        assert standby_poller.running
+        await asyncio.sleep(0.3)
+        assert standby_poller.num_polls >= 4
+        assert standby_poller.healthy
+        timestamp, counts = standby_poller.latest
+        assert set(counts) == {"adam0", "adam1"}
+        assert counts["adam0"][2] == 65535
+
+        # stopping leaves the connections open for reuse
+        assert await standby_poller.stop() is poller
+        assert not standby_poller.running
+        assert standby_poller.healthy
+        for model in poller.models.values():
+            assert model.connected
+        await standby_poller.close()
+        for model in poller.models.values():
+            assert not model.connected
+
+    async def test_failing_device(self):
+        poller = adamSensors.AdamPoller(make_models(2, request_timeout=0.2))
+        await poller.connect()
+        standby_poller = adamSensors.StandbyPoller(poller, interval=0.05)
+        await standby_poller.poll()
+        assert standby_poller.healthy
+        await poller.models["adam1"].close()
+        await standby_poller.poll()
+        assert standby_poller.failing == {"adam1"}
+        assert not standby_poller.healthy
+        # the sample of the device still read is kept
+        assert set(standby_poller.latest[1]) == {"adam0"}
+        await standby_poller.close()
+
+    def test_bad_interval(self):
+        with pytest.raises(ValueError):
+            adamSensors.StandbyPoller(
+                adamSensors.AdamPoller(make_models(1)), interval=0
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
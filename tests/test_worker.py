@@ -0,0 +1,163 @@
+import unittest
+import unittest.mock
+import asyncio
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from lsst.ts import adamSensors
+
+
+class SharedSampleRingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ring = adamSensors.SharedSampleRing(capacity=10, num_values=3)
+        self.reader = adamSensors.SharedSampleRing.attach(
+            self.ring.name, capacity=10, num_values=3
+        )
+
+    def tearDown(self):
+        self.reader.close()
+        self.ring.close()
+        self.ring.unlink()
+
+    def append(self, start, end):
+        for i in range(start, end):
+            self.ring.append(i, [i, i + 0.5, -i])
+
+    def test_read(self):
+        timestamps, values = self.reader.read()
+        assert len(timestamps) == 0
+        assert values.shape == (0, 3)
+
+        self.append(0, 4)
+        timestamps, values = self.reader.read()
+        assert timestamps.tolist() == [0, 1, 2, 3]
+        np.testing.assert_array_equal(values[:, 1], timestamps + 0.5)
+        # only new samples are returned, and wrap around the end
+        self.append(4, 13)
+        timestamps, values = self.reader.read()
+        assert timestamps.tolist() == list(range(4, 13))
+        np.testing.assert_array_equal(values[:, 2], -timestamps)
+        assert self.reader.num_read == 13
+        assert self.reader.num_lost == 0
+        assert self.ring.write_count == 13
+
+    def test_overrun(self):
+        """Samples overwritten before they are read are counted as lost;
+        the oldest slot may be being overwritten, so is skipped.
+        """
+        self.append(0, 25)
+        timestamps, values = self.reader.read()
+        assert timestamps.tolist() == list(range(16, 25))
+        assert self.reader.num_lost == 16
+        self.append(25, 27)
+        timestamps, values = self.reader.read()
+        assert timestamps.tolist() == [25, 26]
+        assert self.reader.num_read + self.reader.num_lost == 27
+
+    def test_copies(self):
+        """Read samples do not change when their slots are reused."""
+        self.append(0, 5)
+        timestamps, values = self.reader.read()
+        self.append(5, 15)
+        assert timestamps.tolist() == list(range(5))
+        assert values[:, 0].tolist() == list(range(5))
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            adamSensors.SharedSampleRing(capacity=1, num_values=3)
+
+
+class AcquisitionWorkerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_acquire(self):
+        worker = adamSensors.AcquisitionWorker(
+            [dict(name="a", ip="fakeIP", port=502), dict(name="b", ip="x", port=502)],
+            sample_interval=0.01,
+            capacity=1000,
+            model_kwargs=dict(simulation_mode=True),
+            clock_offset=37,
+        )
+        assert not worker.alive
+        assert list(worker.device_slices()) == ["a", "b"]
+        await worker.start()
+        try:
+            assert worker.alive
+            await asyncio.sleep(0.5)
+            timestamps, samples = worker.read()
+        finally:
+            await worker.stop()
+        assert not worker.alive
+        assert worker.ring is None
+        # about 50 samples at 100 Hz, on a fixed grid
+        assert len(timestamps) > 25
+        assert np.median(np.diff(timestamps)) == pytest.approx(0.01, rel=0.2)
+        assert samples.shape == (len(timestamps), 16)
+        for registers in worker.device_slices().values():
+            assert samples[-1, registers][1:3].tolist() == [0, 65535]
+
+    async def test_set_sample_interval(self):
+        worker = adamSensors.AcquisitionWorker(
+            [dict(name="a", ip="fakeIP", port=502)],
+            sample_interval=0.05,
+            capacity=1000,
+            model_kwargs=dict(simulation_mode=True),
+        )
+        await worker.start()
+        try:
+            worker.set_sample_interval(0.005)
+            await asyncio.sleep(0.1)
+            worker.read()
+            await asyncio.sleep(0.3)
+            timestamps, samples = worker.read()
+        finally:
+            await worker.stop()
+        assert np.median(np.diff(timestamps)) == pytest.approx(0.005, rel=0.2)
+        assert worker.sample_interval == 0.005
+        with pytest.raises(ValueError):
+            worker.set_sample_interval(0)
+
+    async def test_unreachable(self):
+        worker = adamSensors.AcquisitionWorker(
+            [dict(name="a", ip="127.0.0.1", port=1)],
+            sample_interval=0.01,
+            capacity=100,
+            model_kwargs=dict(request_timeout=0.2),
+        )
+        with pytest.raises(RuntimeError):
+            await worker.start()
+        assert worker.process is None
+        assert worker.ring is None
+
+    async def test_process_start_fails(self):
+        worker = adamSensors.AcquisitionWorker(
+            [dict(name="a", ip="fakeIP", port=502)],
+            sample_interval=0.01,
+            capacity=100,
+            model_kwargs=dict(simulation_mode=True),
+        )
+        rings = []
+        ring_class = adamSensors.worker.SharedSampleRing
+
+        def spy_ring(*args, **kwargs):
+            rings.append(ring_class(*args, **kwargs))
+            return rings[-1]
+
+        with unittest.mock.patch.object(
+            adamSensors.worker, "SharedSampleRing", spy_ring
+        ), unittest.mock.patch.object(
+            multiprocessing.get_context("spawn").Process,
+            "start",
+            side_effect=OSError("Cannot fork"),
+        ):
+            with pytest.raises(OSError):
+                await worker.start()
+        assert worker.process is None
+        assert worker.ring is None
+        # the shared memory was unlinked
+        with pytest.raises(FileNotFoundError):
+            ring_class.attach(rings[0].name, capacity=100, num_values=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,17 @@
+import types
+
+
+class FakeTopic:
+    """Records the data of each set_put call."""
+
+    def __init__(self):
+        self.published = []
+
+    def set_put(self, **kwargs):
+        self.published.append(kwargs)
+        return True
+
+
+def make_topic_owner():
+    """Make a stand-in for the CSC, with fake telemetry topics."""
+    return types.SimpleNamespace(tel_pressure=FakeTopic(), tel_temperature=FakeTopic())